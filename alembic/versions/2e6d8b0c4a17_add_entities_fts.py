@@ -0,0 +1,60 @@
+"""add_entities_fts
+
+Revision ID: 2e6d8b0c4a17
+Revises: f1b7c3e58a24
+Create Date: 2026-10-16 17:55:14.802671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e6d8b0c4a17'
+down_revision: Union[str, None] = 'f1b7c3e58a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 index over label/description with the entities table as external content
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5("
+        "label, description, content='entities', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute("INSERT INTO entities_fts(entities_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')")
+
+    # Keep the index in sync with entities
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS entities_fts_ai AFTER INSERT ON entities BEGIN "
+        "INSERT INTO entities_fts(rowid, label, description) "
+        "VALUES (new.id, new.label, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS entities_fts_ad AFTER DELETE ON entities BEGIN "
+        "INSERT INTO entities_fts(entities_fts, rowid, label, description) "
+        "VALUES ('delete', old.id, old.label, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS entities_fts_au AFTER UPDATE OF label, description "
+        "ON entities BEGIN "
+        "INSERT INTO entities_fts(entities_fts, rowid, label, description) "
+        "VALUES ('delete', old.id, old.label, old.description); "
+        "INSERT INTO entities_fts(rowid, label, description) "
+        "VALUES (new.id, new.label, new.description); END"
+    )
+
+    # Index existing rows
+    op.execute("INSERT INTO entities_fts(entities_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS entities_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS entities_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS entities_fts_ai")
+    op.execute("DROP TABLE IF EXISTS entities_fts")
@@ -0,0 +1,43 @@
+"""add_entity_listing_indexes_without_deleted
+
+Revision ID: 4c8e1f6a2d93
+Revises: 7a2c5d9e3b81
+Create Date: 2026-10-16 21:14:08.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e1f6a2d93'
+down_revision: Union[str, None] = '7a2c5d9e3b81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GET /entities filters without exclude_deleted (the default) have no
+# is_deleted predicate, so they need indexes that do not lead with it
+LISTING_INDEXES: dict[str, list[str]] = {
+    'ix_entities_parent_added_date': ['parent_id', 'added_date'],
+    'ix_entities_type_added_date': ['type', 'added_date'],
+    'ix_entities_mime_added_date': ['mime_type', 'added_date'],
+    'ix_entities_collection_added_date': ['is_collection', 'added_date'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('entities', schema=None) as batch_op:
+        for name, columns in LISTING_INDEXES.items():
+            batch_op.create_index(name, columns, unique=False)
+
+    op.execute('ANALYZE entities')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('entities', schema=None) as batch_op:
+        for name in LISTING_INDEXES:
+            batch_op.drop_index(name)
@@ -0,0 +1,39 @@
+"""add_entity_preview_status
+
+Revision ID: 5b1e7c2d9a40
+Revises: 030212b28f26
+Create Date: 2026-10-16 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, None] = '030212b28f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # preview_status is excluded from versioning, so entities_version is unchanged
+    with op.batch_alter_table('entities', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preview_status', sa.String(), nullable=True))
+
+    # Existing media predates the queue; previews were generated inline, but
+    # only for images and videos (supports_preview). Other rows stay NULL.
+    op.execute(
+        "UPDATE entities SET preview_status = 'ready' "
+        "WHERE is_collection = 0 AND file_path IS NOT NULL "
+        "AND (mime_type LIKE 'image/%' OR mime_type LIKE 'video/%')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('entities', schema=None) as batch_op:
+        batch_op.drop_column('preview_status')
@@ -0,0 +1,31 @@
+"""add_entities_version_added_date_id_index
+
+Revision ID: 7a2c5d9e3b81
+Revises: 2e6d8b0c4a17
+Create Date: 2026-10-16 19:02:37.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c5d9e3b81'
+down_revision: Union[str, None] = '2e6d8b0c4a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Point-in-time listings (?as_of_transaction=) order version rows by (added_date, id)
+    op.create_index(
+        'ix_entities_version_added_date_id', 'entities_version', ['added_date', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_entities_version_added_date_id', table_name='entities_version')
@@ -0,0 +1,29 @@
+"""add_entities_added_date_id_index
+
+Revision ID: 8c4f2a61d7e3
+Revises: 5b1e7c2d9a40
+Create Date: 2026-10-16 14:03:27.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2a61d7e3'
+down_revision: Union[str, None] = '5b1e7c2d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination of GET /entities orders by (added_date DESC, id DESC)
+    op.create_index('ix_entities_added_date_id', 'entities', ['added_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_entities_added_date_id', table_name='entities')
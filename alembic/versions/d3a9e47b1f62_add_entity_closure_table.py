@@ -0,0 +1,54 @@
+"""add_entity_closure_table
+
+Revision ID: d3a9e47b1f62
+Revises: 8c4f2a61d7e3
+Create Date: 2026-10-16 15:21:09.117842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9e47b1f62'
+down_revision: Union[str, None] = '8c4f2a61d7e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('entity_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['entities.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['entities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    with op.batch_alter_table('entity_closure', schema=None) as batch_op:
+        batch_op.create_index('ix_entity_closure_descendant_depth', ['descendant_id', 'depth'], unique=False)
+
+    # Backfill from parent_id: every entity paired with itself and each ancestor
+    op.execute(
+        "INSERT INTO entity_closure (ancestor_id, descendant_id, depth) "
+        "WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS ("
+        "  SELECT id, id, 0 FROM entities"
+        "  UNION"
+        "  SELECT tree.ancestor_id, entities.id, tree.depth + 1"
+        "  FROM entities JOIN tree ON entities.parent_id = tree.descendant_id"
+        "  WHERE tree.depth < 64"
+        ") "
+        "SELECT ancestor_id, descendant_id, MIN(depth) FROM tree "
+        "GROUP BY ancestor_id, descendant_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('entity_closure', schema=None) as batch_op:
+        batch_op.drop_index('ix_entity_closure_descendant_depth')
+
+    op.drop_table('entity_closure')
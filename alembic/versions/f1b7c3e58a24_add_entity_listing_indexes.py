@@ -0,0 +1,44 @@
+"""add_entity_listing_indexes
+
+Revision ID: f1b7c3e58a24
+Revises: d3a9e47b1f62
+Create Date: 2026-10-16 16:40:52.330917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7c3e58a24'
+down_revision: Union[str, None] = 'd3a9e47b1f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GET /entities filters, each followed by the added_date sort key
+LISTING_INDEXES: dict[str, list[str]] = {
+    'ix_entities_deleted_added_date': ['is_deleted', 'added_date'],
+    'ix_entities_deleted_parent_added_date': ['is_deleted', 'parent_id', 'added_date'],
+    'ix_entities_deleted_type_added_date': ['is_deleted', 'type', 'added_date'],
+    'ix_entities_deleted_mime_added_date': ['is_deleted', 'mime_type', 'added_date'],
+    'ix_entities_deleted_collection_added_date': ['is_deleted', 'is_collection', 'added_date'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('entities', schema=None) as batch_op:
+        for name, columns in LISTING_INDEXES.items():
+            batch_op.create_index(name, columns, unique=False)
+
+    # Give the planner row statistics so it picks the most selective index
+    op.execute('ANALYZE entities')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('entities', schema=None) as batch_op:
+        for name in LISTING_INDEXES:
+            batch_op.drop_index(name)
@@ -0,0 +1,147 @@
+"""Benchmark: dependency-resolution overhead of the entity routes.
+
+Mounts three trivial routes on a throwaway FastAPI app and times requests
+through TestClient:
+
+- a route with no dependencies (the framework baseline),
+- a route resolving EntityService the old way, constructing DBService,
+  StorageService, FaceService and MediaMetadataExtractor per request,
+- a route resolving the real get_entity_service, which binds only the
+  session to collaborators built once at startup.
+
+The difference to the baseline is the per-request construction cost.
+
+Usage:
+    uv run python benchmarks/dependency_resolution_bench.py [--requests 2000]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from collections.abc import Generator
+from pathlib import Path
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from store.common.storage import StorageService  # noqa: E402
+from store.db_service import DBService, database  # noqa: E402
+from store.db_service.db_internals import get_db  # noqa: E402
+from store.store.config import StoreConfig  # noqa: E402
+from store.store.dependencies import get_entity_service  # noqa: E402
+from store.store.face_service import FaceService  # noqa: E402
+from store.store.ingest import IngestExecutor  # noqa: E402
+from store.store.media_metadata import MediaMetadataExtractor  # noqa: E402
+from store.store.service import EntityService  # noqa: E402
+from store.vectorstore_services.vector_stores import (  # noqa: E402
+    get_clip_store_dep,
+    get_dino_store_dep,
+    get_face_store_dep,
+)
+
+
+def _per_request_entity_service(
+    db: Session = Depends(get_db),
+    config: StoreConfig = Depends(StoreConfig.get_config),
+) -> EntityService:
+    """The construction get_entity_service used to do on every request."""
+    storage_service = StorageService(base_dir=str(config.media_storage_dir))
+    face_service = FaceService(
+        db=db,
+        db_service=DBService(db=db),
+        face_store=None,  # pyright: ignore[reportArgumentType]
+        storage_service=storage_service,
+    )
+    return EntityService(db, config, face_service=face_service)
+
+
+def _build_app(storage_dir: Path) -> FastAPI:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    session_factory = sessionmaker(bind=engine)
+    database.SessionLocal = session_factory
+
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    config = StoreConfig.model_construct(media_storage_dir=storage_dir)
+    executor = IngestExecutor(cpu_workers=1, io_workers=1, queue_size=1)
+
+    app = FastAPI()
+    app.state.storage_service = StorageService(base_dir=str(storage_dir))
+    app.state.metadata_extractor = MediaMetadataExtractor(executor=executor)
+    app.state.ingest_executor = executor
+
+    @app.get("/baseline")
+    def baseline() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/per-request")
+    def per_request(
+        service: EntityService = Depends(_per_request_entity_service),
+    ) -> dict[str, bool]:
+        _ = service
+        return {"ok": True}
+
+    @app.get("/shared")
+    def shared(service: EntityService = Depends(get_entity_service)) -> dict[str, bool]:
+        _ = service
+        return {"ok": True}
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[StoreConfig.get_config] = lambda: config
+    for dep in (get_clip_store_dep, get_dino_store_dep, get_face_store_dep):
+        app.dependency_overrides[dep] = lambda: None
+    return app
+
+
+def _run(client: TestClient, path: str, requests: int) -> float:
+    for _ in range(min(requests, 50)):
+        assert client.get(path).status_code == 200
+    start = time.perf_counter()
+    for _ in range(requests):
+        _ = client.get(path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="dependency_resolution_bench")
+    _ = parser.add_argument("--requests", type=int, default=2000, help="Requests per route")
+    args = parser.parse_args()
+    requests = int(args.requests)  # pyright: ignore[reportAny]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _build_app(Path(tmp))
+        with TestClient(app) as client:
+            baseline = _run(client, "/baseline", requests)
+            results = {
+                "per-request construction": _run(client, "/per-request", requests),
+                "shared collaborators": _run(client, "/shared", requests),
+            }
+        executor = app.state.ingest_executor  # pyright: ignore[reportAny]
+        executor.shutdown()  # pyright: ignore[reportAny]
+
+    print(f"{'no dependencies':<28} {baseline:8.1f} us/request")
+    for label, per_request_us in results.items():
+        print(
+            f"{label:<28} {per_request_us:8.1f} us/request"
+            + f"  (+{per_request_us - baseline:.1f} us over baseline)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
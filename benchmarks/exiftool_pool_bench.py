@@ -0,0 +1,69 @@
+"""Benchmark: per-file ExifTool processes vs. the persistent ExifTool pool.
+
+Runs metadata extraction over the test images listed in tests/test_files.txt
+(resolved against TEST_VECTORS_DIR) and prints files/sec for both modes.
+
+Usage:
+    uv run python benchmarks/exiftool_pool_bench.py [--rounds 3] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cl_ml_tools.algorithms import MetadataExtractor
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from store.store.exiftool_pool import ExifToolPool  # noqa: E402
+from tests.test_config import load_test_files  # noqa: E402
+
+
+def _run(label: str, files: list[Path], rounds: int, workers: int, fn: Callable[[str], object]) -> float:
+    paths = [str(f) for f in files] * rounds
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(fn, paths):
+            pass
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed
+    print(f"{label:<28} {len(paths):>5} files  {elapsed:8.2f}s  {rate:8.1f} files/sec")
+    return rate
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="exiftool_pool_bench")
+    _ = parser.add_argument("--rounds", type=int, default=3, help="Passes over the file list")
+    _ = parser.add_argument("--workers", type=int, default=4, help="Concurrent requests / pool size")
+    args = parser.parse_args()
+    rounds = int(args.rounds)  # pyright: ignore[reportAny]
+    workers = int(args.workers)  # pyright: ignore[reportAny]
+
+    files = [f for f in load_test_files() if f.exists()]
+    if not files:
+        print("No test images found (set TEST_VECTORS_DIR)")
+        return 1
+
+    extractor = MetadataExtractor()
+    before = _run("process per file", files, rounds, workers, extractor.extract_metadata_all)
+
+    pool = ExifToolPool(size=workers)
+    try:
+        # Warm up every slot so process startup is not counted against the pool
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            _ = list(executor.map(pool.extract_metadata, [str(files[0])] * workers))
+        after = _run("persistent pool", files, rounds, workers, pool.extract_metadata)
+    finally:
+        pool.close()
+
+    print(f"speedup: {after / before:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Load test: read latency under a mixed read/write workload.
+
+Drives a running store with concurrent readers (listing, get, batch lookup,
+faces, known persons) and writers (collection create + update) for a fixed
+duration, then prints p50/p99 latency per operation. Run it against a build
+before and after a change to compare read tail latency.
+
+Usage:
+    uv run store --no-auth &
+    uv run python benchmarks/read_latency_load.py --url http://localhost:8001 \
+        [--readers 32] [--writers 4] [--duration 30] [--token JWT]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from collections import defaultdict
+from collections.abc import Awaitable
+
+import httpx
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _timed(
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+    name: str,
+    request: Awaitable[httpx.Response],
+) -> httpx.Response | None:
+    start = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError:
+        errors[name] += 1
+        return None
+    latencies[name].append((time.perf_counter() - start) * 1000)
+    if response.status_code >= 500:
+        errors[name] += 1
+    return response
+
+
+async def _reader(
+    client: httpx.AsyncClient,
+    ids: list[int],
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    while time.monotonic() < deadline:
+        entity_id = random.choice(ids)
+        op = random.random()
+        if op < 0.35:
+            _ = await _timed(latencies, errors, "list", client.get("/entities/", params={"page_size": 20}))
+        elif op < 0.7:
+            _ = await _timed(latencies, errors, "get", client.get(f"/entities/{entity_id}"))
+        elif op < 0.85:
+            batch = random.sample(ids, min(len(ids), 50))
+            _ = await _timed(
+                latencies, errors, "lookup", client.post("/entities/lookup", json={"ids": batch})
+            )
+        elif op < 0.95:
+            _ = await _timed(
+                latencies, errors, "faces", client.get(f"/intelligence/entities/{entity_id}/faces")
+            )
+        else:
+            _ = await _timed(latencies, errors, "known_persons", client.get("/intelligence/known-persons"))
+
+
+async def _writer(
+    client: httpx.AsyncClient,
+    ids: list[int],
+    deadline: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    n = 0
+    while time.monotonic() < deadline:
+        n += 1
+        response = await _timed(
+            latencies,
+            errors,
+            "create",
+            client.post("/entities/", data={"is_collection": "true", "label": f"load {n}"}),
+        )
+        if response is not None and response.status_code == 201:
+            entity_id = int(response.json()["id"])  # pyright: ignore[reportAny]
+            ids.append(entity_id)
+            _ = await _timed(
+                latencies,
+                errors,
+                "update",
+                client.patch(f"/entities/{entity_id}", data={"description": f"updated {n}"}),
+            )
+
+
+async def _run(url: str, token: str | None, readers: int, writers: int, duration: float) -> int:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limits = httpx.Limits(max_connections=readers + writers)
+    async with httpx.AsyncClient(base_url=url, headers=headers, limits=limits, timeout=60) as client:
+        ids: list[int] = []
+        for i in range(50):
+            response = await client.post("/entities/", data={"is_collection": "true", "label": f"seed {i}"})
+            if response.status_code != 201:
+                print(f"Seeding failed: {response.status_code} {response.text}")
+                return 1
+            ids.append(int(response.json()["id"]))  # pyright: ignore[reportAny]
+
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        deadline = time.monotonic() + duration
+        _ = await asyncio.gather(
+            *(_reader(client, ids, deadline, latencies, errors) for _ in range(readers)),
+            *(_writer(client, ids, deadline, latencies, errors) for _ in range(writers)),
+        )
+
+    print(f"{'operation':<14} {'count':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for name in ("list", "get", "lookup", "faces", "known_persons", "create", "update"):
+        samples = latencies.get(name)
+        if not samples:
+            continue
+        print(
+            f"{name:<14} {len(samples):>7} {statistics.median(samples):9.1f}"
+            + f" {_percentile(samples, 99):9.1f} {max(samples):9.1f} {errors[name]:>7}"
+        )
+    reads = [s for name in ("list", "get", "lookup", "faces", "known_persons") for s in latencies[name]]
+    if reads:
+        print(f"{'all reads':<14} {len(reads):>7} {statistics.median(reads):9.1f} {_percentile(reads, 99):9.1f}")
+    return 0
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="read_latency_load")
+    _ = parser.add_argument("--url", default="http://localhost:8001", help="Store base URL")
+    _ = parser.add_argument("--token", default=None, help="Bearer token with read/write permission")
+    _ = parser.add_argument("--readers", type=int, default=32, help="Concurrent reader tasks")
+    _ = parser.add_argument("--writers", type=int, default=4, help="Concurrent writer tasks")
+    _ = parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    args = parser.parse_args()
+    return asyncio.run(
+        _run(
+            str(args.url),  # pyright: ignore[reportAny]
+            args.token,  # pyright: ignore[reportAny]
+            int(args.readers),  # pyright: ignore[reportAny]
+            int(args.writers),  # pyright: ignore[reportAny]
+            float(args.duration),  # pyright: ignore[reportAny]
+        )
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
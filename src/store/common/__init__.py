@@ -1,9 +1,12 @@
 """Common module for shared utilities and storage."""
 
 from .config import BaseConfig
-from .storage import StorageService
+from .storage import ImportMode, StagedFile, StagingWriter, StorageService
 
 __all__: list[str] = [
     "BaseConfig",
+    "ImportMode",
+    "StagedFile",
+    "StagingWriter",
     "StorageService",
 ]
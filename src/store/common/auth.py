@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from pathlib import Path
 from typing import Annotated, ClassVar, Literal
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import ExpiredSignatureError, JWTError, jwt
 from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
@@ -64,26 +69,52 @@ oauth2_scheme = OAuth2PasswordBearer(
 # ─────────────────────────────────────
 
 _public_key_cache: str | None = None
+_public_key_stamp: tuple[str, int, int] | None = None  # (path, mtime_ns, size)
+_public_key_checked_at: float = 0.0
 _max_load_attempts: int = 30  # ~30 seconds
+_key_check_interval: float = 5.0  # seconds between checks for a rotated key file
+
+
+def _key_file_stamp(path: Path) -> tuple[str, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
 
 
 async def get_public_key(config: BaseConfig) -> str:
-    """Load and cache the public key with retry during startup."""
+    """Load and cache the public key with retry during startup.
+
+    The key file is re-checked every few seconds; when it changes, the key
+    is reloaded and all cached token verifications are dropped.
+    """
 
-    global _public_key_cache
+    global _public_key_cache, _public_key_stamp, _public_key_checked_at
 
     if _public_key_cache:
-        return _public_key_cache
+        now = time.monotonic()
+        if now - _public_key_checked_at < _key_check_interval:
+            return _public_key_cache
+        _public_key_checked_at = now
+        stamp = _key_file_stamp(config.public_key_path) if config.public_key_path else None
+        if stamp is None or stamp == _public_key_stamp:
+            return _public_key_cache
 
     for attempt in range(_max_load_attempts):
         # Use configured path
         path = config.public_key_path
         if path and path.exists():
             try:
+                stamp = _key_file_stamp(path)
                 with open(path) as f:
                     key = f.read().strip()
                     if key:
+                        if key != _public_key_cache:
+                            _token_cache.clear()
                         _public_key_cache = key
+                        _public_key_stamp = stamp
+                        _public_key_checked_at = time.monotonic()
                         return key
             except OSError as exc:
                 raise HTTPException(
@@ -101,6 +132,37 @@ async def get_public_key(config: BaseConfig) -> str:
     )
 
 
+# ─────────────────────────────────────
+# Verified token cache
+# ─────────────────────────────────────
+
+# Verifying an ES256 signature dominates the cost of authenticating a
+# request, and clients send the same token many times (e.g. one request per
+# thumbnail). Verified payloads are kept until the token's exp, keyed by a
+# digest so tokens themselves are not held in memory.
+_token_cache_size: int = 1024
+_token_cache: OrderedDict[bytes, tuple[UserPayload, float]] = OrderedDict()
+
+
+def _cached_user(token: str) -> UserPayload | None:
+    key = hashlib.sha256(token.encode()).digest()
+    entry = _token_cache.get(key)
+    if entry is None:
+        return None
+    user, expires_at = entry
+    if expires_at <= time.time():
+        del _token_cache[key]
+        return None
+    _token_cache.move_to_end(key)
+    return user
+
+
+def _cache_user(token: str, user: UserPayload, expires_at: float) -> None:
+    _token_cache[hashlib.sha256(token.encode()).digest()] = (user, expires_at)
+    if len(_token_cache) > _token_cache_size:
+        _ = _token_cache.popitem(last=False)
+
+
 # ─────────────────────────────────────
 # Current user dependency
 # ─────────────────────────────────────
@@ -119,6 +181,10 @@ async def get_current_user(
 
     public_key = await get_public_key(config)
 
+    cached = _cached_user(token)
+    if cached is not None:
+        return cached
+
     try:
         raw = jwt.decode(
             token,
@@ -126,7 +192,9 @@ async def get_current_user(
             algorithms=["ES256"],
             options={"require": ["id", "exp"]},
         )
-        return UserPayload.model_validate(raw)
+        user = UserPayload.model_validate(raw)
+        _cache_user(token, user, float(raw["exp"]))
+        return user
 
     except ExpiredSignatureError:
         raise HTTPException(
@@ -167,7 +235,8 @@ def require_permission(permission: Permission):
             return current_user
 
         if permission == "media_store_read":
-            if not db.config.get_read_auth_enabled():
+            # Runs on a worker thread: on a cache miss this is a DB query
+            if not await run_in_threadpool(db.config.get_read_auth_enabled):
                 return current_user
 
         if current_user is None:
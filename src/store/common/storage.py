@@ -2,8 +2,132 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import shutil
+import tempfile
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import IO, Literal
+
+from pydantic import BaseModel
+
+# Size of the leading slice kept in memory for MIME sniffing
+STAGING_HEAD_SIZE = 64 * 1024
+
+# How an existing file is placed into storage by import_file
+ImportMode = Literal["copy", "hardlink", "move"]
+
+
+class StagedFile(BaseModel):
+    """A file spooled to the staging area, with properties computed while streaming.
+
+    Attributes:
+        path: Absolute path of the staged file
+        file_size: Total number of bytes written
+        md5: MD5 hex digest of the full content
+        head: Leading bytes of the file (for MIME sniffing)
+        original_filename: Filename supplied by the client
+    """
+
+    path: Path
+    file_size: int
+    md5: str
+    head: bytes
+    original_filename: str = "file"
+
+    @classmethod
+    def from_path(cls, path: Path, chunk_size: int = 1024 * 1024) -> StagedFile:
+        """Describe an existing file in place (size, MD5, head) without copying it.
+
+        Used by importers that read files from their original location. Such a
+        file must be placed with StorageService.import_file, never committed.
+
+        Args:
+            path: Path of the file on disk
+            chunk_size: Read size per chunk
+
+        Returns:
+            StagedFile pointing at the original path
+        """
+        md5 = hashlib.md5()
+        size = 0
+        head = b""
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                if len(head) < STAGING_HEAD_SIZE:
+                    head += chunk[: STAGING_HEAD_SIZE - len(head)]
+                md5.update(chunk)
+                size += len(chunk)
+        return cls(
+            path=path.absolute(),
+            file_size=size,
+            md5=md5.hexdigest(),
+            head=head,
+            original_filename=path.name,
+        )
+
+
+class StagingWriter:
+    """Incrementally writes a staged file, hashing and sizing it chunk by chunk.
+
+    Peak memory is bounded by the chunk size plus STAGING_HEAD_SIZE regardless
+    of the total file size.
+    """
+
+    def __init__(self, staging_dir: Path, original_filename: str = "file"):
+        """
+        Open a new staging file.
+
+        Args:
+            staging_dir: Directory for staging files (same filesystem as final storage)
+            original_filename: Original filename (its suffix is kept for tools)
+        """
+        self.original_filename: str = original_filename
+        self._file: IO[bytes] = tempfile.NamedTemporaryFile(
+            dir=staging_dir,
+            prefix="upload-",
+            suffix=Path(original_filename).suffix,
+            delete=False,
+        )
+        self.path: Path = Path(self._file.name)
+        self._md5 = hashlib.md5()
+        self._size: int = 0
+        self._head: bytearray = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk to the staged file."""
+        if not chunk:
+            return
+        if len(self._head) < STAGING_HEAD_SIZE:
+            self._head.extend(chunk[: STAGING_HEAD_SIZE - len(self._head)])
+        self._md5.update(chunk)
+        self._size += len(chunk)
+        _ = self._file.write(chunk)
+
+    def finish(self) -> StagedFile:
+        """Flush and close the staged file.
+
+        Returns:
+            StagedFile describing the written content
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        return StagedFile(
+            path=self.path,
+            file_size=self._size,
+            md5=self._md5.hexdigest(),
+            head=bytes(self._head),
+            original_filename=self.original_filename,
+        )
+
+    def abort(self) -> None:
+        """Close and remove the partially written file."""
+        try:
+            self._file.close()
+        finally:
+            self.path.unlink(missing_ok=True)
 
 
 class StorageService:
@@ -21,6 +145,9 @@ class StorageService:
         """
         self.base_dir: Path = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # Staging lives under base_dir so the final move is an atomic rename
+        self.staging_dir: Path = self.base_dir / "staging"
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
 
     def get_storage_path(
         self, metadata: dict[str, str | int | float | None], original_filename: str
@@ -88,6 +215,100 @@ class StorageService:
         # Return relative path from base_dir
         return str(file_path.relative_to(self.base_dir))
 
+    def create_staging_writer(self, original_filename: str = "file") -> StagingWriter:
+        """
+        Open a writer that spools content into the staging area.
+
+        Args:
+            original_filename: Original filename
+
+        Returns:
+            StagingWriter for incremental writes
+        """
+        return StagingWriter(self.staging_dir, original_filename)
+
+    def stage_bytes(self, file_bytes: bytes, original_filename: str = "file") -> StagedFile:
+        """
+        Stage in-memory content (for callers that already hold the bytes).
+
+        Args:
+            file_bytes: File content as bytes
+            original_filename: Original filename
+
+        Returns:
+            StagedFile for the written content
+        """
+        writer = self.create_staging_writer(original_filename)
+        try:
+            writer.write(file_bytes)
+            return writer.finish()
+        except Exception:
+            writer.abort()
+            raise
+
+    def commit_staged_file(
+        self,
+        staged: StagedFile,
+        metadata: dict[str, str | int | float | None],
+    ) -> str:
+        """
+        Atomically move a staged file into its final storage location.
+
+        Args:
+            staged: Staged file to commit
+            metadata: File metadata dictionary (md5, extension)
+
+        Returns:
+            Relative path to the stored file
+        """
+        file_path = self.get_storage_path(metadata, staged.original_filename)
+        os.replace(staged.path, file_path)
+        return str(file_path.relative_to(self.base_dir))
+
+    def import_file(
+        self,
+        source: Path,
+        metadata: dict[str, str | int | float | None],
+        mode: ImportMode = "copy",
+    ) -> str:
+        """
+        Place an existing file into storage by copying, hard-linking or moving it.
+
+        Copies and links are created under a temporary name and renamed into
+        place, so a crash never leaves a partial file at the final path.
+
+        Args:
+            source: Path of the file to import
+            metadata: File metadata dictionary (md5, extension)
+            mode: "copy" (default), "hardlink" (same filesystem only) or "move"
+
+        Returns:
+            Relative path to the stored file
+        """
+        file_path = self.get_storage_path(metadata, source.name)
+        if mode == "move":
+            _ = shutil.move(source, file_path)
+        else:
+            tmp_path = file_path.with_name(f".{file_path.name}.importing")
+            tmp_path.unlink(missing_ok=True)
+            if mode == "hardlink":
+                os.link(source, tmp_path)
+            else:
+                _ = shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, file_path)
+        return str(file_path.relative_to(self.base_dir))
+
+    def discard_staged_file(self, staged: StagedFile) -> None:
+        """
+        Remove a staged file if it is still present.
+
+        Safe to call after commit_staged_file (the file has been moved away).
+
+        Args:
+            staged: Staged file to remove
+        """
+        staged.path.unlink(missing_ok=True)
+
     def delete_file(self, relative_path: str) -> bool:
         """
         Delete file from storage.
@@ -1,8 +1,13 @@
 from .database import init_db
 from .db_service import DBService
 from .schemas import (
+    BatchCreateResponse,
+    BatchItemResult,
+    ChangeFeedMark,
     PrefResponse,
     EntityIntelligenceData,
+    EntityLookupRequest,
+    EntityLookupResponse,
     EntitySchema,
     EntitySyncStateSchema,
     EntityVersionSchema,
@@ -12,6 +17,7 @@ from .schemas import (
     KnownPersonSchema,
     PaginatedResponse,
     PaginationMetadata,
+    SubtreeStats,
     UpdateReadAuthConfig,
     VersionInfo,
 )
@@ -20,6 +26,11 @@ __all__ = [
     "init_db",
     "DBService",
     "EntitySchema",
+    "EntityLookupRequest",
+    "EntityLookupResponse",
+    "BatchCreateResponse",
+    "BatchItemResult",
+    "ChangeFeedMark",
     "EntityVersionSchema",
     "FaceSchema",
     "KnownPersonSchema",
@@ -30,6 +41,7 @@ __all__ = [
     "PaginationMetadata",
     "PaginatedResponse",
     "PrefResponse",
+    "SubtreeStats",
     "UpdateReadAuthConfig",
     "VersionInfo",
 ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 from loguru import logger
@@ -28,9 +29,11 @@ except ImportError:
 
 from . import database
 from .database import with_retry
+from .write_queue import get_write_queue
 
 # Use TypeVar for Schema
 SchemaT = TypeVar("SchemaT", bound=BaseModel)
+T = TypeVar("T")
 
 if TYPE_CHECKING:
     from ..common.config import BaseConfig
@@ -45,6 +48,9 @@ class BaseDBService(Generic[SchemaT]):
     All methods decorated with:
     - @timed: Measure execution time (including all retries)
     - @with_retry(max_retries=10): Retry on database locks
+
+    Writes without a caller-provided session go through the process write
+    queue (see _write).
     """
 
     model_class: type
@@ -54,6 +60,23 @@ class BaseDBService(Generic[SchemaT]):
         """Initialize service."""
         self.db = db
 
+    def _write(self, fn: Callable[[Session], T]) -> T:
+        """Run a write transaction.
+
+        With a caller-provided session, fn runs and commits on it. Otherwise
+        it is queued to the process write queue, which commits it together
+        with other pending writes. fn must flush, not commit.
+        """
+        if self.db is None:
+            return get_write_queue().run(fn)
+        try:
+            result = fn(self.db)
+            self.db.commit()
+            return result
+        except Exception:
+            self.db.rollback()
+            raise
+
     @timed
     @with_retry(max_retries=10)
     def get(self, id: int) -> SchemaT | None:
@@ -104,10 +127,10 @@ class BaseDBService(Generic[SchemaT]):
             data: Schema with data to create
             ignore_exception: If True, return None on errors instead of raising (for callbacks)
 
-        Session: Creates and closes own session.
+        Session: Written through the write queue.
         """
-        db = database.SessionLocal()
-        try:
+
+        def insert(db: Session) -> SchemaT:
             logger.debug(
                 f"Creating {self.model_class.__name__}: {data.model_dump(exclude_unset=True)}"
             )
@@ -116,21 +139,21 @@ class BaseDBService(Generic[SchemaT]):
             # Using exclude_unset=True matches plan.
             obj = self.model_class(**data.model_dump(exclude_unset=True))
             db.add(obj)
-            db.commit()
+            db.flush()
             db.refresh(obj)
             # Safe access to id (some models might have different PK, but all ours have id)
             pk = getattr(obj, "id", "N/A")
             logger.debug(f"Created {self.model_class.__name__} with id={pk}")
             return self._to_schema(obj)
+
+        try:
+            return get_write_queue().run(insert)
         except Exception as e:
-            db.rollback()
             if ignore_exception:
                 logger.debug(f"Ignoring exception during create {self.model_class.__name__}: {e}")
                 return None
             logger.error(f"Failed to create {self.model_class.__name__}: {e}")
             raise
-        finally:
-            db.close()
 
     @timed
     @with_retry(max_retries=10)
@@ -142,10 +165,10 @@ class BaseDBService(Generic[SchemaT]):
             data: Schema with updated data
             ignore_exception: If True, return None on errors instead of raising (for callbacks)
 
-        Session: Creates and closes own session.
+        Session: Written through the write queue.
         """
-        db = database.SessionLocal()
-        try:
+
+        def apply(db: Session) -> SchemaT | None:
             logger.debug(
                 f"Updating {self.model_class.__name__} id={id}: {data.model_dump(exclude_unset=True)}"
             )
@@ -157,12 +180,14 @@ class BaseDBService(Generic[SchemaT]):
             for key, value in data.model_dump(exclude_unset=True).items():
                 setattr(obj, key, value)
 
-            db.commit()
+            db.flush()
             db.refresh(obj)
             logger.debug(f"Updated {self.model_class.__name__} id={id}")
             return self._to_schema(obj)
+
+        try:
+            return get_write_queue().run(apply)
         except Exception as e:
-            db.rollback()
             if ignore_exception:
                 logger.debug(
                     f"Ignoring exception during update {self.model_class.__name__} id={id}: {e}"
@@ -170,8 +195,6 @@ class BaseDBService(Generic[SchemaT]):
                 return None
             logger.error(f"Failed to update {self.model_class.__name__} id={id}: {e}")
             raise
-        finally:
-            db.close()
 
     @timed
     @with_retry(max_retries=10)
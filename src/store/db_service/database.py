@@ -9,7 +9,7 @@ from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from ..common.utils import get_db_url
 # CRITICAL: Import versioning BEFORE models to ensure make_versioned() is called first
@@ -87,9 +87,9 @@ def create_db_engine(
         # Check if this is an in-memory database
         # These URLs typically contain ':memory:' or are empty
         if ":memory:" in db_url or db_url.strip() == "sqlite://":
-            # In-memory SQLite uses StaticPool by default,
-            # which doesn't support pool_size or max_overflow
-            pass
+            # One shared connection, so every thread (the writer thread
+            # included) sees the same database; no pool_size or max_overflow
+            kwargs["poolclass"] = StaticPool
         else:
             # For file-based SQLite, we want a real pool to support high concurrency
             # especially for WAL mode and batch tests.
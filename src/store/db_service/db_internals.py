@@ -22,11 +22,13 @@ from .database import (
 from .models import (
     Base,
     Entity,
+    EntityClosure,
     EntityIntelligence,
     EntitySyncState,
     Face,
     KnownPerson,
     ServiceConfig,
+    entities_fts,
 )
 from .versioning import (
     make_versioned,  # pyright: ignore[reportPrivateLocalImportUsage]
@@ -51,10 +53,12 @@ __all__ = [
     # Re-exporting models symbols
     "Base",
     "Entity",
+    "EntityClosure",
     "EntityIntelligence",
     "EntitySyncState",
     "Face",
     "KnownPerson",
     "ServiceConfig",
+    "entities_fts",
     "make_versioned",
 ]
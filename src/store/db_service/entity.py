@@ -144,30 +144,43 @@ class EntityVersionDBService:
         db = self.db if self.db else database.SessionLocal()
         should_close = self.db is None
         try:
+            in_range = self.EntityVersion.transaction_id > start_transaction_id
             if end_transaction_id is None:
                 logger.debug(f"Getting entity deltas from transaction_id > {start_transaction_id} to latest")
-                stmt = (
-                    select(self.EntityVersion)
-                    .where(self.EntityVersion.transaction_id > start_transaction_id)
-                    .order_by(self.EntityVersion.transaction_id)
-                )
             else:
                 logger.debug(f"Getting entity deltas from transaction_id > {start_transaction_id} to <= {end_transaction_id}")
-                stmt = (
-                    select(self.EntityVersion)
-                    .where(
-                        (self.EntityVersion.transaction_id > start_transaction_id) &
-                        (self.EntityVersion.transaction_id <= end_transaction_id)
-                    )
-                    .order_by(self.EntityVersion.transaction_id)
+                in_range = in_range & (self.EntityVersion.transaction_id <= end_transaction_id)
+
+            # Coalesce by entity_id in SQL (keep latest version per entity in range)
+            recency = (
+                func.row_number()
+                .over(
+                    partition_by=self.EntityVersion.id,
+                    order_by=self.EntityVersion.transaction_id.desc(),
                 )
-
+                .label("recency")
+            )
+            ranked = (
+                select(self.EntityVersion.id, self.EntityVersion.transaction_id, recency)
+                .where(in_range)
+                .subquery()
+            )
+            stmt = (
+                select(self.EntityVersion)
+                .join(
+                    ranked,
+                    (ranked.c.id == self.EntityVersion.id)
+                    & (ranked.c.transaction_id == self.EntityVersion.transaction_id),
+                )
+                .where(ranked.c.recency == 1)
+                .order_by(self.EntityVersion.transaction_id, self.EntityVersion.id)
+            )
             versions = db.execute(stmt).scalars().all()
 
-            # Coalesce by entity_id (keep latest version per entity in range)
-            entity_map: dict[int, EntityVersionSchema] = {}
-            for version in versions:
-                entity_map[version.id] = EntityVersionSchema.model_validate(version)
+            # Ordered by the transaction of each entity's latest change
+            entity_map: dict[int, EntityVersionSchema] = {
+                version.id: EntityVersionSchema.model_validate(version) for version in versions
+            }
 
             logger.debug(f"Found {len(entity_map)} entities with changes in range")
             return entity_map
@@ -97,9 +97,8 @@ class FaceDBService(BaseDBService[FaceSchema]):
     @with_retry(max_retries=10)
     def create(self, data: FaceSchema, ignore_exception: bool = False) -> FaceSchema | None:
         """Create face (overridden to handle JSON serialization)."""
-        db = self.db if self.db else database.SessionLocal()
-        should_close = self.db is None
-        try:
+
+        def insert(db: Session) -> FaceSchema | None:
             # Check entity exists
             entity_exists = db.query(Entity.id).filter(Entity.id == data.entity_id).scalar() is not None
             if not entity_exists:
@@ -110,27 +109,25 @@ class FaceDBService(BaseDBService[FaceSchema]):
             data_dict = self._prepare_data(data)
             obj = Face(**data_dict)
             db.add(obj)
-            db.commit()
+            db.flush()
             db.refresh(obj)
             return self._to_schema(obj)
+
+        try:
+            return self._write(insert)
         except Exception as e:
-            db.rollback()
             if ignore_exception:
                 logger.debug(f"Ignoring exception for Face create: {e}")
                 return None
             logger.error(f"Failed to create Face: {e}")
             raise
-        finally:
-            if should_close:
-                db.close()
 
     @timed
     @with_retry(max_retries=10)
     def update(self, id: int, data: FaceSchema, ignore_exception: bool = False) -> FaceSchema | None:
         """Update face (overridden to handle JSON serialization)."""
-        db = self.db if self.db else database.SessionLocal()
-        should_close = self.db is None
-        try:
+
+        def apply(db: Session) -> FaceSchema | None:
             obj = db.query(Face).filter(Face.id == id).first()
             if not obj:
                 return None
@@ -139,17 +136,16 @@ class FaceDBService(BaseDBService[FaceSchema]):
             for key, value in data_dict.items():
                 setattr(obj, key, value)
 
-            db.commit()
+            db.flush()
             db.refresh(obj)
             return self._to_schema(obj)
-        except Exception as e:
-            db.rollback()
+
+        try:
+            return self._write(apply)
+        except Exception:
             if ignore_exception:
                 return None
             raise
-        finally:
-            if should_close:
-                db.close()
 
     @timed
     @with_retry(max_retries=10)
@@ -158,9 +154,7 @@ class FaceDBService(BaseDBService[FaceSchema]):
         if not data_list:
             return []
 
-        db = self.db if self.db else database.SessionLocal()
-        should_close = self.db is None
-        try:
+        def insert(db: Session) -> list[FaceSchema]:
             # Group by entity_id to verify existence efficiently
             entity_ids = {d.entity_id for d in data_list}
             existing_ids = {id for id, in db.query(Entity.id).filter(Entity.id.in_(list(entity_ids))).all()}
@@ -176,17 +170,16 @@ class FaceDBService(BaseDBService[FaceSchema]):
                 objs.append(Face(**prepared))
             
             db.add_all(objs)
-            db.commit()
+            db.flush()
             return [self._to_schema(obj) for obj in objs]
+
+        try:
+            return self._write(insert)
         except Exception as e:
-            db.rollback()
             if ignore_exception:
                 logger.debug(f"Ignoring Exception in Face.create_many: {e}")
                 return []
             raise
-        finally:
-            if should_close:
-                db.close()
 
     @timed
     @with_retry(max_retries=10)
@@ -197,9 +190,7 @@ class FaceDBService(BaseDBService[FaceSchema]):
             data: Face data
             ignore_exception: If True, return None on errors (e.g., entity deleted during callback)
         """
-        db = self.db if self.db else database.SessionLocal()
-        should_close = self.db is None
-        try:
+        def upsert(db: Session) -> FaceSchema | None:
             # Check if entity exists before writing face
             entity_exists = db.query(Entity.id).filter(Entity.id == data.entity_id).scalar() is not None
             if not entity_exists:
@@ -223,20 +214,19 @@ class FaceDBService(BaseDBService[FaceSchema]):
                 obj = Face(**data_dict)
                 db.add(obj)
 
-            db.commit()
+            db.flush()
             db.refresh(obj)
             logger.debug(f"Face id={data.id} saved")
             return self._to_schema(obj)
+
+        try:
+            return self._write(upsert)
         except Exception as e:
-            db.rollback()
             if ignore_exception:
                 logger.debug(f"Ignoring exception for Face id={data.id}: {e}")
                 return None
             logger.error(f"Failed to create/update Face id={data.id}: {e}")
             raise
-        finally:
-            if should_close:
-                db.close()
 
     @timed
     @with_retry(max_retries=10)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Callable
 
 from loguru import logger
@@ -46,9 +47,8 @@ class EntityIntelligenceDBService(BaseDBService[EntityIntelligence]):
         self, id: int, data: EntityIntelligenceData
     ) -> EntityIntelligenceData | None:
         """Update intelligence_data in sidecar table."""
-        db = self.db if self.db else database.SessionLocal()
-        should_close = self.db is None
-        try:
+
+        def apply(db: Session) -> EntityIntelligenceData | None:
             intel = db.query(EntityIntelligence).filter(EntityIntelligence.entity_id == id).first()
             
             if not intel:
@@ -63,32 +63,29 @@ class EntityIntelligenceDBService(BaseDBService[EntityIntelligence]):
             else:
                 intel.intelligence_data = data.model_dump()
 
-            db.commit()
+            db.flush()
             db.refresh(intel)
             
             if intel.intelligence_data:
                 return EntityIntelligenceData.model_validate(intel.intelligence_data)
             return None
-        except Exception:
-            db.rollback()
-            raise
-        finally:
-            if should_close:
-                db.close()
+
+        return self._write(apply)
 
     @timed
     @with_retry(max_retries=10)
     def atomic_update_intelligence_data(
         self, id: int, update_fn: Callable[[EntityIntelligenceData], None]
     ) -> EntityIntelligenceData | None:
-        """Atomically read-modify-write intelligence_data with row-level locking.
+        """Atomically read-modify-write intelligence_data.
 
-        Note: Caller must manage the database session and transaction.
-        This function will commit the changes but won't close the session.
+        The read and the write happen in one write transaction: on the
+        caller's session if one was given (committed here), otherwise on the
+        write queue, which serializes it with every other write of the
+        process. update_fn may be called again if the queued write is retried.
         """
-        db = self.db if self.db else database.SessionLocal()
-        should_close = self.db is None
-        try:
+
+        def apply(db: Session) -> EntityIntelligenceData | None:
             # Lock the intelligence record directly
             intel = (
                 db.query(EntityIntelligence)
@@ -104,7 +101,6 @@ class EntityIntelligenceDBService(BaseDBService[EntityIntelligence]):
                     return None
                 
                 logger.info(f"Initializing missing EntityIntelligence for entity {id}")
-                from datetime import datetime, UTC
                 now = int(datetime.now(UTC).timestamp() * 1000)
                 
                 intel = EntityIntelligence(
@@ -116,9 +112,8 @@ class EntityIntelligenceDBService(BaseDBService[EntityIntelligence]):
                 db.flush() 
             
             if not intel.intelligence_data:
-                 from datetime import datetime, UTC
-                 now = int(datetime.now(UTC).timestamp() * 1000)
-                 intel.intelligence_data = EntityIntelligenceData(last_updated=now).model_dump()
+                now = int(datetime.now(UTC).timestamp() * 1000)
+                intel.intelligence_data = EntityIntelligenceData(last_updated=now).model_dump()
 
             # Parse current data
             data = EntityIntelligenceData.model_validate(intel.intelligence_data)
@@ -127,17 +122,12 @@ class EntityIntelligenceDBService(BaseDBService[EntityIntelligence]):
             update_fn(data)
 
             # Update timestamp
-            from datetime import datetime, UTC
             data.last_updated = int(datetime.now(UTC).timestamp() * 1000)
 
             # Write back
             intel.intelligence_data = data.model_dump()
-            db.commit()
+            db.flush()
             
             return data
-        except Exception:
-            db.rollback()
-            raise
-        finally:
-            if should_close:
-                db.close()
+
+        return self._write(apply)
@@ -4,18 +4,29 @@ from pathlib import Path
 from typing import TYPE_CHECKING, override
 
 from sqlalchemy import (
+    DDL,
     JSON,
     BigInteger,
     Boolean,
+    Connection,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    delete,
+    event,
+    insert,
+    inspect,
+    literal,
+    or_,
+    select,
 )
 
 # Import shared Base
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import DeclarativeBase, Mapped, Mapper, mapped_column, relationship
+from sqlalchemy.sql import column, table
 
 # CRITICAL: Import versioning BEFORE defining models with __versioned__
 from . import versioning as _versioning  # noqa: F401  # pyright: ignore[reportUnusedImport]
@@ -34,8 +45,32 @@ class Entity(Base):
     """SQLAlchemy model for media entities."""
 
     __tablename__ = "entities"  # pyright: ignore[reportUnannotatedClassAttribute]
-    __versioned__ = {}  # Enable SQLAlchemy-Continuum versioning  # pyright: ignore[reportUnannotatedClassAttribute]
-    __table_args__ = {"sqlite_autoincrement": True}
+    # Enable SQLAlchemy-Continuum versioning; preview_status is derived state and not versioned
+    __versioned__ = {"exclude": ["preview_status"]}  # pyright: ignore[reportUnannotatedClassAttribute]
+    __table_args__ = (
+        # Keyset pagination: ORDER BY added_date DESC, id DESC seeks on this index
+        Index("ix_entities_added_date_id", "added_date", "id"),
+        # Listing filters: equality columns first, then the sort key, so a
+        # filtered page is an index range scan with no sort step (SQLite
+        # appends the rowid, i.e. id, to every index)
+        Index("ix_entities_deleted_added_date", "is_deleted", "added_date"),
+        Index("ix_entities_deleted_parent_added_date", "is_deleted", "parent_id", "added_date"),
+        Index("ix_entities_deleted_type_added_date", "is_deleted", "type", "added_date"),
+        Index("ix_entities_deleted_mime_added_date", "is_deleted", "mime_type", "added_date"),
+        Index(
+            "ix_entities_deleted_collection_added_date",
+            "is_deleted",
+            "is_collection",
+            "added_date",
+        ),
+        # The same filters without exclude_deleted (the default) carry no
+        # is_deleted predicate, so they get indexes that do not lead with it
+        Index("ix_entities_parent_added_date", "parent_id", "added_date"),
+        Index("ix_entities_type_added_date", "type", "added_date"),
+        Index("ix_entities_mime_added_date", "mime_type", "added_date"),
+        Index("ix_entities_collection_added_date", "is_collection", "added_date"),
+        {"sqlite_autoincrement": True},
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -70,6 +105,9 @@ class Entity(Base):
     # File storage
     file_path: Mapped[str | None] = mapped_column(String, nullable=True)
 
+    # Thumbnail state: "pending", "ready", "failed" (None for collections / no preview)
+    preview_status: Mapped[str | None] = mapped_column(String, nullable=True)
+
     # Soft delete flag
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
@@ -212,6 +250,142 @@ class Face(Base):
 
 
 
+class EntityClosure(Base):
+    """Closure table of the collection hierarchy (not versioned).
+
+    One row per (ancestor, descendant) pair, including each entity paired with
+    itself at depth 0. Subtree, ancestor and depth questions become single
+    indexed lookups instead of walks up or down parent_id. Rows are maintained
+    by the Entity mapper events below on insert, reparent and delete.
+    """
+
+    __tablename__ = "entity_closure"  # pyright: ignore[reportUnannotatedClassAttribute]
+    __table_args__ = (  # pyright: ignore[reportUnannotatedClassAttribute]
+        Index("ix_entity_closure_descendant_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("entities.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("entities.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Number of parent_id hops from ancestor to descendant
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"<EntityClosure(ancestor_id={self.ancestor_id}, "
+            f"descendant_id={self.descendant_id}, depth={self.depth})>"
+        )
+
+
+@event.listens_for(Entity, "after_insert")
+def _closure_after_insert(_mapper: Mapper[Entity], connection: Connection, target: Entity) -> None:
+    closure = EntityClosure.__table__
+    _ = connection.execute(
+        insert(closure).values(ancestor_id=target.id, descendant_id=target.id, depth=0)
+    )
+    if target.parent_id is not None:
+        _ = connection.execute(
+            insert(closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(closure.c.ancestor_id, literal(target.id), closure.c.depth + 1).where(
+                    closure.c.descendant_id == target.parent_id
+                ),
+            )
+        )
+
+
+@event.listens_for(Entity, "after_update")
+def _closure_after_update(_mapper: Mapper[Entity], connection: Connection, target: Entity) -> None:
+    if not inspect(target).attrs.parent_id.history.has_changes():
+        return
+    closure = EntityClosure.__table__
+
+    # Detach the subtree from its old ancestors...
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == target.id)
+    old_ancestors = select(closure.c.ancestor_id).where(
+        closure.c.descendant_id == target.id, closure.c.ancestor_id != target.id
+    )
+    _ = connection.execute(
+        delete(closure).where(
+            closure.c.descendant_id.in_(subtree), closure.c.ancestor_id.in_(old_ancestors)
+        )
+    )
+    if target.parent_id is None:
+        return
+
+    # ...and attach it under every ancestor of the new parent
+    above = closure.alias("above")
+    below = closure.alias("below")
+    _ = connection.execute(
+        insert(closure).from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+            .select_from(above.join(below, below.c.ancestor_id == target.id))
+            .where(above.c.descendant_id == target.parent_id),
+        )
+    )
+
+
+@event.listens_for(Entity, "after_delete")
+def _closure_after_delete(_mapper: Mapper[Entity], connection: Connection, target: Entity) -> None:
+    # ON DELETE CASCADE covers this when SQLite foreign keys are enabled
+    closure = EntityClosure.__table__
+    _ = connection.execute(
+        delete(closure).where(
+            or_(closure.c.ancestor_id == target.id, closure.c.descendant_id == target.id)
+        )
+    )
+
+
+@event.listens_for(Mapper, "after_configured")
+def _index_entity_versions() -> None:
+    # Point-in-time listings sort version rows the way GET /entities sorts entities
+    from sqlalchemy_continuum import version_class  # pyright: ignore[reportAttributeAccessIssue, reportUnknownVariableType]
+
+    versions = version_class(Entity).__table__  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+    if not any(index.name == "ix_entities_version_added_date_id" for index in versions.indexes):  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        _ = Index("ix_entities_version_added_date_id", versions.c.added_date, versions.c.id)  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+
+
+# Full-text index over label and description: an FTS5 table with external
+# content (the entities table), kept in sync by triggers. Created with the
+# entities table by create_all; the migration runs the same statements.
+ENTITIES_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5("
+    "label, description, content='entities', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    # Label matches weigh twice as much as description matches
+    "INSERT INTO entities_fts(entities_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0)')",
+    "CREATE TRIGGER IF NOT EXISTS entities_fts_ai AFTER INSERT ON entities BEGIN "
+    "INSERT INTO entities_fts(rowid, label, description) "
+    "VALUES (new.id, new.label, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS entities_fts_ad AFTER DELETE ON entities BEGIN "
+    "INSERT INTO entities_fts(entities_fts, rowid, label, description) "
+    "VALUES ('delete', old.id, old.label, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS entities_fts_au AFTER UPDATE OF label, description "
+    "ON entities BEGIN "
+    "INSERT INTO entities_fts(entities_fts, rowid, label, description) "
+    "VALUES ('delete', old.id, old.label, old.description); "
+    "INSERT INTO entities_fts(rowid, label, description) "
+    "VALUES (new.id, new.label, new.description); END",
+]
+
+for _statement in ENTITIES_FTS_DDL:
+    event.listen(Entity.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Entity.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS entities_fts").execute_if(dialect="sqlite"),
+)
+
+# Query-side handle on the FTS table (not part of the ORM metadata)
+entities_fts = table("entities_fts", column("rowid", Integer), column("rank", Float))
+
+
 class KnownPerson(Base):
     """Person identified by face embeddings."""
 
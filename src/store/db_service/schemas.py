@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Annotated, Any, TYPE_CHECKING, ClassVar
+from typing import Annotated, Any, TYPE_CHECKING, ClassVar, Literal
 
 from cl_ml_tools import BBox, FaceLandmarks
 from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
@@ -54,6 +54,9 @@ class EntitySchema(BaseModel):
     extension: str | None = None
     md5: str | None = None
     file_path: str | None = None
+    preview_status: str | None = Field(
+        None, description="Thumbnail state: pending, ready or failed"
+    )
     is_deleted: bool = False
     is_indirectly_deleted: bool | None = Field(
         None, description="True if any ancestor in the parent chain is soft-deleted"
@@ -204,10 +207,17 @@ class PaginationMetadata(BaseModel):
 
     page: int = Field(..., description="Current page number (1-indexed)")
     page_size: int = Field(..., description="Number of items per page")
-    total_items: int = Field(..., description="Total number of items across all pages")
-    total_pages: int = Field(..., description="Total number of pages")
+    total_items: int | None = Field(
+        ..., description="Total number of items across all pages (null if not requested)"
+    )
+    total_pages: int | None = Field(
+        ..., description="Total number of pages (null if not requested)"
+    )
     has_next: bool = Field(..., description="Whether there is a next page")
     has_prev: bool = Field(..., description="Whether there is a previous page")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page (null on the last page)"
+    )
 
 
 class PaginatedResponse(BaseModel):
@@ -233,6 +243,23 @@ class UpdateReadAuthConfig(BaseModel):
     enabled: bool = Field(..., description="Whether to enable read authentication")
 
 
+class EntityLookupRequest(BaseModel):
+    """Request schema for fetching several entities by ID."""
+
+    ids: list[int] = Field(
+        ..., min_length=1, max_length=1000, description="Entity IDs to fetch (max 1000)"
+    )
+
+
+class EntityLookupResponse(BaseModel):
+    """Entities fetched by ID, in request order."""
+
+    items: list[EntitySchema] = Field(..., description="Entities found, in request order")
+    missing: list[int] = Field(
+        default_factory=list, description="Requested IDs that do not exist"
+    )
+
+
 class VersionInfo(BaseModel):
     """Information about an entity version."""
 
@@ -241,3 +268,43 @@ class VersionInfo(BaseModel):
     updated_date: int | None = Field(None, description="Last update timestamp (milliseconds)")
 
     model_config: ClassVar[ConfigDict] = ConfigDict(from_attributes=True)
+
+
+class ChangeFeedMark(BaseModel):
+    """Final line of a change feed response: where to resume from."""
+
+    high_water_mark: int = Field(..., description="Pass as `since` to fetch the next changes")
+    has_more: bool = Field(False, description="Whether changes after the high-water mark exist")
+
+
+class SubtreeStats(BaseModel):
+    """Aggregate counts and sizes for everything below a collection."""
+
+    entity_id: int = Field(..., description="Root of the subtree")
+    descendant_count: int = Field(0, description="Number of entities below the root (any depth)")
+    collection_count: int = Field(0, description="Number of descendant collections")
+    media_count: int = Field(0, description="Number of descendant media items")
+    total_file_size: int = Field(0, description="Sum of descendant file sizes in bytes")
+    max_depth: int = Field(0, description="Depth of the deepest descendant (0 = no descendants)")
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one file in a batch upload."""
+
+    filename: str = Field(..., description="Original filename of the uploaded file")
+    status: Literal["created", "duplicate", "error"] = Field(
+        ..., description="created, duplicate (existing entity returned) or error"
+    )
+    entity: EntitySchema | None = Field(
+        None, description="Created or existing entity (None on error)"
+    )
+    error: str | None = Field(None, description="Error message when status is error")
+
+
+class BatchCreateResponse(BaseModel):
+    """Response for a batch upload, with one result per file in request order."""
+
+    items: list[BatchItemResult] = Field(..., description="Per-file results in upload order")
+    created: int = Field(0, description="Number of new entities created")
+    duplicates: int = Field(0, description="Number of files matching existing entities")
+    errors: int = Field(0, description="Number of files that failed")
@@ -0,0 +1,239 @@
+"""Single writer for database write transactions.
+
+SQLite allows one writer at a time, and threads that write concurrently end
+up waiting for the lock or failing with "database is locked". Instead, each
+process funnels its write transactions through one writer thread: callers
+submit a function that takes a Session, and the writer runs whatever is
+queued back to back in one transaction and commits it once (group commit).
+Every caller then gets its own function's result or exception.
+
+If a function in a group raises, the whole transaction is rolled back and
+the group is run again one transaction per function, so a failing write
+only fails its own caller. A function may therefore run twice: it should
+only touch the database, and must flush rather than commit.
+
+Writes grouped into one commit share one transaction in the entity version
+history. Writes submitted with the same key are never grouped, so each
+keeps its own version.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Connection, Engine
+from sqlalchemy.orm import Session
+
+from . import database
+
+Bind = Engine | Connection
+
+
+class _WriteRequest[T]:
+    """A queued write transaction and the future of its result."""
+
+    __slots__: tuple[str, ...] = ("fn", "bind", "key", "future")
+
+    def __init__(self, fn: Callable[[Session], T], bind: Bind, key: Hashable | None):
+        self.fn: Callable[[Session], T] = fn
+        self.bind: Bind = bind
+        self.key: Hashable | None = key
+        self.future: Future[T] = Future()
+
+
+class WriteQueue:
+    """Serializes write transactions on one thread and commits them in groups."""
+
+    def __init__(self, max_group_size: int = 64):
+        """Start the writer thread.
+
+        Args:
+            max_group_size: Most write transactions committed together
+        """
+        if max_group_size < 1:
+            raise ValueError("max_group_size must be at least 1")
+        self.max_group_size: int = max_group_size
+        self._requests: queue.Queue[_WriteRequest[Any] | None] = queue.Queue()
+        self._closed: bool = False
+        self._close_lock: threading.Lock = threading.Lock()
+        # Session of the group being written, for writes submitted by a write
+        self._session: Session | None = None
+        self._thread: threading.Thread = threading.Thread(
+            target=self._writer, name="db-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Write queue started (max_group_size={max_group_size})")
+
+    def submit[T](
+        self,
+        fn: Callable[[Session], T],
+        bind: Bind | None = None,
+        key: Hashable | None = None,
+    ) -> Future[T]:
+        """Queue a write transaction.
+
+        Args:
+            fn: Called with the writer's session; flushes its changes, returns
+                the result for the caller. It must not commit.
+            bind: Engine or connection to write to (default: the one behind
+                database.SessionLocal)
+            key: Writes with the same key (e.g. an entity) are committed
+                separately
+
+        Returns:
+            Future resolved once the write is committed
+        """
+        if threading.current_thread() is self._thread and self._session is not None:
+            # A write started by a queued write joins its transaction
+            future: Future[T] = Future()
+            try:
+                future.set_result(fn(self._session))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        request = _WriteRequest(fn, bind if bind is not None else _default_bind(), key)
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("Write queue is shut down")
+            self._requests.put(request)
+        return request.future
+
+    def run[T](
+        self,
+        fn: Callable[[Session], T],
+        bind: Bind | None = None,
+        key: Hashable | None = None,
+    ) -> T:
+        """Queue a write transaction and wait for its result.
+
+        Meant for worker threads; on the event loop, await run_async instead.
+        """
+        return self.submit(fn, bind=bind, key=key).result()
+
+    async def run_async[T](
+        self,
+        fn: Callable[[Session], T],
+        bind: Bind | None = None,
+        key: Hashable | None = None,
+    ) -> T:
+        """Queue a write transaction and await its result."""
+        return await asyncio.wrap_future(self.submit(fn, bind=bind, key=key))
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the writer after the writes already queued."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._requests.put(None)
+        self._thread.join(timeout)
+        logger.info("Write queue shut down")
+
+    def _writer(self) -> None:
+        held: _WriteRequest[Any] | None = None
+        stopping = False
+        while True:
+            if held is not None:
+                first, held = held, None
+            elif stopping:
+                return
+            else:
+                first = self._requests.get()
+                if first is None:
+                    return
+
+            group = [first]
+            keys = {first.key} - {None}
+            while len(group) < self.max_group_size:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                if request.bind is not first.bind or request.key in keys:
+                    # Starts the next group
+                    held = request
+                    break
+                group.append(request)
+                if request.key is not None:
+                    keys.add(request.key)
+
+            try:
+                self._write_group(group)
+            except Exception as e:
+                # Futures already carry the outcome; never let the writer die
+                logger.error(f"Write queue failed to finish a group: {e}")
+
+    def _write_group(self, group: list[_WriteRequest[Any]]) -> None:
+        group = [request for request in group if request.future.set_running_or_notify_cancel()]
+        if not group:
+            return
+
+        if len(group) > 1:
+            try:
+                results = self._transaction(group[0].bind, [request.fn for request in group])
+            except Exception as e:
+                logger.debug(f"Group of {len(group)} writes failed ({e}); writing them one by one")
+            else:
+                for request, result in zip(group, results):
+                    request.future.set_result(result)
+                return
+
+        for request in group:
+            try:
+                [result] = self._transaction(request.bind, [request.fn])
+            except Exception as e:
+                request.future.set_exception(e)
+            else:
+                request.future.set_result(result)
+
+    def _transaction(self, bind: Bind, fns: list[Callable[[Session], Any]]) -> list[Any]:
+        # Results stay readable after the commit and close (detached, not expired)
+        with Session(bind=bind, autoflush=False, expire_on_commit=False) as session:
+            self._session = session
+            try:
+                results = [fn(session) for fn in fns]
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+            finally:
+                self._session = None
+        return results
+
+
+def _default_bind() -> Bind:
+    if database.SessionLocal is None:
+        database.init_db()
+    return database.SessionLocal.kw["bind"]  # pyright: ignore[reportAny]
+
+
+_write_queue: WriteQueue | None = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> WriteQueue:
+    """The process-wide write queue, started on first use."""
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            _write_queue = WriteQueue()
+        return _write_queue
+
+
+def shutdown_write_queue() -> None:
+    """Stop the process-wide write queue; the next use starts a new one."""
+    global _write_queue
+    with _write_queue_lock:
+        write_queue, _write_queue = _write_queue, None
+    if write_queue is not None:
+        write_queue.shutdown()
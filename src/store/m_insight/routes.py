@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import cast
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Response
+from fastapi.concurrency import run_in_threadpool
 
 from store.common.auth import UserPayload, require_permission
 from store.db_service.schemas import JobInfo, EntityIntelligenceData
@@ -38,10 +39,10 @@ async def get_entity_intelligence(
 
     try:
         # Verify entity exists
-        _ = db.entity.get_or_raise(entity_id)
+        _ = await run_in_threadpool(db.entity.get_or_raise, entity_id)
 
         # Get intelligence data from separate table
-        return db.intelligence.get_intelligence_data(entity_id)
+        return await run_in_threadpool(db.intelligence.get_intelligence_data, entity_id)
     except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Entity not found")
 
@@ -62,8 +63,8 @@ async def get_entity_faces(
     _ = user
 
     try:
-        _ = db.entity.get_or_raise(entity_id)
-        return db.face.get_by_entity_id(entity_id)
+        _ = await run_in_threadpool(db.entity.get_or_raise, entity_id)
+        return await run_in_threadpool(db.face.get_by_entity_id, entity_id)
     except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Entity not found")
 
@@ -85,8 +86,8 @@ async def download_face_embedding(
     _ = user
 
     try:
-        _ = db.face.get_or_raise(face_id)
-        buffer = face_store.get_vector_buffer(face_id)
+        _ = await run_in_threadpool(db.face.get_or_raise, face_id)
+        buffer = await run_in_threadpool(face_store.get_vector_buffer, face_id)
     except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Face not found")
     except VectorResourceNotFound:
@@ -116,8 +117,8 @@ async def download_entity_clip_embedding(
     _ = user
 
     try:
-        _ = db.entity.get_or_raise(entity_id)
-        buffer = clip_store.get_vector_buffer(entity_id)
+        _ = await run_in_threadpool(db.entity.get_or_raise, entity_id)
+        buffer = await run_in_threadpool(clip_store.get_vector_buffer, entity_id)
     except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Entity not found")
     except VectorResourceNotFound:
@@ -149,8 +150,8 @@ async def download_entity_dino_embedding(
     _ = user
 
     try:
-        _ = db.entity.get_or_raise(entity_id)
-        buffer = dino_store.get_vector_buffer(entity_id)
+        _ = await run_in_threadpool(db.entity.get_or_raise, entity_id)
+        buffer = await run_in_threadpool(dino_store.get_vector_buffer, entity_id)
     except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Entity not found")
     except VectorResourceNotFound:
@@ -182,10 +183,10 @@ async def get_entity_jobs(
 
     try:
         # Verify entity exists
-        _ = db.entity.get_or_raise(entity_id)
+        _ = await run_in_threadpool(db.entity.get_or_raise, entity_id)
 
         # Get intelligence data using service
-        intel_data = db.intelligence.get_intelligence_data(entity_id)
+        intel_data = await run_in_threadpool(db.intelligence.get_intelligence_data, entity_id)
         return intel_data.active_jobs + intel_data.job_history
     except ResourceNotFoundError:
         raise HTTPException(status_code=404, detail="Entity not found")
@@ -204,7 +205,7 @@ async def get_all_known_persons(
 ) -> list[intel_schemas.KnownPersonSchema]:
     """Get all known persons."""
     _ = user
-    return db.known_person.get_all()
+    return await run_in_threadpool(db.known_person.get_all)
 
 
 @router.get(
@@ -222,7 +223,7 @@ async def get_known_person(
     """Get known person details."""
     _ = user
 
-    person = db.known_person.get(person_id)
+    person = await run_in_threadpool(db.known_person.get, person_id)
     if not person:
         raise HTTPException(status_code=404, detail="Known person not found")
 
@@ -244,10 +245,10 @@ async def get_person_faces(
     """Get all faces for a known person."""
     _ = user
 
-    if not db.known_person.exists(person_id):
+    if not await run_in_threadpool(db.known_person.exists, person_id):
         raise HTTPException(status_code=404, detail="Known person not found")
 
-    return db.face.get_by_known_person_id(person_id)
+    return await run_in_threadpool(db.face.get_by_known_person_id, person_id)
 
 
 @router.patch(
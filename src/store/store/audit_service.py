@@ -12,6 +12,8 @@ from sqlalchemy.orm import Session
 from store.db_service.db_internals import Entity, Face
 from store.vectorstore_services.vector_stores import QdrantVectorStore
 
+from .media_thumbnail import ThumbnailGenerator
+
 if TYPE_CHECKING:
     from ..common.storage import StorageService
     from ..broadcast_service.broadcaster import MInsightBroadcaster
@@ -178,6 +180,9 @@ class AuditService:
                 # Get relative path from base_dir
                 try:
                     relative_path = str(file.relative_to(self.storage_service.base_dir))
+                    # Thumbnails and renditions belong to their media file
+                    if ThumbnailGenerator.get_source_path(relative_path) in entity_paths:
+                        continue
                     if relative_path not in entity_paths:
                         orphaned.append(
                             OrphanedFile(
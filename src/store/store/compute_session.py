@@ -0,0 +1,157 @@
+"""Process-wide session with the compute service.
+
+HLS generation submits jobs to the compute service. Instead of logging in
+for every request, the store keeps one login for the whole process: it is
+created on first use, renewed before the token gets old, dropped after a
+failed submission (so the next request reconnects) and closed at shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from store.db_service import DBService
+from store.m_insight.job_service import JobSubmissionService
+
+from ..common.storage import StorageService
+from .config import StoreConfig
+
+if TYPE_CHECKING:
+    from cl_client import ComputeClient, SessionManager
+
+    from ..broadcast_service.broadcaster import MInsightBroadcaster
+
+
+class ComputeSession:
+    """Shared, lazily established login to the compute service."""
+
+    def __init__(
+        self,
+        config: StoreConfig,
+        broadcaster: MInsightBroadcaster | None = None,
+        refresh_interval: float = 1800.0,
+    ):
+        """Prepare the session; nothing is contacted until first use.
+
+        Args:
+            config: Store configuration with the compute URL and credentials
+            broadcaster: Broadcaster for job status updates
+            refresh_interval: Seconds after which the login is renewed
+        """
+        self.config: StoreConfig = config
+        self.broadcaster: MInsightBroadcaster | None = broadcaster
+        self.refresh_interval: float = refresh_interval
+        self._session: SessionManager | None = None
+        self._client: ComputeClient | None = None
+        self._job_service: JobSubmissionService | None = None
+        self._logged_in_at: float = 0.0
+        self._lock: asyncio.Lock = asyncio.Lock()
+        # entity_id -> (lock, number of holders and waiters)
+        self._submission_locks: dict[int, tuple[asyncio.Lock, int]] = {}
+
+    @property
+    def configured(self) -> bool:
+        """Whether compute credentials are configured at all."""
+        return bool(
+            self.config.compute_url
+            and self.config.compute_username
+            and self.config.compute_password
+        )
+
+    async def get_job_service(self) -> JobSubmissionService | None:
+        """Job submission service on the shared login, logging in if needed.
+
+        Returns:
+            The service, or None if compute is not configured or the login
+            failed (the next call tries again)
+        """
+        if not self.configured:
+            return None
+        async with self._lock:
+            if (
+                self._job_service is not None
+                and time.monotonic() - self._logged_in_at < self.refresh_interval
+            ):
+                return self._job_service
+            await self._disconnect()
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.error(f"Compute service login failed: {e}")
+                await self._disconnect()
+            return self._job_service
+
+    @asynccontextmanager
+    async def submission_lock(self, entity_id: int) -> AsyncIterator[None]:
+        """Serialize job submissions for one entity on the event loop.
+
+        JobSubmissionService guards each entity with a threading lock that is
+        held across an await; with one shared service, a second request for
+        the same entity would block the event loop on it. The lock is dropped
+        once no submission holds or waits for it.
+        """
+        lock, users = self._submission_locks.get(entity_id) or (asyncio.Lock(), 0)
+        self._submission_locks[entity_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            entry = self._submission_locks.get(entity_id)
+            # close() may have cleared the table meanwhile
+            if entry is not None and entry[0] is lock:
+                if entry[1] > 1:
+                    self._submission_locks[entity_id] = (lock, entry[1] - 1)
+                else:
+                    del self._submission_locks[entity_id]
+
+    async def reset(self) -> None:
+        """Drop the login after a failure; the next use logs in again."""
+        async with self._lock:
+            await self._disconnect()
+
+    async def close(self) -> None:
+        """Close the compute client and session at shutdown."""
+        await self.reset()
+        self._submission_locks.clear()
+
+    async def _connect(self) -> None:
+        from cl_client import ServerPref, SessionManager
+
+        server_config = ServerPref(
+            auth_url=self.config.auth_url or "http://localhost:8010",
+            compute_url=self.config.compute_url,
+            mqtt_url=self.config.mqtt_url,
+        )
+        self._session = SessionManager(server_pref=server_config)
+        _ = await self._session.login(
+            username=self.config.compute_username,
+            password=self.config.compute_password,
+        )
+        self._client = self._session.create_compute_client()
+        self._job_service = JobSubmissionService(
+            compute_client=self._client,
+            storage_service=StorageService(base_dir=str(self.config.media_storage_dir)),
+            broadcaster=self.broadcaster,
+            db=DBService(),
+        )
+        self._logged_in_at = time.monotonic()
+        logger.info(f"Compute session established (url={self.config.compute_url})")
+
+    async def _disconnect(self) -> None:
+        client, session = self._client, self._session
+        self._client = None
+        self._session = None
+        self._job_service = None
+        for resource in (client, session):
+            if resource is None:
+                continue
+            try:
+                await resource.close()
+            except Exception as e:
+                logger.warning(f"Failed to close compute session: {e}")
@@ -1,11 +1,14 @@
 from __future__ import annotations
 from argparse import ArgumentParser
 from pathlib import Path
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
 from ..common import utils
 from ..common.config import BaseConfig
 
+if TYPE_CHECKING:
+    from .media_thumbnail import PreviewSettings
+
 
 
 class StoreConfig(BaseConfig):
@@ -26,6 +29,27 @@ class StoreConfig(BaseConfig):
     compute_username: str | None = None
     compute_password: str | None = None
     auth_url: str | None = None
+    compute_session_refresh: float = 1800.0
+
+    # Metadata extraction
+    exiftool_workers: int = 2
+    exiftool_timeout: float = 30.0
+
+    # Ingest worker pools
+    ingest_cpu_workers: int = 2
+    ingest_io_workers: int = 4
+    ingest_queue_size: int = 16
+
+    # Background thumbnails
+    thumbnail_workers: int = 2
+    preview_wait_timeout: float = 3.0
+    preview_sizes: list[int] = [128, 256, 512, 1024]
+    preview_format: str = "webp"
+    preview_quality: int = 80
+
+    # Resumable uploads
+    upload_session_ttl: float = 24 * 3600
+    upload_gc_interval: float = 600.0
 
     # Calculated Fields
     cl_server_dir: Path
@@ -33,6 +57,18 @@ class StoreConfig(BaseConfig):
     stream_storage_dir: Path
     public_key_path: Path
 
+    def preview_settings(self) -> PreviewSettings:
+        """Preview rendition settings derived from the CLI options."""
+        from .media_thumbnail import PreviewSettings
+
+        return PreviewSettings.model_validate(
+            {
+                "sizes": self.preview_sizes,
+                "format": self.preview_format,
+                "quality": self.preview_quality,
+            }
+        )
+
     @classmethod
     def get_config(cls) -> StoreConfig:
         """Get or create the unified StoreConfig singleton."""
@@ -74,7 +110,94 @@ class StoreConfig(BaseConfig):
         parser.add_argument("--compute-url", default="http://localhost:8012", help="Compute service URL")
         parser.add_argument("--compute-username", default="admin", help="Compute service username")
         parser.add_argument("--compute-password", default="admin", help="Compute service password")
+        parser.add_argument(
+            "--compute-session-refresh",
+            type=float,
+            default=1800.0,
+            help="Seconds after which the shared compute service login is renewed",
+        )
         
+        # Metadata extraction
+        parser.add_argument(
+            "--exiftool-workers",
+            type=int,
+            default=2,
+            help="Number of persistent ExifTool processes",
+        )
+        parser.add_argument(
+            "--exiftool-timeout",
+            type=float,
+            default=30.0,
+            help="Per-file ExifTool timeout in seconds",
+        )
+
+        # Ingest worker pools
+        parser.add_argument(
+            "--ingest-cpu-workers",
+            type=int,
+            default=2,
+            help="Processes for CPU-bound ingest steps (hashing, thumbnails); 0 runs them in threads",
+        )
+        parser.add_argument(
+            "--ingest-io-workers",
+            type=int,
+            default=4,
+            help="Threads for blocking ingest work (ExifTool, ffprobe, database)",
+        )
+        parser.add_argument(
+            "--ingest-queue-size",
+            type=int,
+            default=16,
+            help="Maximum uploads being processed or queued at once",
+        )
+
+        # Background thumbnails
+        parser.add_argument(
+            "--thumbnail-workers",
+            type=int,
+            default=2,
+            help="Concurrent background thumbnail jobs",
+        )
+        parser.add_argument(
+            "--preview-wait-timeout",
+            type=float,
+            default=3.0,
+            help="Seconds a preview request waits for a pending thumbnail before returning 202",
+        )
+        parser.add_argument(
+            "--preview-sizes",
+            type=int,
+            nargs="+",
+            default=[128, 256, 512, 1024],
+            help="Longest-edge sizes of the preview renditions generated per media file",
+        )
+        parser.add_argument(
+            "--preview-format",
+            choices=["webp", "jpeg"],
+            default="webp",
+            help="Encoding of the preview renditions",
+        )
+        parser.add_argument(
+            "--preview-quality",
+            type=int,
+            default=80,
+            help="Encoder quality (1-100) of the preview renditions",
+        )
+
+        # Resumable uploads
+        parser.add_argument(
+            "--upload-session-ttl",
+            type=float,
+            default=24 * 3600,
+            help="Seconds of inactivity after which a resumable upload is discarded",
+        )
+        parser.add_argument(
+            "--upload-gc-interval",
+            type=float,
+            default=600.0,
+            help="Seconds between sweeps for abandoned resumable uploads",
+        )
+
         parser.add_argument("--debug", action="store_true", help="Enable debug mode")
         parser.add_argument(
             "--log-level",
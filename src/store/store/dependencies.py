@@ -16,7 +16,12 @@ from store.vectorstore_services.vector_stores import (
 from store.common.storage import StorageService
 from ..broadcast_service.broadcaster import MInsightBroadcaster
 
+from .compute_session import ComputeSession
 from .config import StoreConfig
+from .ingest import IngestExecutor
+from .media_metadata import MediaMetadataExtractor
+from .thumbnail_queue import ThumbnailQueue
+from .upload_sessions import UploadSessionManager
 from store.broadcast_service.monitor import MInsightMonitor
 from store.m_insight.job_service import JobSubmissionService
 from .service import EntityService
@@ -36,6 +41,47 @@ def get_m_insight_broadcaster(request: Request) -> MInsightBroadcaster | None:
     return cast(MInsightBroadcaster | None, getattr(request.app.state, "broadcaster", None))
 
 
+def get_ingest_executor(request: Request) -> IngestExecutor:
+    """Dependency to get the ingest worker pools from app state."""
+    executor = cast(IngestExecutor | None, getattr(request.app.state, "ingest_executor", None))
+    if executor is None:
+        raise RuntimeError("Ingest executor not initialized")
+    return executor
+
+
+def get_storage_service(request: Request) -> StorageService:
+    """Dependency to get the shared file storage service from app state."""
+    storage = cast(StorageService | None, getattr(request.app.state, "storage_service", None))
+    if storage is None:
+        raise RuntimeError("Storage service not initialized")
+    return storage
+
+
+def get_metadata_extractor(request: Request) -> MediaMetadataExtractor:
+    """Dependency to get the shared media metadata extractor from app state."""
+    extractor = cast(
+        MediaMetadataExtractor | None, getattr(request.app.state, "metadata_extractor", None)
+    )
+    if extractor is None:
+        raise RuntimeError("Metadata extractor not initialized")
+    return extractor
+
+
+def get_thumbnail_queue(request: Request) -> ThumbnailQueue | None:
+    """Dependency to get the background thumbnail queue from app state."""
+    return cast(ThumbnailQueue | None, getattr(request.app.state, "thumbnail_queue", None))
+
+
+def get_upload_sessions(request: Request) -> UploadSessionManager:
+    """Dependency to get the resumable upload session manager from app state."""
+    manager = cast(
+        UploadSessionManager | None, getattr(request.app.state, "upload_sessions", None)
+    )
+    if manager is None:
+        raise RuntimeError("Upload session manager not initialized")
+    return manager
+
+
 def get_monitor(request: Request) -> MInsightMonitor | None:
     """Dependency to get monitor from app state."""
     return getattr(request.app.state, "monitor", None)  # pyright: ignore[reportAny]
@@ -78,69 +124,49 @@ def get_job_submission_service(
     
     return None # Placeholder for now, will refactor to async if needed
 
-async def get_job_submission_service_async(
-    config: StoreConfig = Depends(StoreConfig.get_config),
-    broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
-    db_service: DBService = Depends(get_db_service),
-) -> JobSubmissionService | None:
-    """Async dependency to get JobSubmissionService instance for the API."""
-    if not config.compute_url or not config.compute_username or not config.compute_password:
-        return None
-        
-    from cl_client import ServerPref, SessionManager
-    
-    server_config = ServerPref(
-        auth_url=config.auth_url or "http://localhost:8010",
-        compute_url=config.compute_url,
-        mqtt_url=config.mqtt_url,
-    )
-    
-    storage_service = StorageService(base_dir=str(config.media_storage_dir))
-    
-    # Create session and login
-    session = SessionManager(server_pref=server_config)
-    await session.login(
-        username=config.compute_username,
-        password=config.compute_password,
-    )
-    compute_client = session.create_compute_client()
-    
-    return JobSubmissionService(
-        compute_client=compute_client,
-        storage_service=storage_service,
-        broadcaster=broadcaster,
-        db=db_service,
-    )
+def get_compute_session(request: Request) -> ComputeSession | None:
+    """Dependency to get the shared compute service session from app state."""
+    return cast(ComputeSession | None, getattr(request.app.state, "compute_session", None))
 
 
 def get_entity_service(
     db: Session = Depends(get_db),
     config: StoreConfig = Depends(StoreConfig.get_config),
-    db_service: DBService = Depends(get_db_service),
     clip_store: QdrantVectorStore = Depends(get_clip_store_dep),
     dino_store: QdrantVectorStore = Depends(get_dino_store_dep),
     face_store: QdrantVectorStore = Depends(get_face_store_dep),
     broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
-    job_service: JobSubmissionService | None = Depends(get_job_submission_service_async),
+    storage_service: StorageService = Depends(get_storage_service),
+    metadata_extractor: MediaMetadataExtractor = Depends(get_metadata_extractor),
+    executor: IngestExecutor = Depends(get_ingest_executor),
+    thumbnail_queue: ThumbnailQueue | None = Depends(get_thumbnail_queue),
 ) -> EntityService:
-    """Dependency to get EntityService instance."""
-    from .face_service import FaceService
-
-    db_service_with_session = DBService(db=db)
-    storage_service = StorageService(base_dir=str(config.media_storage_dir))
-    face_service = FaceService(
-        db=db,
-        db_service=db_service_with_session,
-        face_store=face_store,
-        storage_service=storage_service,
-    )
+    """Dependency to get EntityService instance.
 
+    Everything except the session is built once at startup; the FaceService
+    is only created if the request actually deletes faces.
+    """
     return EntityService(
         db,
         config,
-        face_service=face_service,
+        face_store=face_store,
         clip_store=clip_store,
         dino_store=dino_store,
         broadcaster=broadcaster,
-        job_service=job_service,
+        executor=executor,
+        thumbnail_queue=thumbnail_queue,
+        file_storage=storage_service,
+        metadata_extractor=metadata_extractor,
     )
+
+
+def get_streaming_entity_service(
+    service: EntityService = Depends(get_entity_service),
+    compute_session: ComputeSession | None = Depends(get_compute_session),
+) -> EntityService:
+    """Dependency to get EntityService for the HLS routes, which submit compute jobs.
+
+    Only these routes get the compute session; it logs in on first use.
+    """
+    service.compute_session = compute_session
+    return service
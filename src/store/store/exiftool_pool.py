@@ -0,0 +1,244 @@
+"""Pool of persistent ExifTool processes.
+
+Starting ExifTool costs a Perl interpreter launch per file. This module keeps
+a small number of ExifTool processes alive in ``-stay_open True -@ -`` mode and
+multiplexes metadata requests over them. Each request has a timeout; a process
+that hangs, crashes or returns garbage is killed and replaced on next use.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+from typing import cast
+
+from loguru import logger
+
+# Arguments used for every metadata request (grouped tag names, numeric values)
+EXIFTOOL_ARGS = ["-json", "-G", "-n"]
+
+
+class ExifToolError(RuntimeError):
+    """Raised when an ExifTool request fails or times out."""
+
+
+class ExifToolProcess:
+    """A single ExifTool process running in stay-open mode."""
+
+    def __init__(self, executable: str = "exiftool") -> None:
+        """Start the ExifTool process.
+
+        Args:
+            executable: ExifTool executable name or path
+
+        Raises:
+            FileNotFoundError: If ExifTool is not installed
+        """
+        self._process: subprocess.Popen[bytes] = subprocess.Popen(
+            [executable, "-stay_open", "True", "-@", "-", "-common_args", "-charset", "filename=utf8"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._sequence: int = 0
+
+    @property
+    def alive(self) -> bool:
+        """Whether the underlying process is still running."""
+        return self._process.poll() is None
+
+    def execute(self, args: list[str], timeout: float) -> bytes:
+        """Run one ExifTool command and return its stdout.
+
+        Args:
+            args: ExifTool arguments (one per line in the argfile protocol)
+            timeout: Seconds to wait for the ``{ready}`` marker
+
+        Returns:
+            Raw stdout produced for this command
+
+        Raises:
+            ExifToolError: If the process died or did not answer in time
+        """
+        stdin = self._process.stdin
+        stdout = self._process.stdout
+        if stdin is None or stdout is None or not self.alive:
+            raise ExifToolError("ExifTool process is not running")
+
+        self._sequence += 1
+        marker = f"{{ready{self._sequence}}}".encode()
+        command = "\n".join([*args, f"-execute{self._sequence}", ""])
+        try:
+            _ = stdin.write(command.encode("utf-8"))
+            stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise ExifToolError(f"Failed to send command to ExifTool: {e}") from e
+
+        fd = stdout.fileno()
+        deadline = time.monotonic() + timeout
+        output = bytearray()
+        while marker not in output:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ExifToolError(f"ExifTool did not respond within {timeout}s")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise ExifToolError("ExifTool process exited unexpectedly")
+            output.extend(chunk)
+
+        return bytes(output[: output.index(marker)])
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Ask ExifTool to exit, killing it if it does not comply."""
+        if self.alive and self._process.stdin is not None:
+            try:
+                _ = self._process.stdin.write(b"-stay_open\nFalse\n")
+                self._process.stdin.flush()
+                _ = self._process.wait(timeout=timeout)
+            except (BrokenPipeError, OSError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self) -> None:
+        """Forcefully terminate the process and release its pipes."""
+        if self.alive:
+            self._process.kill()
+            try:
+                _ = self._process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"ExifTool process {self._process.pid} did not exit after kill")
+        for pipe in (self._process.stdin, self._process.stdout):
+            if pipe is not None:
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+
+
+class ExifToolPool:
+    """Thread-safe pool of persistent ExifTool processes.
+
+    Processes are started lazily, so creating a pool is cheap and works even
+    when ExifTool is missing (requests then fail with ExifToolError).
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        timeout: float = 30.0,
+        executable: str = "exiftool",
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            size: Maximum number of concurrent ExifTool processes
+            timeout: Per-request timeout in seconds
+            executable: ExifTool executable name or path
+        """
+        if size < 1:
+            raise ValueError("ExifTool pool size must be at least 1")
+        self.size: int = size
+        self.timeout: float = timeout
+        self.executable: str = executable
+        self._slots: queue.Queue[ExifToolProcess | None] = queue.Queue()
+        self._lock: threading.Lock = threading.Lock()
+        self._processes: set[ExifToolProcess] = set()
+        self._closed: bool = False
+        for _ in range(size):
+            self._slots.put(None)
+
+    def extract_metadata(
+        self, file_path: str, tags: list[str] | None = None
+    ) -> dict[str, object]:
+        """Extract metadata from a file.
+
+        Args:
+            file_path: Path of the file on disk
+            tags: Extra ExifTool arguments restricting the output (e.g.
+                ``["-EXIF:CreateDate"]``); all tags when omitted
+
+        Returns:
+            Dict of ``Group:Tag`` -> value, as produced by ``exiftool -json -G -n``
+
+        Raises:
+            ExifToolError: If ExifTool is unavailable, times out or fails
+        """
+        output = self.execute([*EXIFTOOL_ARGS, *(tags or []), file_path])
+        try:
+            parsed = cast(list[dict[str, object]], json.loads(output or b"[]"))
+        except json.JSONDecodeError as e:
+            raise ExifToolError(f"Invalid ExifTool output for {file_path}: {e}") from e
+        if not parsed:
+            raise ExifToolError(f"ExifTool returned no metadata for {file_path}")
+        return parsed[0]
+
+    def execute(self, args: list[str]) -> bytes:
+        """Run an ExifTool command on a pooled process.
+
+        A process that fails for any reason is discarded; the next request
+        on that slot starts a fresh one.
+
+        Args:
+            args: ExifTool arguments
+
+        Returns:
+            Raw stdout of the command
+
+        Raises:
+            ExifToolError: If the pool is closed or the command fails
+        """
+        if self._closed:
+            raise ExifToolError("ExifTool pool is closed")
+
+        try:
+            process = self._slots.get(timeout=self.timeout)
+        except queue.Empty as e:
+            raise ExifToolError("Timed out waiting for a free ExifTool process") from e
+
+        try:
+            if process is None or not process.alive:
+                if process is not None:
+                    self._discard(process)
+                process = self._spawn()
+            return process.execute(args, self.timeout)
+        except ExifToolError:
+            if process is not None:
+                logger.warning("ExifTool process failed; it will be respawned")
+                self._discard(process)
+                process = None
+            raise
+        finally:
+            self._slots.put(process)
+
+    def close(self) -> None:
+        """Stop all ExifTool processes. Subsequent requests fail."""
+        self._closed = True
+        with self._lock:
+            processes = list(self._processes)
+            self._processes.clear()
+        for process in processes:
+            process.close()
+        logger.info(f"ExifTool pool closed ({len(processes)} process(es) stopped)")
+
+    def _spawn(self) -> ExifToolProcess:
+        try:
+            process = ExifToolProcess(self.executable)
+        except OSError as e:
+            raise ExifToolError(f"Failed to start ExifTool: {e}") from e
+        with self._lock:
+            self._processes.add(process)
+        logger.debug("Started persistent ExifTool process")
+        return process
+
+    def _discard(self, process: ExifToolProcess) -> None:
+        with self._lock:
+            self._processes.discard(process)
+        process.kill()
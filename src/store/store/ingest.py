@@ -0,0 +1,122 @@
+"""Streaming ingest helpers for uploaded media.
+
+Uploads are spooled chunk by chunk into the storage staging area so that
+memory use per upload stays constant regardless of file size. Blocking ingest
+work (hashing, ExifTool/ffprobe, thumbnails, SQLite commits) is dispatched to
+an IngestExecutor so it never runs on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from fastapi import UploadFile
+from loguru import logger
+
+from ..common.storage import StagedFile, StorageService
+
+# Read size per chunk when spooling an upload to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+async def stage_upload(upload: UploadFile, storage: StorageService) -> StagedFile:
+    """Spool an upload into the staging area, hashing and sizing it as it streams.
+
+    Args:
+        upload: Incoming multipart upload
+        storage: Storage service that owns the staging area
+
+    Returns:
+        StagedFile describing the spooled content. The caller owns the file
+        and must commit or discard it.
+    """
+    writer = storage.create_staging_writer(upload.filename or "file")
+    try:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            writer.write(chunk)
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+class IngestExecutor:
+    """Worker pools for blocking ingest stages.
+
+    - A thread pool runs whole ingest operations (subprocess calls, DB work
+      and retry backoff). Admission is bounded by ``queue_size``; requests
+      beyond that wait on the event loop without holding a worker.
+    - An optional process pool runs CPU-bound steps (image hashing,
+      thumbnail generation) so they do not contend for the GIL.
+    """
+
+    def __init__(self, cpu_workers: int = 2, io_workers: int = 4, queue_size: int = 16) -> None:
+        """Create the worker pools.
+
+        Args:
+            cpu_workers: Process pool size; 0 runs CPU-bound steps inline in the
+                calling worker thread
+            io_workers: Thread pool size for ingest operations
+            queue_size: Maximum ingest operations admitted (running or queued)
+        """
+        if io_workers < 1:
+            raise ValueError("io_workers must be at least 1")
+        if queue_size < io_workers:
+            raise ValueError("queue_size must be at least io_workers")
+
+        # "spawn" avoids forking a process that already runs threads (uvicorn, MQTT)
+        self.cpu: Executor | None = (
+            ProcessPoolExecutor(
+                max_workers=cpu_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            if cpu_workers > 0
+            else None
+        )
+        self.io: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix="ingest"
+        )
+        self._admission: asyncio.Semaphore = asyncio.Semaphore(queue_size)
+        logger.info(
+            f"Ingest executor started (cpu_workers={cpu_workers}, "
+            + f"io_workers={io_workers}, queue_size={queue_size})"
+        )
+
+    async def run(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run a blocking ingest operation on the thread pool.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            The callable's return value
+        """
+        async with self._admission:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.io, functools.partial(fn, *args, **kwargs))
+
+    def run_cpu(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run a CPU-bound step on the process pool and wait for its result.
+
+        Meant to be called from a worker thread (inside ``run``), never from
+        the event loop. ``fn`` and its arguments must be picklable.
+        """
+        if self.cpu is None:
+            return fn(*args, **kwargs)
+        return self.cpu.submit(fn, *args, **kwargs).result()
+
+    def shutdown(self) -> None:
+        """Stop both pools, waiting for running work to finish."""
+        self.io.shutdown(wait=True)
+        if self.cpu is not None:
+            self.cpu.shutdown(wait=True)
+        logger.info("Ingest executor shut down")
@@ -11,6 +11,8 @@ import tempfile
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
 import magic
 
 from cl_ml_tools.algorithms import (
@@ -23,8 +25,23 @@ from cl_ml_tools.algorithms import (
     sha512hash_video2,
 )
 from loguru import logger
+from PIL import Image
 from pydantic import BaseModel, Field
 
+from ..common.storage import StagedFile
+from .exiftool_pool import ExifToolPool
+
+if TYPE_CHECKING:
+    from .ingest import IngestExecutor
+
+# Once dimensions come from the image decoder, ExifTool is only needed for dates
+IMAGE_DATE_TAGS = [
+    "-fast",
+    "-EXIF:DateTimeOriginal",
+    "-EXIF:CreateDate",
+    "-EXIF:DateTime",
+]
+
 
 class FFProbeFormat(BaseModel):
     """FFProbe format section from JSON output."""
@@ -66,6 +83,28 @@ class MediaMetadata(BaseModel):
     )
 
 
+class MediaIdentity(BaseModel):
+    """Content identity of a file: the fields needed for duplicate detection.
+
+    Computing it needs only MIME sniffing and hashing, no ExifTool/ffprobe.
+    """
+
+    md5: str = Field(..., description="File hash (SHA-512 or MD5)", min_length=32)
+    mime_type: str = Field(..., description="MIME type", min_length=1)
+    media_type: MediaType = Field(..., description="Media type classification")
+    extension: str = Field(..., description="File extension without dot", min_length=1)
+    width: int | None = Field(None, description="Decoded image width in pixels", ge=0)
+    height: int | None = Field(None, description="Decoded image height in pixels", ge=0)
+
+
+class ImageDigest(BaseModel):
+    """Perceptual hash and pixel dimensions of an image, from one pass over the file."""
+
+    hash: str
+    width: int | None = None
+    height: int | None = None
+
+
 def validate_tools() -> None:
     """Validate required tools are available.
 
@@ -96,15 +135,59 @@ def validate_tools() -> None:
         ) from e
 
 
+def digest_image_file(file_path: str) -> ImageDigest:
+    """Compute the perceptual hash of an image file and read its dimensions.
+
+    The dimensions come from the image header on the same open file, so
+    ExifTool does not have to parse the image for them. The hash itself stays
+    cl_ml_tools' sha512hash_image so it matches hashes already in the store.
+    Module-level so it can be dispatched to a process pool.
+
+    Args:
+        file_path: Path of the image file
+
+    Returns:
+        ImageDigest with the hash (hex digest) and, if readable, width/height
+    """
+    width: int | None = None
+    height: int | None = None
+    with open(file_path, "rb") as f:
+        try:
+            with Image.open(f) as image:
+                width, height = image.size
+        except Exception:
+            # Formats Pillow cannot read: ExifTool still reports the dimensions
+            pass
+        _ = f.seek(0)
+        file_hash, _ = sha512hash_image(cast(BytesIO, f))
+    return ImageDigest(hash=str(file_hash), width=width, height=height)
+
+
 class MediaMetadataExtractor:
     """Extracts metadata from media files using various tools."""
 
-    def __init__(self) -> None:
-        """Initialize the metadata extractor."""
+    def __init__(
+        self,
+        exiftool_pool: ExifToolPool | None = None,
+        executor: IngestExecutor | None = None,
+    ) -> None:
+        """Initialize the metadata extractor.
+
+        Args:
+            exiftool_pool: Optional pool of persistent ExifTool processes. When
+                omitted, a new ExifTool process is started for every file.
+            executor: Optional ingest executor; image hashing runs on its
+                process pool when provided.
+        """
         self.exif_extractor: MetadataExtractor = MetadataExtractor()
+        self.exiftool_pool: ExifToolPool | None = exiftool_pool
+        self.executor: IngestExecutor | None = executor
 
     def extract_metadata(self, file_bytes: bytes, filename: str) -> MediaMetadata:
-        """Extract comprehensive metadata from a media file.
+        """Extract comprehensive metadata from in-memory file content.
+
+        Prefer extract_metadata_from_file for uploads; this variant writes the
+        bytes to a single temporary file that all tools share.
 
         Args:
             file_bytes: File content as bytes
@@ -117,40 +200,168 @@ class MediaMetadataExtractor:
             ValueError: If MIME type or extension cannot be determined
             RuntimeError: If hash computation fails
         """
+        # Step 1-2: Determine MIME type, media type and extension
+        mime_type_str, media_type, extension = self._detect_type(file_bytes)
 
-        # Step 1: Determine MIME type and media type
-        bytes_io = BytesIO(file_bytes)
+        # Step 3-4: Compute hash based on media type
+        try:
+            file_hash = self._compute_hash(file_bytes, media_type)
+        except Exception as e:
+            raise RuntimeError(f"Hash computation failed: {e}") from e
+
+        # Create one temporary file shared by ExifTool and ffprobe
+        with tempfile.NamedTemporaryFile(
+            delete=False, suffix=Path(filename).suffix
+        ) as tmp_file:
+            _ = tmp_file.write(file_bytes)
+            tmp_path = tmp_file.name
+
+        try:
+            return self._extract_tool_metadata(
+                tmp_path,
+                filename,
+                file_size=len(file_bytes),
+                file_hash=file_hash,
+                mime_type_str=mime_type_str,
+                media_type=media_type,
+                extension=extension,
+            )
+        finally:
+            # Clean up temporary file
+            Path(str(tmp_path)).unlink(missing_ok=True)
+
+    def identify_file(self, staged: StagedFile) -> MediaIdentity:
+        """Compute the content identity (hash, MIME type) of a staged file.
+
+        This is the cheap first stage of ingest: callers check the hash for
+        duplicates before paying for extract_metadata_from_file.
+
+        Args:
+            staged: File spooled to the staging area
+
+        Returns:
+            MediaIdentity for the file
+
+        Raises:
+            ValueError: If MIME type or extension cannot be determined
+            RuntimeError: If hash computation fails
+        """
+        mime_type_str, media_type, extension = self._detect_type(staged.head)
+
+        try:
+            digest = self._compute_file_hash(staged, media_type)
+        except Exception as e:
+            raise RuntimeError(f"Hash computation failed: {e}") from e
+
+        return MediaIdentity(
+            md5=digest.hash,
+            mime_type=mime_type_str,
+            media_type=media_type,
+            extension=extension,
+            width=digest.width,
+            height=digest.height,
+        )
+
+    def extract_metadata_from_file(
+        self, staged: StagedFile, identity: MediaIdentity | None = None
+    ) -> MediaMetadata:
+        """Extract comprehensive metadata from a staged file on disk.
+
+        MIME sniffing uses the head captured while streaming, the MD5 computed
+        while streaming is reused for non-image media, and ExifTool/ffprobe run
+        directly against the staged file. Nothing is loaded fully into memory.
+        For images whose dimensions were read while hashing, ExifTool is asked
+        only for the capture date.
+
+        Args:
+            staged: File spooled to the staging area
+            identity: Result of identify_file, if already computed
+
+        Returns:
+            MediaMetadata instance containing all extracted metadata fields
+
+        Raises:
+            ValueError: If MIME type or extension cannot be determined
+            RuntimeError: If hash computation fails
+        """
+        if identity is None:
+            identity = self.identify_file(staged)
+
+        dimensions = None
+        if identity.width is not None and identity.height is not None:
+            dimensions = (identity.width, identity.height)
+
+        return self._extract_tool_metadata(
+            str(staged.path),
+            staged.original_filename,
+            file_size=staged.file_size,
+            file_hash=identity.md5,
+            mime_type_str=identity.mime_type,
+            media_type=identity.media_type,
+            extension=identity.extension,
+            dimensions=dimensions,
+        )
+
+    def _detect_type(self, head: bytes) -> tuple[str, MediaType, str]:
+        """Determine MIME type, media type and extension from leading bytes.
+
+        Args:
+            head: Leading bytes of the file (or the full content)
+
+        Returns:
+            Tuple of (mime_type, media_type, extension)
+
+        Raises:
+            ValueError: If MIME type or extension cannot be determined
+        """
         try:
             # This now does robust magic detection with fallback and returns (mime_str, media_type)
-            mime_type_str, media_type = determine_mime(bytes_io)
+            mime_type_str, media_type = determine_mime(BytesIO(head))
         except Exception as e:
             raise ValueError(f"Failed to determine MIME type: {e}") from e
 
-        # Step 2: Extract extension from MIME type using consolidated logic
+        # Extract extension from MIME type using consolidated logic
         try:
             extension = get_extension_from_mime(mime_type_str, media_type)
         except Exception as e:
             raise ValueError(f"Cannot determine extension: {e}") from e
 
-        # Step 3: Set file size
-        file_size = len(file_bytes)
+        return mime_type_str, media_type, extension
+
+    def _extract_tool_metadata(
+        self,
+        file_path: str,
+        filename: str,
+        *,
+        file_size: int,
+        file_hash: str,
+        mime_type_str: str,
+        media_type: MediaType,
+        extension: str,
+        dimensions: tuple[int, int] | None = None,
+    ) -> MediaMetadata:
+        """Run ExifTool (and ffprobe for videos) on a file and build MediaMetadata.
 
-        # Step 4: Compute hash based on media type
-        try:
-            file_hash = self._compute_hash(file_bytes, media_type)
-        except Exception as e:
-            raise RuntimeError(f"Hash computation failed: {e}") from e
+        Args:
+            file_path: Path of the file on disk
+            filename: Original filename (for logging)
+            file_size: File size in bytes
+            file_hash: Precomputed content hash
+            mime_type_str: Detected MIME type
+            media_type: Detected media type
+            extension: Extension derived from the MIME type
+            dimensions: (width, height) already known from the image decoder
 
+        Returns:
+            MediaMetadata instance containing all extracted metadata fields
+        """
         # Step 5: Extract EXIF metadata using ExifTool
-        # Create temporary file for ExifTool processing
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=Path(filename).suffix
-        ) as tmp_file:
-            _ = tmp_file.write(file_bytes)
-            tmp_path = tmp_file.name
-
         try:
-            exif_data = self.exif_extractor.extract_metadata_all(tmp_path)
+            if self.exiftool_pool is not None:
+                tags = IMAGE_DATE_TAGS if dimensions is not None else None
+                exif_data = self.exiftool_pool.extract_metadata(file_path, tags=tags)
+            else:
+                exif_data = self.exif_extractor.extract_metadata_all(file_path)
 
             # Extract width (try multiple possible fields)
             width_val = (
@@ -207,14 +418,14 @@ class MediaMetadataExtractor:
             duration = None
             create_date_str = None
             create_date_ms = None
-        finally:
-            # Clean up temporary file
-            Path(tmp_path).unlink(missing_ok=True)
+
+        if dimensions is not None:
+            width, height = dimensions
 
         # Step 6: Video duration fallback using ffprobe
         if media_type == MediaType.VIDEO and duration is None:
             try:
-                duration_fallback = self._extract_video_duration(file_bytes, filename)
+                duration_fallback = self._extract_video_duration(file_path, filename)
                 if duration_fallback is not None:
                     duration = duration_fallback
             except Exception as e:
@@ -246,7 +457,6 @@ class MediaMetadataExtractor:
             create_date=create_date_ms,
         )
 
-
     def _compute_hash(self, file_bytes: bytes, media_type: MediaType) -> str:
         """Compute hash based on media type.
 
@@ -278,23 +488,42 @@ class MediaMetadataExtractor:
         except Exception as e:
             raise RuntimeError(f"Hash computation failed: {e}") from e
 
-    def _extract_video_duration(self, file_bytes: bytes, filename: str) -> float | None:
+    def _compute_file_hash(self, staged: StagedFile, media_type: MediaType) -> ImageDigest:
+        """Compute hash for a staged file.
+
+        Images are hashed from their decoded pixels (read from disk), picking
+        up their dimensions on the way; every other media type reuses the MD5
+        computed while the file was streamed.
+
+        Args:
+            staged: Staged file
+            media_type: MediaType enum value
+
+        Returns:
+            ImageDigest (dimensions only set for images)
+
+        Raises:
+            RuntimeError: If hash computation fails
+        """
+        try:
+            if media_type == MediaType.IMAGE:
+                if self.executor is not None:
+                    return self.executor.run_cpu(digest_image_file, str(staged.path))
+                return digest_image_file(str(staged.path))
+            return ImageDigest(hash=staged.md5)
+        except Exception as e:
+            raise RuntimeError(f"Hash computation failed: {e}") from e
+
+    def _extract_video_duration(self, file_path: str, filename: str) -> float | None:
         """Extract video duration using ffprobe.
 
         Args:
-            file_bytes: Video file content as bytes
-            filename: Original filename for extension
+            file_path: Path of the video file on disk
+            filename: Original filename (for logging)
 
         Returns:
             Duration in seconds as float, or None if extraction fails
         """
-        # Create temporary file for ffprobe
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=Path(filename).suffix
-        ) as tmp_file:
-            _ = tmp_file.write(file_bytes)
-            tmp_path = tmp_file.name
-
         try:
             # Run ffprobe to get duration
             result = subprocess.run(
@@ -306,7 +535,7 @@ class MediaMetadataExtractor:
                     "format=duration",
                     "-of",
                     "json",
-                    tmp_path,
+                    file_path,
                 ],
                 capture_output=True,
                 text=True,
@@ -327,8 +556,5 @@ class MediaMetadataExtractor:
             logger.warning(f"ffprobe timeout for {filename}")
         except Exception as e:
             logger.warning(f"ffprobe execution failed for {filename}: {e}")
-        finally:
-            # Clean up temporary file
-            Path(tmp_path).unlink(missing_ok=True)
 
         return None
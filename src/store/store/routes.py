@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import math
 import os
@@ -20,7 +22,8 @@ from fastapi import (
     UploadFile,
     status,
 )
-from fastapi.responses import FileResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel
 
@@ -32,7 +35,17 @@ from store.db_service import EntitySchema
 from store.db_service import schemas as db_schemas
 from ..broadcast_service import schemas as broadcast_schemas
 from ..common.auth import UserPayload, require_admin, require_permission
-from .dependencies import get_m_insight_broadcaster, get_config_service, get_entity_service, get_monitor
+from .dependencies import (
+    get_config_service,
+    get_entity_service,
+    get_ingest_executor,
+    get_m_insight_broadcaster,
+    get_monitor,
+    get_storage_service,
+    get_streaming_entity_service,
+    get_thumbnail_queue,
+    get_upload_sessions,
+)
 from .config import StoreConfig
 from store.vectorstore_services.vector_stores import (
     QdrantVectorStore,
@@ -41,24 +54,116 @@ from store.vectorstore_services.vector_stores import (
     get_face_store_dep,
 )
 from ..broadcast_service.monitor import MInsightMonitor
-from .service import DuplicateFileError, EntityService, EntityNotSoftDeletedError
+from .service import (
+    DuplicateFileError,
+    EntityNotSoftDeletedError,
+    EntityService,
+    InvalidParentError,
+)
 from .audit_service import AuditReport, AuditService, CleanupReport
-from ..common.storage import StorageService
+from ..common.storage import StagedFile, StorageService
 from ..broadcast_service.broadcaster import MInsightBroadcaster
 from .media_thumbnail import ThumbnailGenerator
+from .ingest import IngestExecutor, stage_upload
+from .thumbnail_queue import ThumbnailQueue
+from .upload_sessions import (
+    UploadIncompleteError,
+    UploadOffsetMismatchError,
+    UploadSessionManager,
+    UploadSessionNotFoundError,
+    UploadSessionStatus,
+)
 
 router = APIRouter()
 
+# How often a long-polling change feed request re-checks for new transactions
+CHANGES_POLL_INTERVAL = 0.5
+
+# Metadata may change at any time: caches must revalidate (cheap with ETags)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+# A response pinned to a file version (?v=<version>) never changes
+IMMUTABLE_CACHE_CONTROL = "max-age=31536000, immutable"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of the If-None-Match header against an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def _file_version(entity: EntitySchema) -> str | None:
+    """Tag of the stored file's bytes, used as its strong ETag and ?v= pin.
+
+    The md5 is not byte-level for images (it hashes the pixels), so a file
+    replaced by one with the same pixels but other metadata keeps it. Any
+    replacement bumps updated_date, so key on file_path plus updated_date.
+    """
+    if not entity.file_path:
+        return None
+    key = f"{entity.file_path}:{entity.updated_date}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _file_cache_control(entity: EntitySchema, v: str | None) -> str:
+    if v is not None and v == _file_version(entity):
+        return IMMUTABLE_CACHE_CONTROL
+    return REVALIDATE_CACHE_CONTROL
+
+
+def _announce_created(
+    broadcaster: MInsightBroadcaster | None,
+    config: StoreConfig,
+    item: EntitySchema,
+    is_duplicate: bool,
+) -> None:
+    """Clear stale retained status and publish a creation event for a new entity."""
+    if not broadcaster:
+        return
+
+    # CRITICAL: Clear retained MQTT status to prevent "ghost" statuses from ID reuse
+    status_topic = f"mInsight/{config.port}/entity_item_status/{item.id}"
+    _ = broadcaster.clear_retained(status_topic)
+    logger.debug(f"Cleared retained status for entity {item.id} on {status_topic}")
+
+    # Broadcast MQTT event only if this was a new entity (not a duplicate)
+    if item.md5 and not is_duplicate:
+        topic = f"store/{config.port}/items"
+        payload = {"id": item.id, "md5": item.md5, "timestamp": int(time.time() * 1000)}
+        _ = broadcaster.publish_event(topic=topic, payload=json.dumps(payload))
+        logger.info(f"Broadcasted creation event for item {item.id} on {topic}")
+
 
 @router.get(
     "/entities",
     tags=["entity"],
     summary="Get Entities",
-    description="Retrieves a paginated list of media entities, optionally at a specific version.",
+    description=(
+        "Retrieves a paginated list of media entities, optionally at a specific version. "
+        "Responses carry a weak ETag; send it back in If-None-Match to get 304 Not Modified "
+        "while no entity has changed."
+    ),
     operation_id="get_entities",
-    responses={200: {"model": db_schemas.PaginatedResponse, "description": "Successful Response"}},
+    response_model=db_schemas.PaginatedResponse,
+    responses={
+        200: {"model": db_schemas.PaginatedResponse, "description": "Successful Response"},
+        304: {"description": "Not modified since the ETag in If-None-Match"},
+    },
 )
 async def get_entities(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page (max 100)"),
     version: int | None = Query(
@@ -85,51 +190,124 @@ async def get_entities(
     date_to: int | None = Query(None, description="Filter by added date to (timestamp ms)"),
     parent_id: int | None = Query(None, description="Filter by parent collection ID (0 = root-level items)"),
     is_collection: bool | None = Query(None, description="Filter by collection (true) vs media item (false)"),
+    ancestor_id: int | None = Query(
+        None, description="Only entities anywhere below this collection (recursive)"
+    ),
+    as_of_transaction: int | None = Query(
+        None, description="List entities as they were right after this transaction"
+    ),
+    cursor: str | None = Query(
+        None, description="Cursor from the previous page's next_cursor (replaces page)"
+    ),
+    include_total: bool = Query(
+        True, description="Whether to count all matching items (total_items/total_pages)"
+    ),
     user: UserPayload | None = Depends(require_permission("media_store_read")),
     service: EntityService = Depends(get_entity_service),
-) -> db_schemas.PaginatedResponse:
+) -> db_schemas.PaginatedResponse | Response:
     """
     Get all entities with pagination.
+
+    Pages can be addressed by number (page) or by cursor: every page carries a
+    next_cursor, and following it costs the same however deep the page is.
     """
     _ = user
-    items, total_count = service.get_entities(
-        page=page,
-        page_size=page_size,
-        version=version,
-        filter_param=filter_param,
-        search_query=search_query,
-        exclude_deleted=exclude_deleted,
-        md5=md5,
-        mime_type=mime_type,
-        type_=type,
-        width=width,
-        height=height,
-        file_size_min=file_size_min,
-        file_size_max=file_size_max,
-        date_from=date_from,
-        date_to=date_to,
-        parent_id=parent_id,
-        is_collection=is_collection,
-    )
+    listing_tag = await run_in_threadpool(service.get_listing_etag)
+    etag = f'W/"{listing_tag}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag, REVALIDATE_CACHE_CONTROL)
+
+    try:
+        items, total_count, next_cursor = await run_in_threadpool(
+            service.get_entities,
+            page=page,
+            page_size=page_size,
+            version=version,
+            filter_param=filter_param,
+            search_query=search_query,
+            exclude_deleted=exclude_deleted,
+            md5=md5,
+            mime_type=mime_type,
+            type_=type,
+            width=width,
+            height=height,
+            file_size_min=file_size_min,
+            file_size_max=file_size_max,
+            date_from=date_from,
+            date_to=date_to,
+            parent_id=parent_id,
+            is_collection=is_collection,
+            cursor=cursor,
+            include_total=include_total,
+            ancestor_id=ancestor_id,
+            as_of_transaction=as_of_transaction,
+        )
+    except ValueError as e:
+        # Malformed cursor or unsupported parameter combination
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Calculate pagination metadata
 
-    total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
-    has_next = page < total_pages
-    has_prev = page > 1
+    total_pages = None
+    if total_count is not None:
+        total_pages = math.ceil(total_count / page_size) if total_count > 0 else 0
+    has_prev = cursor is not None or page > 1
 
     pagination = db_schemas.PaginationMetadata(
         page=page,
         page_size=page_size,
         total_items=total_count,
         total_pages=total_pages,
-        has_next=has_next,
+        has_next=next_cursor is not None,
         has_prev=has_prev,
+        next_cursor=next_cursor,
     )
 
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
     return db_schemas.PaginatedResponse(items=items, pagination=pagination)
 
 
+@router.get(
+    "/entities/changes",
+    tags=["entity"],
+    summary="Entity Change Feed",
+    description=(
+        "Streams the entities changed after transaction `since` as NDJSON: one line per "
+        "changed entity with its latest version (operation_type 2 = deleted), then a final "
+        "line with the high-water mark to pass as `since` next time. With `wait`, the "
+        "request is held open until a change arrives or the timeout elapses."
+    ),
+    operation_id="get_entity_changes",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "Change feed"}},
+)
+async def get_entity_changes(
+    since: int = Query(0, ge=0, description="Transaction ID already seen (0 = from the start)"),
+    limit: int = Query(
+        1000, ge=1, le=10000, description="Maximum number of transactions per response"
+    ),
+    wait: float = Query(
+        0, ge=0, le=60, description="Seconds to wait for changes when there are none"
+    ),
+    user: UserPayload | None = Depends(require_permission("media_store_read")),
+    service: EntityService = Depends(get_entity_service),
+) -> StreamingResponse:
+    _ = user
+    deadline = time.monotonic() + wait
+    changes, mark = await run_in_threadpool(service.get_changes, since, limit)
+    while not changes and time.monotonic() < deadline:
+        await asyncio.sleep(min(CHANGES_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+        changes, mark = await run_in_threadpool(service.get_changes, since, limit)
+
+    def lines():
+        for change in changes:
+            yield change.model_dump_json() + "\n"
+        yield mark.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/entities/lookup",
     tags=["entity"],
@@ -158,7 +336,7 @@ async def lookup_entity(
             detail="Must provide either md5 or label parameter",
         )
 
-    result = service.lookup_entity(md5=md5, label=label)
+    result = await run_in_threadpool(service.lookup_entity, md5=md5, label=label)
 
     if result is None:
         raise HTTPException(
@@ -169,6 +347,27 @@ async def lookup_entity(
     return result
 
 
+@router.post(
+    "/entities/lookup",
+    tags=["entity"],
+    summary="Get Entities by ID",
+    description=(
+        "Fetch up to 1000 entities by ID in one request, e.g. the results of a similarity "
+        "search. Entities are returned in request order; IDs that do not exist are listed "
+        "in `missing`."
+    ),
+    operation_id="get_entities_by_ids",
+    response_model=db_schemas.EntityLookupResponse,
+)
+async def get_entities_by_ids(
+    body: db_schemas.EntityLookupRequest,
+    user: UserPayload | None = Depends(require_permission("media_store_read")),
+    service: EntityService = Depends(get_entity_service),
+) -> db_schemas.EntityLookupResponse:
+    _ = user
+    return await run_in_threadpool(service.get_entities_by_ids, body.ids)
+
+
 @router.post(
     "/entities",
     tags=["entity"],
@@ -189,32 +388,31 @@ async def create_entity(
     user: UserPayload | None = Depends(require_permission("media_store_write")),
     service: EntityService = Depends(get_entity_service),
     broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
+    executor: IngestExecutor = Depends(get_ingest_executor),
 ) -> EntitySchema:
     config = service.config
 
     # Extract user_id from JWT payload (None in demo mode)
     user_id = user.id if user else None
 
-    # Read file bytes and filename if provided
-    file_bytes = None
-    filename = "file"
-    
     # Support both image (legacy) and media_file (new) parameters
     # If both are provided, media_file takes precedence
     upload = media_file or image
-    
+
+    # Spool the upload to the staging area (constant memory, hashed while streaming)
+    staged: StagedFile | None = None
     if upload:
-        file_bytes = await upload.read()
-        filename = upload.filename or "file"
+        staged = await stage_upload(upload, service.file_storage)
 
     try:
-        item, is_duplicate = service.create_entity(
+        # Hashing, ExifTool, thumbnails and the DB commit run on the ingest executor
+        item, is_duplicate = await executor.run(
+            service.create_entity,
             is_collection=is_collection,
             label=label,
             description=description,
             parent_id=parent_id,
-            media_file=file_bytes,
-            filename=filename,
+            media_file=staged,
             user_id=user_id
         )
 
@@ -223,19 +421,7 @@ async def create_entity(
         else:
             response.status_code = status.HTTP_201_CREATED
 
-        # CRITICAL: Clear retained MQTT status to prevent "ghost" statuses from ID reuse
-        if broadcaster:
-            status_topic = f"mInsight/{config.port}/entity_item_status/{item.id}"
-            _ = broadcaster.clear_retained(status_topic)
-            logger.debug(f"Cleared retained status for entity {item.id} on {status_topic}")
-
-        # Broadcast MQTT event only if this was a new entity (not a duplicate)
-        if broadcaster and item.md5 and not is_duplicate:
-            topic = f"store/{config.port}/items"
-            payload = {"id": item.id, "md5": item.md5, "timestamp": int(time.time() * 1000)}
-            _ = broadcaster.publish_event(topic=topic, payload=json.dumps(payload))
-            logger.info(f"Broadcasted creation event for item {item.id} on {topic}")
-
+        _announce_created(broadcaster, config, item, is_duplicate)
         return item
     except ValueError as e:
         # Validation errors or invalid file format
@@ -249,29 +435,284 @@ async def create_entity(
         # General extraction failure
         logger.exception(f"Unexpected error during entity creation: {e}")
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+    finally:
+        # No-op if the staged file was committed to storage
+        if staged:
+            service.file_storage.discard_staged_file(staged)
+
+
+
+
+
+@router.post(
+    "/entities/batch",
+    tags=["entity"],
+    summary="Create Entities (Batch)",
+    description=(
+        "Creates one entity per uploaded file under a shared parent. New rows are "
+        "inserted in a single transaction and one aggregated event is published. "
+        "The response carries a result per file (created / duplicate / error)."
+    ),
+    operation_id="create_entities_batch",
+    responses={200: {"model": db_schemas.BatchCreateResponse, "description": "Successful Response"}},
+)
+async def create_entities_batch(
+    files: list[UploadFile] = File(..., title="Media Files"),
+    parent_id: int | None = Form(None, title="Parent Id"),
+    user: UserPayload | None = Depends(require_permission("media_store_write")),
+    service: EntityService = Depends(get_entity_service),
+    broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
+) -> db_schemas.BatchCreateResponse:
+    config = service.config
+    user_id = user.id if user else None
+
+    staged_files: list[StagedFile] = []
+    try:
+        for upload in files:
+            staged_files.append(await stage_upload(upload, service.file_storage))
+
+        # Runs its per-file stages on the ingest executor
+        result = await service.create_entities_batch(
+            media_files=staged_files,
+            parent_id=parent_id,
+            user_id=user_id,
+        )
+    finally:
+        # No-op for staged files that were committed to storage
+        for staged in staged_files:
+            service.file_storage.discard_staged_file(staged)
+
+    created_ids = [
+        item.entity.id for item in result.items if item.status == "created" and item.entity
+    ]
+    if broadcaster and created_ids:
+        # CRITICAL: Clear retained MQTT status to prevent "ghost" statuses from ID reuse
+        for entity_id in created_ids:
+            _ = broadcaster.clear_retained(f"mInsight/{config.port}/entity_item_status/{entity_id}")
+
+        # One aggregated event for the whole batch
+        topic = f"store/{config.port}/items"
+        payload = {
+            "ids": created_ids,
+            "count": len(created_ids),
+            "timestamp": int(time.time() * 1000),
+        }
+        _ = broadcaster.publish_event(topic=topic, payload=json.dumps(payload))
+        logger.info(f"Broadcasted batch creation event for {len(created_ids)} items on {topic}")
+
+    return result
+
+
+@router.post(
+    "/entities/uploads",
+    tags=["entity"],
+    summary="Create Upload Session",
+    description=(
+        "Starts a resumable upload. Send the file in chunks with PUT "
+        "/entities/uploads/{upload_id}, then finalize it to create the entity. "
+        "Sessions idle for longer than the configured TTL are discarded."
+    ),
+    operation_id="create_upload_session",
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": UploadSessionStatus, "description": "Successful Response"}},
+)
+async def create_upload_session(
+    filename: str = Form(..., title="Filename"),
+    size: int | None = Form(None, ge=0, title="Size", description="Total size in bytes"),
+    label: str | None = Form(None, title="Label"),
+    description: str | None = Form(None, title="Description"),
+    parent_id: int | None = Form(None, title="Parent Id"),
+    user: UserPayload | None = Depends(require_permission("media_store_write")),
+    uploads: UploadSessionManager = Depends(get_upload_sessions),
+) -> UploadSessionStatus:
+    return uploads.create(
+        filename=filename,
+        size=size,
+        label=label,
+        description=description,
+        parent_id=parent_id,
+        user_id=user.id if user else None,
+    )
 
 
+@router.get(
+    "/entities/uploads/{upload_id}",
+    tags=["entity"],
+    summary="Get Upload Session",
+    description="Returns the number of bytes received so far, i.e. the offset to resume from.",
+    operation_id="get_upload_session",
+    responses={200: {"model": UploadSessionStatus, "description": "Successful Response"}},
+)
+async def get_upload_session(
+    upload_id: str = Path(..., title="Upload Id"),
+    user: UserPayload | None = Depends(require_permission("media_store_write")),
+    uploads: UploadSessionManager = Depends(get_upload_sessions),
+) -> UploadSessionStatus:
+    try:
+        return uploads.status(upload_id, user.id if user else None)
+    except UploadSessionNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
 
+@router.put(
+    "/entities/uploads/{upload_id}",
+    tags=["entity"],
+    summary="Upload Chunk",
+    description=(
+        "Appends the raw request body at the given offset. The offset must equal the "
+        "bytes received so far (409 otherwise). Bytes are persisted as they arrive, so "
+        "after a dropped connection the client resumes from the offset reported by GET."
+    ),
+    operation_id="upload_chunk",
+    responses={200: {"model": UploadSessionStatus, "description": "Successful Response"}},
+)
+async def upload_chunk(
+    request: Request,
+    upload_id: str = Path(..., title="Upload Id"),
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    user: UserPayload | None = Depends(require_permission("media_store_write")),
+    uploads: UploadSessionManager = Depends(get_upload_sessions),
+) -> UploadSessionStatus:
+    try:
+        return await uploads.append(
+            upload_id, offset, request.stream(), user.id if user else None
+        )
+    except UploadSessionNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except UploadOffsetMismatchError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+
+
+@router.post(
+    "/entities/uploads/{upload_id}/finalize",
+    tags=["entity"],
+    summary="Finalize Upload",
+    description=(
+        "Creates the entity from the assembled upload through the normal ingest "
+        "pipeline and removes the session. If creation fails the session is kept, "
+        "so the client can retry finalize until it expires."
+    ),
+    operation_id="finalize_upload",
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": EntitySchema, "description": "Successful Response"}},
+)
+async def finalize_upload(
+    response: Response,
+    upload_id: str = Path(..., title="Upload Id"),
+    user: UserPayload | None = Depends(require_permission("media_store_write")),
+    service: EntityService = Depends(get_entity_service),
+    broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
+    executor: IngestExecutor = Depends(get_ingest_executor),
+    uploads: UploadSessionManager = Depends(get_upload_sessions),
+) -> EntitySchema:
+    user_id = user.id if user else None
+
+    try:
+        lock = uploads.lock(upload_id, user_id)
+    except UploadSessionNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    # Hold the session lock so no chunk lands while the file is hashed and ingested
+    async with lock:
+        try:
+            # Hashing the assembled file is a full read; keep it off the event loop
+            session, staged = await executor.run(uploads.stage, upload_id, user_id)
+        except UploadSessionNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except UploadIncompleteError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+        finalized = False
+        try:
+            item, is_duplicate = await executor.run(
+                service.create_entity,
+                is_collection=False,
+                label=session.label,
+                description=session.description,
+                parent_id=session.parent_id,
+                media_file=staged,
+                user_id=user_id,
+            )
+            finalized = True
+        except ValueError as e:
+            logger.warning(f"Validation error finalizing upload {upload_id}: {e}")
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+        except RuntimeError as e:
+            logger.error(f"Runtime error finalizing upload {upload_id}: {e}")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        except Exception as e:
+            logger.exception(f"Unexpected error finalizing upload {upload_id}: {e}")
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+        finally:
+            # On failure the session keeps its data and TTL so the client can retry,
+            # unless the data was already moved into storage
+            if finalized or not uploads.has_data(upload_id):
+                uploads.discard(upload_id)
+
+    response.status_code = status.HTTP_200_OK if is_duplicate else status.HTTP_201_CREATED
+    _announce_created(broadcaster, service.config, item, is_duplicate)
+    return item
+
+
+@router.delete(
+    "/entities/uploads/{upload_id}",
+    tags=["entity"],
+    summary="Cancel Upload",
+    description="Cancels a resumable upload and removes the data received so far.",
+    operation_id="cancel_upload",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def cancel_upload(
+    upload_id: str = Path(..., title="Upload Id"),
+    user: UserPayload | None = Depends(require_permission("media_store_write")),
+    uploads: UploadSessionManager = Depends(get_upload_sessions),
+) -> Response:
+    try:
+        _ = uploads.get(upload_id, user.id if user else None)
+    except UploadSessionNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    uploads.discard(upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
 
 @router.get(
     "/entities/{entity_id}",
     tags=["entity"],
     summary="Get Entity",
-    description="Retrieves a specific media entity by its ID, optionally at a specific version.",
+    description=(
+        "Retrieves a specific media entity by its ID, optionally at a specific version. "
+        "The current version carries a weak ETag for conditional requests (If-None-Match)."
+    ),
     operation_id="get_entity",
-    responses={200: {"model": EntitySchema, "description": "Successful Response"}},
+    response_model=EntitySchema,
+    responses={
+        200: {"model": EntitySchema, "description": "Successful Response"},
+        304: {"description": "Not modified since the ETag in If-None-Match"},
+    },
 )
 async def get_entity(
+    request: Request,
+    response: Response,
     entity_id: int = Path(..., title="Entity Id"),
     version: int | None = Query(
         None, title="Version", description="Optional version number to retrieve"
     ),
     user: UserPayload | None = Depends(require_permission("media_store_read")),
     service: EntityService = Depends(get_entity_service),
-) -> EntitySchema:
+) -> EntitySchema | Response:
     _ = user
-    item = service.get_entity_by_id(entity_id, version=version)
+    etag: str | None = None
+    if version is None:
+        tag = await run_in_threadpool(service.get_entity_etag, entity_id)
+        if tag is None:
+            raise HTTPException(status_code=404, detail="Entity not found")
+        etag = f'W/"{tag}"'
+        if _etag_matches(request, etag):
+            return _not_modified(etag, REVALIDATE_CACHE_CONTROL)
+
+    item = await run_in_threadpool(service.get_entity_by_id, entity_id, version=version)
     if not item:
         if version is not None:
             raise HTTPException(
@@ -279,6 +720,9 @@ async def get_entity(
                 detail=f"Entity {entity_id} version {version} not found",
             )
         raise HTTPException(status_code=404, detail="Entity not found")
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
     return item
 
 
@@ -300,29 +744,28 @@ async def put_entity(
     user: UserPayload | None = Depends(require_permission("media_store_write")),
     service: EntityService = Depends(get_entity_service),
     broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
+    executor: IngestExecutor = Depends(get_ingest_executor),
 ) -> EntitySchema:
     config = service.config
 
     # Extract user_id from JWT payload (None in demo mode)
     user_id = user.id if user else None
 
-    # Read file bytes and filename if provided
-    file_bytes: bytes | None = None
-    filename = "file"
+    # Spool the upload to the staging area (constant memory, hashed while streaming)
+    staged: StagedFile | None = None
     if media_file:
-        file_bytes = await media_file.read()
-        filename = media_file.filename or "file"
+        staged = await stage_upload(media_file, service.file_storage)
 
     try:
         # Update entity (file is optional - None updates only metadata)
-        result = service.update_entity(
+        result = await executor.run(
+            service.update_entity,
             entity_id=entity_id,
             is_collection=is_collection,
             label=label,
             description=description,
             parent_id=parent_id,
-            media_file=file_bytes,
-            filename=filename,
+            media_file=staged,
             user_id=user_id,
         )
         if result is None:
@@ -347,6 +790,9 @@ async def put_entity(
         return item
     except DuplicateFileError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except InvalidParentError as e:
+        # Hierarchy rules, reported like POST and PATCH
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
     except ValueError as e:
         # Validation errors or invalid file format
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -359,6 +805,10 @@ async def put_entity(
     except Exception as e:
         # General extraction failure
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+    finally:
+        # No-op if the staged file was committed to storage
+        if staged:
+            service.file_storage.discard_staged_file(staged)
 
 
 @router.patch(
@@ -426,7 +876,9 @@ async def patch_entity(
     # Actually for service call we just pass the dict as changes
     changes = cast(dict[str, object], patch_data)
 
-    item = service.patch_entity(entity_id, changes=changes, user_id=user_id)
+    item = await run_in_threadpool(
+        service.patch_entity, entity_id, changes=changes, user_id=user_id
+    )
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entity not found")
     return item
@@ -439,22 +891,54 @@ async def patch_entity(
     "/entities/{entity_id}/versions",
     tags=["entity"],
     summary="Get Entity Versions",
-    description="Retrieves all versions of a specific entity.",
+    description="Retrieves the versions of a specific entity, oldest first. "
+    "Use page and page_size to fetch the history in pages.",
     operation_id="get_entity_versions",
     response_model=list[db_schemas.VersionInfo],
 )
 async def get_entity_versions(
     entity_id: int = Path(..., title="Entity Id"),
+    page: int = Query(1, ge=1, title="Page", description="Page number (1-indexed)"),
+    page_size: int | None = Query(
+        None, ge=1, le=1000, title="Page Size", description="Versions per page (default: all)"
+    ),
     user: UserPayload | None = Depends(require_permission("media_store_read")),
     service: EntityService = Depends(get_entity_service),
 ) -> list[db_schemas.VersionInfo]:
     _ = user
-    versions = service.get_entity_versions(entity_id)
-    if not versions:
+    versions = await run_in_threadpool(
+        service.get_entity_versions, entity_id, page=page, page_size=page_size
+    )
+    if versions is None or (page == 1 and not versions):
         raise HTTPException(status_code=404, detail="Entity not found or no versions available")
     return versions
 
 
+@router.get(
+    "/entities/{entity_id}/subtree",
+    tags=["entity"],
+    summary="Get Subtree Stats",
+    description="Counts and total file size of everything below a collection, at any depth.",
+    operation_id="get_subtree_stats",
+    response_model=db_schemas.SubtreeStats,
+)
+async def get_subtree_stats(
+    entity_id: int = Path(..., title="Entity Id"),
+    exclude_deleted: bool = Query(
+        False, title="Exclude Deleted", description="Whether to exclude soft-deleted entities"
+    ),
+    user: UserPayload | None = Depends(require_permission("media_store_read")),
+    service: EntityService = Depends(get_entity_service),
+) -> db_schemas.SubtreeStats:
+    _ = user
+    stats = await run_in_threadpool(
+        service.get_subtree_stats, entity_id, exclude_deleted=exclude_deleted
+    )
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return stats
+
+
 # Admin configuration endpoints
 @router.get(
     "/admin/pref",
@@ -544,7 +1028,7 @@ class RootResponse(BaseModel):
     operation_id="root_get",
 )
 async def root(config_service: ConfigDBService = Depends(get_config_service)):
-    read_auth_enabled = config_service.get_read_auth_enabled()
+    read_auth_enabled = await run_in_threadpool(config_service.get_read_auth_enabled)
     # guestMode is "on" when read_auth is disabled (public read access)
     guest_mode = "off" if read_auth_enabled else "on"
 
@@ -581,15 +1065,21 @@ async def get_m_insight_status(
     "/entities/{entity_id}/media",
     tags=["entity"],
     summary="Download Media",
-    description="Download the original media file.",
+    description=(
+        "Download the original media file. The strong ETag is the file version; "
+        "with ?v=<version> (the ETag without quotes) the response is cacheable forever."
+    ),
     operation_id="download_media",
     response_class=FileResponse,
+    responses={304: {"description": "Not modified since the ETag in If-None-Match"}},
 )
 async def download_media(
+    request: Request,
     entity_id: int = Path(..., title="Entity Id"),
+    v: str | None = Query(None, description="File version (the ETag without quotes) to pin"),
     service: EntityService = Depends(get_entity_service),
 ):
-    entity = service.get_entity_by_id(entity_id)
+    entity = await run_in_threadpool(service.get_entity_by_id, entity_id)
     if not entity:
         raise HTTPException(status_code=404, detail="Entity not found")
     
@@ -600,10 +1090,18 @@ async def download_media(
     if not path or not os.path.exists(path):
         raise HTTPException(status_code=404, detail="Media file not found")
 
+    headers = {"Cache-Control": _file_cache_control(entity, v)}
+    version = _file_version(entity)
+    if version:
+        headers["ETag"] = f'"{version}"'
+        if _etag_matches(request, headers["ETag"]):
+            return _not_modified(headers["ETag"], headers["Cache-Control"])
+
     return FileResponse(
         path=path, 
         media_type=entity.mime_type, 
-        filename=f"{entity.md5}{entity.extension}"
+        filename=f"{entity.md5}{entity.extension}",
+        headers=headers,
     )
 
 
@@ -611,16 +1109,33 @@ async def download_media(
     "/entities/{entity_id}/preview",
     tags=["entity"],
     summary="Download Preview",
-    description="Download the preview image. Use ?force=1 to generate if missing.",
+    description=(
+        "Download the preview image. Use ?size= for the rendition nearest to a size in "
+        "pixels (generated on demand if missing). If the thumbnail is still being generated, "
+        "waits briefly and returns 202 when it is not ready yet. Use ?force=1 to generate if missing. "
+        "The strong ETag is derived from the media file version; with ?v=<version> (the "
+        "media ETag without quotes) the response is cacheable forever."
+    ),
     operation_id="download_preview",
     response_class=FileResponse,
+    responses={
+        202: {"description": "Preview is still being generated; retry later"},
+        304: {"description": "Not modified since the ETag in If-None-Match"},
+    },
 )
 async def download_preview(
+    request: Request,
     entity_id: int = Path(..., title="Entity Id"),
     force: bool = Query(False, description="Force generation if missing"),
+    size: int | None = Query(
+        None, ge=1, description="Requested size in pixels; the nearest rendition is served"
+    ),
+    v: str | None = Query(None, description="Media file version (its ETag without quotes) to pin"),
     service: EntityService = Depends(get_entity_service),
+    executor: IngestExecutor = Depends(get_ingest_executor),
+    thumbnails: ThumbnailQueue | None = Depends(get_thumbnail_queue),
 ):
-    entity = service.get_entity_by_id(entity_id)
+    entity = await run_in_threadpool(service.get_entity_by_id, entity_id)
     if not entity:
         raise HTTPException(status_code=404, detail="Entity not found")
     
@@ -632,14 +1147,34 @@ async def download_preview(
     if not media_path:
         raise HTTPException(status_code=404, detail="Media file not found")
         
-    # Use ThumbnailGenerator to get expected path
     # Note: get_media_path returns the absolute path
-    preview_path = ThumbnailGenerator.get_thumbnail_path(media_path)
-    
+    preview_path = service.get_preview_path(media_path, size)
+
+    if (
+        not os.path.exists(preview_path)
+        and thumbnails is not None
+        and entity.preview_status == "pending"
+        and entity.file_path
+        and entity.mime_type
+    ):
+        # Re-queue previews left pending by a restart
+        if not thumbnails.is_pending(media_path):
+            thumbnails.submit(entity.id, entity.file_path, media_path, entity.mime_type)
+        ready = await asyncio.to_thread(
+            thumbnails.wait, media_path, service.config.preview_wait_timeout
+        )
+        if not ready and not force:
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"id": entity.id, "preview_status": "pending"},
+                headers={"Retry-After": "1"},
+            )
+
     if not os.path.exists(preview_path):
-        if force:
+        # Renditions are always generated on demand (e.g. media that predates them)
+        if force or size is not None:
             # Generate on demand
-            generated_path = service.ensure_thumbnail(entity)
+            generated_path = await executor.run(service.ensure_thumbnail, entity, size)
             if generated_path:
                 preview_path = generated_path
             else:
@@ -650,10 +1185,25 @@ async def download_preview(
             # Existing behavior was 404
             raise HTTPException(status_code=404, detail="Preview file not found")
 
+    if size is None:
+        media_type = "image/png"  # .tb.png is PNG
+    else:
+        media_type = ThumbnailGenerator.get_media_type(service.config.preview_settings().format)
+    # .tb.png or .tb<size>.<ext>
+    suffix = preview_path[len(media_path):]
+    filename = f"{entity.md5}{suffix}"
+    headers = {
+        "ETag": f'"{_file_version(entity)}{suffix}"',
+        "Cache-Control": _file_cache_control(entity, v),
+    }
+    if _etag_matches(request, headers["ETag"]):
+        return _not_modified(headers["ETag"], headers["Cache-Control"])
+
     return FileResponse(
-        path=preview_path, 
-        media_type="image/png",  # .tb.png is PNG
-        filename=f"{entity.md5}.tb.png"
+        path=preview_path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
     )
 
 
@@ -668,7 +1218,7 @@ async def download_preview(
 async def get_hls_manifest(
     entity_id: int = Path(..., title="Entity Id"),
     wait: bool = Query(False, title="Wait for readiness"),
-    service: EntityService = Depends(get_entity_service),
+    service: EntityService = Depends(get_streaming_entity_service),
 ):
     hls_status = await service.ensure_hls_stream(entity_id, wait=wait)
 
@@ -678,7 +1228,7 @@ async def get_hls_manifest(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="hls_failed")
 
     # If ready, get entity to get path
-    entity = service.get_entity_by_id(entity_id)
+    entity = await run_in_threadpool(service.get_entity_by_id, entity_id)
     if not entity:
         raise HTTPException(status_code=404, detail="Entity not found")
 
@@ -705,7 +1255,7 @@ async def get_stream_segment(
     filename: str = Path(..., title="Filename"),
     service: EntityService = Depends(get_entity_service),
 ):
-    entity = service.get_entity_by_id(entity_id)
+    entity = await run_in_threadpool(service.get_entity_by_id, entity_id)
     if not entity:
         raise HTTPException(status_code=404, detail="Entity not found")
         
@@ -738,7 +1288,7 @@ async def get_stream_segment(
 async def delete_hls_stream(
     entity_id: int = Path(..., title="Entity Id"),
     user: UserPayload | None = Depends(require_permission("media_store_write")),
-    service: EntityService = Depends(get_entity_service),
+    service: EntityService = Depends(get_streaming_entity_service),
 ):
     """Remove HLS stream for an entity."""
     _ = user
@@ -788,7 +1338,7 @@ async def delete_entity(
     _ = user
 
     try:
-        deleted = service.delete_entity(entity_id)
+        deleted = await run_in_threadpool(service.delete_entity, entity_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -838,12 +1388,13 @@ async def delete_face(
 
     try:
         # Check if face_service is available
-        if service.face_service is None:
+        face_service = service.get_face_service()
+        if face_service is None:
              raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Face service not available",
             )
-        deleted = service.face_service.delete_face(face_id)
+        deleted = face_service.delete_face(face_id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -878,19 +1429,16 @@ async def delete_face(
 )
 async def audit_system(
     db: Session = Depends(get_db),
-    config: StoreConfig = Depends(StoreConfig.get_config),
     clip_store: QdrantVectorStore = Depends(get_clip_store_dep),
     dino_store: QdrantVectorStore = Depends(get_dino_store_dep),
     face_store: QdrantVectorStore = Depends(get_face_store_dep),
     broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
+    storage_service: StorageService = Depends(get_storage_service),
     user: UserPayload | None = Depends(require_admin),
 ) -> AuditReport:
     """Generate data integrity audit report."""
     _ = user
 
-    # Create storage service
-    storage_service = StorageService(base_dir=str(config.media_storage_dir))
-
     # Create audit service
     audit_service = AuditService(
         db=db,
@@ -926,19 +1474,16 @@ async def audit_system(
 )
 async def clear_orphans(
     db: Session = Depends(get_db),
-    config: StoreConfig = Depends(StoreConfig.get_config),
     clip_store: QdrantVectorStore = Depends(get_clip_store_dep),
     dino_store: QdrantVectorStore = Depends(get_dino_store_dep),
     face_store: QdrantVectorStore = Depends(get_face_store_dep),
     broadcaster: MInsightBroadcaster | None = Depends(get_m_insight_broadcaster),
+    storage_service: StorageService = Depends(get_storage_service),
     user: UserPayload | None = Depends(require_admin),
 ) -> CleanupReport:
     """Clear all orphaned resources (DEL-10)."""
     _ = user
 
-    # Create storage service
-    storage_service = StorageService(base_dir=str(config.media_storage_dir))
-
     try:
         # Create audit service
         audit_service = AuditService(
@@ -1,30 +1,58 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import json
 import os
+from collections.abc import Callable, Hashable
+from contextlib import nullcontext
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, cast
 
 from loguru import logger
-from sqlalchemy import func
+from sqlalchemy import ColumnElement, and_, case, func, or_, select, text, tuple_
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-
-
-from store.db_service import EntitySchema
-from store.db_service.db_internals import Entity
-from store.db_service.schemas import VersionInfo
-
-from ..common.storage import StorageService
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy_continuum import Operation  # pyright: ignore[reportMissingTypeStubs]
+
+
+from store.db_service import DBService, EntitySchema, EntityVersionSchema
+from store.db_service.db_internals import Entity, EntityClosure, entities_fts, version_class
+from store.db_service.entity import EntityVersionDBService
+from store.db_service.schemas import (
+    BatchCreateResponse,
+    BatchItemResult,
+    ChangeFeedMark,
+    EntityLookupResponse,
+    SubtreeStats,
+    VersionInfo,
+)
+from store.db_service.write_queue import get_write_queue
+
+from ..common.storage import StagedFile, StorageService
 from .config import StoreConfig
-from .media_metadata import MediaMetadataExtractor
+from .media_metadata import MediaIdentity, MediaMetadata, MediaMetadataExtractor
 from .media_thumbnail import ThumbnailGenerator
+from .thumbnail_queue import (
+    PreviewStatus,
+    note_preview_change,
+    preview_generation,
+    supports_preview,
+)
 
 if TYPE_CHECKING:
+    from .compute_session import ComputeSession
+    from .exiftool_pool import ExifToolPool
+    from .ingest import IngestExecutor
+    from .thumbnail_queue import ThumbnailQueue
     from .face_service import FaceService
     from store.vectorstore_services.vector_stores import QdrantVectorStore
     from ..broadcast_service.broadcaster import MInsightBroadcaster
     from store.m_insight.job_service import JobSubmissionService
 
+P = ParamSpec("P")
+T = TypeVar("T")
+
 
 class DuplicateFileError(Exception):
     """Raised when attempting to upload a file with duplicate MD5."""
@@ -32,6 +60,82 @@ class DuplicateFileError(Exception):
     pass
 
 
+class InvalidParentError(ValueError):
+    """Raised when a parent_id breaks the hierarchy rules."""
+
+    pass
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+def _encode_cursor_payload(payload: object) -> str:
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor_payload(cursor: str) -> object:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return cast(object, json.loads(raw))
+    except ValueError as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def encode_cursor(entity: Entity) -> str:
+    """Encode an entity's (added_date, id) sort key as an opaque pagination cursor."""
+    return _encode_cursor_payload([entity.added_date or 0, entity.id])
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a cursor produced by encode_cursor into (added_date, id).
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    payload = _decode_cursor_payload(cursor)
+    if not isinstance(payload, list) or len(payload) != 2:  # pyright: ignore[reportUnknownArgumentType]
+        raise InvalidCursorError("Invalid cursor")
+    added_date, entity_id = cast(list[object], payload)
+    if not isinstance(added_date, int) or not isinstance(entity_id, int):
+        raise InvalidCursorError("Invalid cursor")
+    return added_date, entity_id
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode a row offset as a cursor, for orderings that cannot seek (search rank)."""
+    return _encode_cursor_payload({"offset": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_offset_cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or not an offset cursor
+    """
+    payload = _decode_cursor_payload(cursor)
+    offset = cast(dict[str, object], payload).get("offset") if isinstance(payload, dict) else None
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursorError("Invalid cursor")
+    return offset
+
+
+def fts_match_query(search_query: str) -> str | None:
+    """Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are
+    taken literally.
+
+    Returns:
+        MATCH expression, or None if the input has no words
+    """
+    terms = [f'"{term.replace(chr(34), chr(34) * 2)}"*' for term in search_query.split()]
+    return " ".join(terms) or None
+
+
 class EntityNotSoftDeletedError(Exception):
     """Raised when attempting to hard delete an entity that is not soft-deleted."""
 
@@ -50,6 +154,13 @@ class EntityService:
         dino_store: QdrantVectorStore | None = None,
         broadcaster: MInsightBroadcaster | None = None,
         job_service: JobSubmissionService | None = None,
+        exiftool_pool: ExifToolPool | None = None,
+        executor: IngestExecutor | None = None,
+        thumbnail_queue: ThumbnailQueue | None = None,
+        compute_session: ComputeSession | None = None,
+        file_storage: StorageService | None = None,
+        metadata_extractor: MediaMetadataExtractor | None = None,
+        face_store: QdrantVectorStore | None = None,
     ):
         """Initialize the entity service.
 
@@ -61,18 +172,70 @@ class EntityService:
             dino_store: Optional DINO vector store for deletion operations
             broadcaster: Optional MQTT broadcaster for clearing retained messages
             job_service: Optional job submission service for HLS/ML jobs
+            exiftool_pool: Optional persistent ExifTool pool for metadata extraction
+            executor: Optional ingest executor for CPU-bound steps (hashing, thumbnails)
+            thumbnail_queue: Optional background thumbnail queue; without it
+                thumbnails are generated inline before the commit
+            compute_session: Optional shared compute session, used for HLS jobs
+                when no job_service is given
+            file_storage: Optional shared storage service (built from config if omitted)
+            metadata_extractor: Optional shared metadata extractor (built from
+                exiftool_pool and executor if omitted)
+            face_store: Optional face vector store; a FaceService is built from
+                it on first use when face_service is not given
         """
         self.db: Session = db
         self.config: StoreConfig = config
-        self.file_storage: StorageService = StorageService(base_dir=str(config.media_storage_dir))
+        self.file_storage: StorageService = file_storage or StorageService(
+            base_dir=str(config.media_storage_dir)
+        )
         # Initialize metadata extractor
-        self.metadata_extractor: MediaMetadataExtractor = MediaMetadataExtractor()
+        self.metadata_extractor: MediaMetadataExtractor = metadata_extractor or MediaMetadataExtractor(
+            exiftool_pool=exiftool_pool, executor=executor
+        )
+        self.executor: IngestExecutor | None = executor
+        self.thumbnail_queue: ThumbnailQueue | None = thumbnail_queue
         # Optional dependencies for deletion operations
         self.face_service: FaceService | None = face_service
+        self.face_store: QdrantVectorStore | None = face_store
         self.clip_store: QdrantVectorStore | None = clip_store
         self.dino_store: QdrantVectorStore | None = dino_store
         self.broadcaster: MInsightBroadcaster | None = broadcaster
         self.job_service: JobSubmissionService | None = job_service
+        self.compute_session: ComputeSession | None = compute_session
+
+    def get_face_service(self) -> FaceService | None:
+        """The face service, built on first use from face_store if not given."""
+        if self.face_service is None and self.face_store is not None:
+            from .face_service import FaceService
+
+            self.face_service = FaceService(
+                db=self.db,
+                db_service=DBService(db=self.db),
+                face_store=self.face_store,
+                storage_service=self.file_storage,
+            )
+        return self.face_service
+
+    def _write(self, fn: Callable[[Session], T], key: Hashable | None = None) -> T:
+        """Run a write transaction through the write queue, on this session's database.
+
+        Reads stay on self.db; fn gets the writer's session and must flush,
+        not commit. Pass the entity ID as key for updates to an existing entity.
+        """
+        return get_write_queue().run(fn, bind=self.db.get_bind(), key=key)
+
+    async def _run_blocking(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run a blocking step on the ingest executor (inline without one)."""
+        if self.executor is None:
+            return fn(*args, **kwargs)
+        return await self.executor.run(fn, *args, **kwargs)
+
+    async def _get_job_service(self) -> JobSubmissionService | None:
+        """The job submission service, from the shared compute session if needed."""
+        if self.job_service is None and self.compute_session is not None:
+            return await self.compute_session.get_job_service()
+        return self.job_service
 
     def get_media_path(self, entity: EntitySchema) -> str | None:
         """Get absolute path to the media file."""
@@ -116,7 +279,8 @@ class EntityService:
         if manifest_path and os.path.exists(manifest_path):
             return "ready"
 
-        if not self.job_service:
+        job_service = await self._get_job_service()
+        if not job_service:
             logger.error("JobSubmissionService not available in EntityService")
             return "failed"
 
@@ -130,12 +294,17 @@ class EntityService:
         output_path = str(stream_dir / (entity.mime_type or "unknown") / f"media_{entity.id}")
 
         # The JobSubmissionService handles the logic of "should I skip?" internally
-        job_id = await self.job_service.submit_hls_streaming(
-            entity=entity,
-            input_absolute_path=input_path,
-            output_absolute_path=output_path,
-            priority=1,
-        )
+        shared = self.compute_session if job_service is not self.job_service else None
+        async with shared.submission_lock(entity.id) if shared else nullcontext():
+            job_id = await job_service.submit_hls_streaming(
+                entity=entity,
+                input_absolute_path=input_path,
+                output_absolute_path=output_path,
+                priority=1,
+            )
+        if shared and not job_id:
+            # Possibly a stale login: reconnect on the next request
+            await shared.reset()
 
         if job_id == "ready":
             return "ready"
@@ -182,8 +351,9 @@ class EntityService:
                     logger.error(f"Failed to delete HLS directory {entity_stream_dir}: {e}")
 
         # 2. Reset intelligence status in DB and broadcast via JobSubmissionService
-        if self.job_service:
-            self.job_service.reset_task_status(entity_id, "hls_streaming")
+        job_service = await self._get_job_service()
+        if job_service:
+            job_service.reset_task_status(entity_id, "hls_streaming")
 
         return True
 
@@ -225,58 +395,70 @@ class EntityService:
             entity_id: ID of entity being updated (None for create operations)
 
         Raises:
-            ValueError: If validation fails with descriptive error message
+            InvalidParentError: If validation fails with descriptive error message
         """
         # Rule: Non-collections must have a parent
         pass
 
+        self.validate_parent(self.db, parent_id, entity_id)
+
+    @staticmethod
+    def validate_parent(db: Session, parent_id: int | None, entity_id: int | None = None) -> None:
+        """Check parent_id against the hierarchy rules (see _validate_parent_id).
+
+        Static so the bulk importer can validate its target collection too.
+
+        Raises:
+            InvalidParentError: If validation fails with descriptive error message
+        """
         # If parent_id is None and allowed (collections), no further validation needed
         if parent_id is None:
             return
 
         # Rule: Parent must exist
-        parent = self.db.query(Entity).filter(Entity.id == parent_id).first()
+        parent = db.query(Entity).filter(Entity.id == parent_id).first()
         if not parent:
-            raise ValueError(f"Cannot set parent_id to {parent_id}: parent entity does not exist")
+            raise InvalidParentError(f"Cannot set parent_id to {parent_id}: parent entity does not exist")
 
         # Rule: Parent must be a collection
         if not parent.is_collection:
-            raise ValueError(
+            raise InvalidParentError(
                 f"Cannot set parent_id to {parent_id}: parent entity must be a collection. "
                 + f"Entity {parent_id} is not a collection."
             )
 
         # Rule: Parent must not be soft-deleted
         if parent.is_deleted:
-            raise ValueError(f"Cannot set parent_id to {parent_id}: parent entity is deleted")
+            raise InvalidParentError(f"Cannot set parent_id to {parent_id}: parent entity is deleted")
 
         # Rule: Prevent circular hierarchies (only for updates)
+        # The parent must not be the entity itself or one of its descendants
         if entity_id is not None:
-            current_parent = parent_id
-            visited = {entity_id}
-            while current_parent is not None:
-                if current_parent in visited:
-                    raise ValueError(
-                        f"Circular hierarchy detected: entity {parent_id} is already "
-                        + f"a descendant of {entity_id}"
-                    )
-                visited.add(current_parent)
-                parent_entity = self.db.query(Entity).filter(Entity.id == current_parent).first()
-                current_parent = parent_entity.parent_id if parent_entity else None
+            is_descendant = (
+                db.query(EntityClosure)
+                .filter(
+                    EntityClosure.ancestor_id == entity_id,
+                    EntityClosure.descendant_id == parent_id,
+                )
+                .first()
+            )
+            if is_descendant is not None:
+                raise InvalidParentError(
+                    f"Circular hierarchy detected: entity {parent_id} is already "
+                    + f"a descendant of {entity_id}"
+                )
 
         # Rule: Max hierarchy depth check (max 10 levels)
-        depth = 1  # Starting at depth 1 (the parent)
-        current_check = parent_id
-        while current_check is not None:
-            parent_ent = self.db.query(Entity).filter(Entity.id == current_check).first()
-            if not parent_ent:
-                break
-            current_check = parent_ent.parent_id
-            depth += 1
-            if depth > 10:
-                raise ValueError(
-                    "Maximum hierarchy depth exceeded. Max allowed depth is 10 levels."
-                )
+        # The parent's own depth (0 for a root) is its deepest closure row
+        parent_depth = (
+            db.query(func.max(EntityClosure.depth))
+            .filter(EntityClosure.descendant_id == parent_id)
+            .scalar()
+        ) or 0
+        if parent_depth + 2 > 10:
+            raise InvalidParentError(
+                "Maximum hierarchy depth exceeded. Max allowed depth is 10 levels."
+            )
 
     def _check_ancestor_deleted(self, entity: Entity) -> bool:
         """
@@ -288,43 +470,119 @@ class EntityService:
         Returns:
             True if any ancestor is deleted, False otherwise
         """
-        current_parent_id = entity.parent_id
-        visited = {entity.id}  # Prevent infinite loops in corrupted data
+        if entity.parent_id is None:
+            return False
+        return entity.parent_id in self._deleted_subtree_roots({entity.parent_id})
 
-        while current_parent_id is not None:
-            # Prevent infinite loops
-            if current_parent_id in visited:
-                break
-            visited.add(current_parent_id)
+    def _deleted_subtree_roots(self, collection_ids: set[int]) -> set[int]:
+        """
+        Find which collections are soft-deleted or have a soft-deleted ancestor.
 
-            # Check parent
-            parent = self.db.query(Entity).filter(Entity.id == current_parent_id).first()
-            if not parent:
-                # Parent doesn't exist (orphaned entity)
-                break
+        Joins the closure table against the deleted flag of every ancestor, so
+        the cost is one indexed query regardless of how many collections are
+        checked or how deep the tree is.
 
-            # Check if parent is deleted
-            if parent.is_deleted:
-                return True
+        Args:
+            collection_ids: Collection IDs (typically the parent_ids of a page)
 
-            # Move up the chain
-            current_parent_id = parent.parent_id
+        Returns:
+            Subset of collection_ids whose chain contains a deleted entity
+        """
+        if not collection_ids:
+            return set()
+
+        stmt = (
+            select(EntityClosure.descendant_id)
+            .join(Entity, Entity.id == EntityClosure.ancestor_id)
+            .where(
+                EntityClosure.descendant_id.in_(collection_ids),
+                Entity.is_deleted == True,  # noqa: E712
+            )
+            .distinct()
+        )
+        return set(self.db.execute(stmt).scalars().all())
+
+    def _entities_to_items(
+        self, entities: list[Entity], children_counts: dict[int, int] | None = None
+    ) -> list[EntitySchema]:
+        """
+        Convert a list of entities, checking all ancestor chains in one query.
 
-        return False
+        Args:
+            entities: Entities (or version objects) to convert
+            children_counts: Optional {entity_id: children count}
 
-    def _entity_to_item(self, entity: Entity, children_count: int = 0) -> EntitySchema:
+        Returns:
+            List of EntitySchema in the same order
+        """
+        parent_ids = {e.parent_id for e in entities if e.parent_id is not None}
+        deleted_parents = self._deleted_subtree_roots(parent_ids)
+        counts = children_counts or {}
+        return [
+            self._entity_to_item(
+                entity,
+                children_count=counts.get(entity.id, 0),
+                is_indirectly_deleted=entity.parent_id in deleted_parents,
+            )
+            for entity in entities
+        ]
+
+    @staticmethod
+    def build_entity(
+        *,
+        is_collection: bool,
+        label: str | None,
+        description: str | None,
+        parent_id: int | None,
+        media_meta: MediaMetadata | None,
+        file_path: str | None,
+        user_id: str | None,
+        now: int,
+    ) -> Entity:
+        """Build a new (unsaved) Entity from request fields and media metadata."""
+        return Entity(
+            is_collection=is_collection,
+            label=label,
+            description=description,
+            parent_id=parent_id,
+            added_date=now,
+            updated_date=now,
+            create_date=now,
+            # No file metadata for collections
+            file_size=media_meta.file_size if media_meta else None,
+            height=media_meta.height if media_meta else None,
+            width=media_meta.width if media_meta else None,
+            duration=media_meta.duration if media_meta else None,
+            mime_type=media_meta.mime_type if media_meta else None,
+            type=media_meta.type if media_meta else None,
+            extension=media_meta.extension if media_meta else None,
+            md5=media_meta.md5 if media_meta else None,
+            file_path=file_path,
+            is_deleted=False,
+            added_by=user_id,
+            updated_by=user_id,
+        )
+
+    def _entity_to_item(
+        self,
+        entity: Entity,
+        children_count: int = 0,
+        is_indirectly_deleted: bool | None = None,
+    ) -> EntitySchema:
         """
         Convert SQLAlchemy Entity to Pydantic Item schema.
 
         Args:
             entity: SQLAlchemy Entity instance (or version object from SQLAlchemy-Continuum)
             children_count: Number of children (only relevant for collections)
+            is_indirectly_deleted: Precomputed ancestor state (see _entities_to_items);
+                checked with one query when omitted
 
         Returns:
             Pydantic EntitySchema instance
         """
-
-
+        if is_indirectly_deleted is None:
+            is_indirectly_deleted = self._check_ancestor_deleted(entity)
 
         return EntitySchema(
             id=entity.id,
@@ -346,8 +604,10 @@ class EntityService:
             extension=entity.extension,
             md5=entity.md5,
             file_path=entity.file_path,
+            # Version objects do not carry the (unversioned) preview state
+            preview_status=getattr(entity, "preview_status", None),
             is_deleted=entity.is_deleted,
-            is_indirectly_deleted=self._check_ancestor_deleted(entity),
+            is_indirectly_deleted=is_indirectly_deleted,
             children_count=children_count,
         )
 
@@ -372,16 +632,26 @@ class EntityService:
         date_to: int | None = None,
         parent_id: int | None = None,
         is_collection: bool | None = None,
-    ) -> tuple[list[EntitySchema], int]:
+        cursor: str | None = None,
+        include_total: bool = True,
+        ancestor_id: int | None = None,
+        as_of_transaction: int | None = None,
+    ) -> tuple[list[EntitySchema], int | None, str | None]:
         """
         Retrieve all entities with optional pagination, versioning, and filtering.
 
+        Entities are ordered newest first by (added_date, id). With a cursor the
+        page starts right after the entity the cursor points at, seeking on the
+        (added_date, id) index instead of skipping rows with OFFSET. Search
+        results are ordered by relevance instead, and their cursors carry an offset.
+
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when a cursor is given
             page_size: Number of items per page
             version: Optional version number to retrieve for all entities
             filter_param: Optional filter string
-            search_query: Optional search query
+            search_query: Full-text search over label and description (every word
+                as a prefix); results are ordered by relevance
             exclude_deleted: Whether to exclude soft-deleted entities
             md5: Filter by MD5
             mime_type: Filter by MIME type
@@ -394,95 +664,217 @@ class EntityService:
             date_to: Filter by added date to (timestamp ms)
             parent_id: Filter by parent collection ID (0 = root-level items)
             is_collection: Filter by collection (true) vs media item (false)
+            cursor: Opaque cursor from a previous page's next_cursor
+            include_total: Whether to count all matching entities
+            ancestor_id: Only entities anywhere below this collection (any depth)
+            as_of_transaction: List entities as they were right after this
+                transaction, read from the version table; filters, ordering
+                and cursors apply to the historical rows
 
         Returns:
-            Tuple of (items, total_count)
+            Tuple of (items, total_count, next_cursor); total_count is None when
+            not requested, next_cursor is None on the last page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+            ValueError: If version or ancestor_id is combined with as_of_transaction
         """
-        query = self.db.query(Entity)
+        if version is not None and as_of_transaction is not None:
+            raise ValueError("version cannot be combined with as_of_transaction")
+
+        # Point-in-time listings read the version rows valid at that transaction
+        model = self._entity_model(as_of_transaction)
+        query = self.db.query(model)
+        if as_of_transaction is not None:
+            query = query.filter(self._valid_at(model, as_of_transaction))
 
         if exclude_deleted:
-            query = query.filter(Entity.is_deleted == False)  # noqa: E712
+            query = query.filter(model.is_deleted == False)  # noqa: E712
 
-        if search_query:
+        # Full-text search over label and description, ranked by relevance.
+        # The index holds current text only, so history falls back to a scan.
+        match = None
+        if search_query and as_of_transaction is not None:
             search = f"%{search_query}%"
-            query = query.filter(Entity.label.ilike(search))
+            query = query.filter(or_(model.label.ilike(search), model.description.ilike(search)))
+        elif search_query:
+            match = fts_match_query(search_query)
+        if match is not None:
+            query = query.join(entities_fts, entities_fts.c.rowid == model.id).filter(
+                text("entities_fts MATCH :fts_match").bindparams(fts_match=match)
+            )
 
         # Apply specific filters
         if md5:
-            query = query.filter(Entity.md5 == md5)
+            query = query.filter(model.md5 == md5)
         
         if mime_type:
-            query = query.filter(Entity.mime_type == mime_type)
+            query = query.filter(model.mime_type == mime_type)
 
         if type_:
-            query = query.filter(Entity.type == type_)
+            query = query.filter(model.type == type_)
 
         if width is not None:
-            query = query.filter(Entity.width == width)
+            query = query.filter(model.width == width)
 
         if height is not None:
-            query = query.filter(Entity.height == height)
+            query = query.filter(model.height == height)
 
         if file_size_min is not None:
-            query = query.filter(Entity.file_size >= file_size_min)
+            query = query.filter(model.file_size >= file_size_min)
 
         if file_size_max is not None:
-            query = query.filter(Entity.file_size <= file_size_max)
+            query = query.filter(model.file_size <= file_size_max)
 
         if date_from is not None:
-            query = query.filter(Entity.added_date >= date_from)
+            query = query.filter(model.added_date >= date_from)
             
         if date_to is not None:
-            query = query.filter(Entity.added_date <= date_to)
+            query = query.filter(model.added_date <= date_to)
 
         if parent_id is not None:
             if parent_id == 0:
                 # Special value: root-level items (no parent)
-                query = query.filter(Entity.parent_id == None)  # noqa: E711
+                query = query.filter(model.parent_id == None)  # noqa: E711
             else:
-                query = query.filter(Entity.parent_id == parent_id)
+                query = query.filter(model.parent_id == parent_id)
 
         if is_collection is not None:
-            query = query.filter(Entity.is_collection == is_collection)
+            query = query.filter(model.is_collection == is_collection)
+
+        if ancestor_id is not None:
+            if as_of_transaction is not None:
+                raise ValueError("ancestor_id cannot be combined with as_of_transaction")
+            query = query.join(EntityClosure, EntityClosure.descendant_id == model.id).filter(
+                EntityClosure.ancestor_id == ancestor_id,
+                EntityClosure.depth > 0,
+            )
 
         # Count total before pagination
-        total_items = query.count()
-
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.order_by(Entity.added_date.desc()).offset(offset).limit(page_size)
-        results = query.all()
+        total_items = query.count() if include_total else None
+
+        # Apply pagination; one extra row tells whether there is a next page
+        if match is not None:
+            # Relevance order cannot seek, so search cursors carry an offset
+            offset = decode_offset_cursor(cursor) if cursor else (page - 1) * page_size
+            query = query.order_by(
+                entities_fts.c.rank, model.added_date.desc(), model.id.desc()
+            ).offset(offset)
+        else:
+            query = query.order_by(model.added_date.desc(), model.id.desc())
+            if cursor is not None:
+                query = query.filter(tuple_(model.added_date, model.id) < decode_cursor(cursor))
+            else:
+                query = query.offset((page - 1) * page_size)
+        results = query.limit(page_size + 1).all()
+        next_cursor = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            if match is not None:
+                next_cursor = encode_offset_cursor(offset + page_size)
+            else:
+                next_cursor = encode_cursor(results[-1])
 
         # Hande versioning if requested
         if version is not None:
-            items_list: list[EntitySchema] = []
-            for entity in results:
-                versioned_item = self.get_entity_version(entity.id, version)
-                if versioned_item:  # Only include if version exists
-                    items_list.append(versioned_item)
-            return items_list, total_items
+            found = self._find_versions([e.id for e in results], version)
+            # Only include entities where the version exists, in page order
+            version_objects = [found[e.id] for e in results if e.id in found]
+            return self._entities_to_items(version_objects), total_items, next_cursor
 
         # Get children counts for the results
         entity_ids = [e.id for e in results]
         counts = {}
         if entity_ids:
             count_query = self.db.query(
-                Entity.parent_id, func.count(Entity.id)
+                model.parent_id, func.count(model.id)
             ).filter(
-                Entity.parent_id.in_(entity_ids)
+                model.parent_id.in_(entity_ids)
             )
+            if as_of_transaction is not None:
+                count_query = count_query.filter(self._valid_at(model, as_of_transaction))
             if exclude_deleted:
-                count_query = count_query.filter(Entity.is_deleted == False)
+                count_query = count_query.filter(model.is_deleted == False)
             
             # Execute and convert to dict {parent_id: count}
-            counts = dict(count_query.group_by(Entity.parent_id).all())
+            counts = dict(count_query.group_by(model.parent_id).all())
+
+        items = self._entities_to_items(results, children_counts=counts)
 
-        items: list[EntitySchema] = []
-        for entity in results:
-            items.append(self._entity_to_item(entity, children_count=counts.get(entity.id, 0)))
+        return items, total_items, next_cursor
 
-        return items, total_items
+    @staticmethod
+    def _entity_model(as_of_transaction: int | None) -> type[Entity]:
+        """Entity, or its SQLAlchemy-Continuum version class for point-in-time reads."""
+        if as_of_transaction is None:
+            return Entity
+        return cast(type[Entity], version_class(Entity))
 
+    @staticmethod
+    def _valid_at(model: type[Entity], transaction_id: int) -> ColumnElement[bool]:
+        """Version rows that were current right after the given transaction.
+
+        With Continuum's validity strategy a version row is valid from its
+        transaction_id until (excluding) its end_transaction_id.
+        """
+        version = cast(Any, model)  # pyright: ignore[reportExplicitAny]
+        return and_(
+            version.transaction_id <= transaction_id,
+            or_(
+                version.end_transaction_id == None,  # noqa: E711
+                version.end_transaction_id > transaction_id,
+            ),
+            version.operation_type != Operation.DELETE,
+        )
+
+    def get_entities_by_ids(self, ids: list[int]) -> EntityLookupResponse:
+        """
+        Fetch several entities by ID in a single query.
+
+        Children counts and the indirect-deletion flag are computed in the
+        same statement, as a correlated count and a closure-table EXISTS, so
+        the cost does not grow with the number of round trips.
+
+        Args:
+            ids: Entity IDs; duplicates are returned once
+
+        Returns:
+            EntityLookupResponse with the entities in request order and the
+            IDs that were not found
+        """
+        requested = list(dict.fromkeys(ids))
+        child = aliased(Entity)
+        ancestor = aliased(Entity)
+        children_count = (
+            select(func.count(child.id))
+            .where(child.parent_id == Entity.id, child.is_deleted == False)  # noqa: E712
+            .scalar_subquery()
+        )
+        indirectly_deleted = (
+            select(EntityClosure.ancestor_id)
+            .join(ancestor, ancestor.id == EntityClosure.ancestor_id)
+            .where(
+                EntityClosure.descendant_id == Entity.id,
+                EntityClosure.depth > 0,
+                ancestor.is_deleted == True,  # noqa: E712
+            )
+            .exists()
+        )
+        rows = (
+            self.db.query(Entity, children_count, indirectly_deleted)
+            .filter(Entity.id.in_(requested))
+            .all()
+        )
+        found = {
+            entity.id: self._entity_to_item(
+                entity, children_count=count, is_indirectly_deleted=bool(deleted)
+            )
+            for entity, count, deleted in rows
+        }
+        return EntityLookupResponse(
+            items=[found[entity_id] for entity_id in requested if entity_id in found],
+            missing=[entity_id for entity_id in requested if entity_id not in found],
+        )
 
     def lookup_entity(
         self,
@@ -567,49 +959,223 @@ class EntityService:
         if not entity:
             return None
 
-        # Get the specific version
-        # SQLAlchemy-Continuum creates a versions relationship on the model
-        if hasattr(entity, "versions"):
-            versions_list = cast(list[Entity], entity.versions.all())  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
-            # Versions are 1-indexed for the API
-            if 1 <= version <= len(versions_list):
-                version_entity = versions_list[version - 1]
-                return self._entity_to_item(version_entity)
+        # Versions are 1-indexed for the API, in transaction order
+        if version < 1:
+            return None
+        version_model = cast(Any, version_class(Entity))  # pyright: ignore[reportExplicitAny]
+        version_entity = (
+            self.db.query(version_model)
+            .filter(version_model.id == entity_id)
+            .order_by(version_model.transaction_id)
+            .offset(version - 1)
+            .limit(1)
+            .first()
+        )
+        if version_entity is not None:
+            return self._entity_to_item(version_entity)
 
         return None
 
-    def get_entity_versions(self, entity_id: int) -> list[VersionInfo]:
+    def _find_versions(self, entity_ids: list[int], version: int) -> dict[int, Entity]:
+        """Fetch the given 1-indexed version of several entities in one query.
+
+        Returns:
+            {entity_id: version object}, without entities that lack that version
+        """
+        if not entity_ids or version < 1:
+            return {}
+        version_model = cast(Any, version_class(Entity))  # pyright: ignore[reportExplicitAny]
+        ordinal = (
+            func.row_number()
+            .over(partition_by=version_model.id, order_by=version_model.transaction_id)
+            .label("ordinal")
+        )
+        numbered = (
+            select(version_model.id, version_model.transaction_id, ordinal)
+            .where(version_model.id.in_(entity_ids))
+            .subquery()
+        )
+        rows = (
+            self.db.query(version_model)
+            .join(
+                numbered,
+                and_(
+                    numbered.c.id == version_model.id,
+                    numbered.c.transaction_id == version_model.transaction_id,
+                ),
+            )
+            .filter(numbered.c.ordinal == version)
+            .all()
+        )
+        return {row.id: row for row in rows}
+
+    def get_entity_etag(self, entity_id: int) -> str | None:
+        """
+        Opaque tag that changes whenever the entity's current representation can.
+
+        The tag is the latest transaction touching the entity, its direct
+        children (children_count) or its ancestors (is_indirectly_deleted),
+        plus its preview_status, which is not versioned. With the validity
+        strategy, a version row's end_transaction_id is the transaction that
+        replaced it, so children moved or deleted away are seen too.
+
+        Returns:
+            The tag, or None if the entity does not exist
+        """
+        row = self.db.query(Entity.preview_status).filter(Entity.id == entity_id).first()
+        if row is None:
+            return None
+
+        version_model = cast(Any, version_class(Entity))  # pyright: ignore[reportExplicitAny]
+        ancestors = select(EntityClosure.ancestor_id).where(
+            EntityClosure.descendant_id == entity_id, EntityClosure.depth > 0
+        )
+        changed = self.db.query(
+            func.max(
+                func.coalesce(version_model.end_transaction_id, version_model.transaction_id)
+            )
+        ).filter(
+            or_(
+                version_model.id == entity_id,
+                version_model.parent_id == entity_id,
+                version_model.id.in_(ancestors),
+            )
+        ).scalar()
+        return f"{entity_id}-{changed or 0}-{row.preview_status or ''}"
+
+    def get_listing_etag(self) -> str:
+        """
+        Opaque tag that changes whenever any entity listing can.
+
+        The latest entity transaction (found on the transaction_id index)
+        plus a count of preview_status updates, which create no transaction.
         """
-        Get all versions of an entity with metadata.
+        version_model = cast(Any, version_class(Entity))  # pyright: ignore[reportExplicitAny]
+        latest = self.db.query(func.max(version_model.transaction_id)).scalar()
+        return f"{latest or 0}-{preview_generation()}"
+
+    def get_entity_versions(
+        self, entity_id: int, page: int = 1, page_size: int | None = None
+    ) -> list[VersionInfo] | None:
+        """
+        Get versions of an entity with metadata.
+
+        Only the version metadata columns are read, one page at a time, using
+        the (id, transaction_id) primary key of the version table.
 
         Args:
             entity_id: Entity ID
+            page: Page number (1-indexed)
+            page_size: Versions per page (None = all)
 
         Returns:
-            List of version metadata dictionaries
+            List of version metadata (empty past the last page), or None if
+            the entity does not exist
         """
-        entity = self.db.query(Entity).filter(Entity.id == entity_id).first()
-        if not entity:
-            return []
-
-        if not hasattr(entity, "versions"):
-            return []
-
-        versions_list = entity.versions.all()  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType, reportAttributeAccessIssue]
-        result: list[VersionInfo] = []
-        for idx, version in enumerate(versions_list, start=1):  # pyright: ignore[reportUnknownArgumentType, reportUnknownVariableType]
-            # SQLAlchemy-Continuum version objects can be validated via model_validate
-            # with from_attributes=True enabled in the schema
-            # Create dictionary with required fields
-            version_data = {  # pyright: ignore[reportUnknownVariableType]
-                "transaction_id": version.transaction_id,  # pyright: ignore[reportUnknownMemberType]
-                "updated_date": version.updated_date,  # pyright: ignore[reportUnknownMemberType]
-                "version": idx,
-            }
-            version_info = VersionInfo.model_validate(version_data)
-            result.append(version_info)
+        if self.db.query(Entity.id).filter(Entity.id == entity_id).first() is None:
+            return None
+
+        version_cols = cast(Any, version_class(Entity))  # pyright: ignore[reportExplicitAny]
+        offset = (page - 1) * page_size if page_size is not None else 0
+        query = (
+            self.db.query(version_cols.transaction_id, version_cols.updated_date)
+            .filter(version_cols.id == entity_id)
+            .order_by(version_cols.transaction_id)
+            .offset(offset)
+        )
+        if page_size is not None:
+            query = query.limit(page_size)
+
+        return [
+            VersionInfo(version=offset + idx, transaction_id=transaction_id, updated_date=updated_date)
+            for idx, (transaction_id, updated_date) in enumerate(query.all(), start=1)
+        ]
+
+    def get_changes(
+        self, since: int, limit: int
+    ) -> tuple[list[EntityVersionSchema], ChangeFeedMark]:
+        """
+        Get entity changes committed after a transaction, one row per entity.
+
+        At most ``limit`` transactions are covered per call, always whole
+        transactions, so resuming from the returned high-water mark never
+        skips or repeats a change.
+
+        Args:
+            since: Transaction ID already seen by the client (0 = from the start)
+            limit: Maximum number of transactions to cover
+
+        Returns:
+            Tuple of (latest version of each changed entity in transaction
+            order, high-water mark to resume from)
+        """
+        version_model = cast(Any, version_class(Entity))  # pyright: ignore[reportExplicitAny]
+        latest = cast(
+            int | None, self.db.query(func.max(version_model.transaction_id)).scalar()
+        )
+        if latest is None or latest <= since:
+            return [], ChangeFeedMark(high_water_mark=since, has_more=False)
+
+        # Last transaction of this page, taken on the indexed transaction_id
+        upper = cast(
+            int | None,
+            self.db.query(version_model.transaction_id)
+            .filter(version_model.transaction_id > since)
+            .distinct()
+            .order_by(version_model.transaction_id)
+            .offset(limit - 1)
+            .limit(1)
+            .scalar(),
+        )
+        if upper is None or upper > latest:
+            upper = latest
+
+        changes = EntityVersionDBService(db=self.db).get_versions_in_range(since, upper)
+        return list(changes.values()), ChangeFeedMark(
+            high_water_mark=upper, has_more=upper < latest
+        )
+
+    def get_subtree_stats(
+        self, entity_id: int, exclude_deleted: bool = False
+    ) -> SubtreeStats | None:
+        """
+        Count and size everything below a collection in one closure-table query.
+
+        Args:
+            entity_id: Root of the subtree
+            exclude_deleted: Whether to leave out soft-deleted descendants
+
+        Returns:
+            SubtreeStats, or None if the entity does not exist
+        """
+        if self.db.query(Entity.id).filter(Entity.id == entity_id).first() is None:
+            return None
+
+        query = (
+            self.db.query(
+                func.count(Entity.id),
+                func.sum(case((Entity.is_collection == True, 1), else_=0)),  # noqa: E712
+                func.sum(Entity.file_size),
+                func.max(EntityClosure.depth),
+            )
+            .select_from(EntityClosure)
+            .join(Entity, Entity.id == EntityClosure.descendant_id)
+            .filter(EntityClosure.ancestor_id == entity_id, EntityClosure.depth > 0)
+        )
+        if exclude_deleted:
+            query = query.filter(Entity.is_deleted == False)  # noqa: E712
 
-        return result
+        count, collections, total_size, max_depth = cast(
+            tuple[int, int | None, int | None, int | None], query.one()
+        )
+        return SubtreeStats(
+            entity_id=entity_id,
+            descendant_count=count,
+            collection_count=collections or 0,
+            media_count=count - (collections or 0),
+            total_file_size=total_size or 0,
+            max_depth=max_depth or 0,
+        )
 
     def create_entity(
         self,
@@ -617,8 +1183,7 @@ class EntityService:
         label: str | None = None,
         description: str | None = None,
         parent_id: int | None = None,
-        media_file: bytes | None = None,
-        filename: str = "file",
+        media_file: StagedFile | None = None,
         user_id: str | None = None,
     ) -> tuple[EntitySchema, bool]:
         """
@@ -629,8 +1194,8 @@ class EntityService:
             label: Entity label
             description: Entity description
             parent_id: Parent entity ID
-            media_file: Optional media file bytes
-            filename: Original filename
+            media_file: Optional media file spooled to the staging area. On success
+                it is moved into storage; otherwise it is left for the caller to discard.
             user_id: Optional user identifier from JWT (None in demo mode)
 
         Returns:
@@ -660,134 +1225,301 @@ class EntityService:
 
         # Extract metadata and save file if provided
         if media_file:
-            # Extract metadata using MediaMetadataExtractor
-            media_meta = self.metadata_extractor.extract_metadata(media_file, filename)
+            filename = media_file.original_filename
+            # Hash first: dedupe needs only the content hash, not ExifTool/ffprobe
+            identity = self.metadata_extractor.identify_file(media_file)
 
             # Check for duplicate MD5
-            duplicate = self._check_duplicate_md5(media_meta.md5)
+            duplicate = self._check_duplicate_md5(identity.md5)
             if duplicate:
                 # Return the existing item instead of raising an error
                 return (self._entity_to_item(duplicate), True)  # is_duplicate=True
 
-            # Save file to storage (convert Pydantic model to dict for storage)
+            # Extract full metadata using MediaMetadataExtractor
+            media_meta = self.metadata_extractor.extract_metadata_from_file(media_file, identity)
+
+            # Move staged file into storage (convert Pydantic model to dict for storage)
             logger.debug(f"{filename} is sent for saving with metadata {media_meta.model_dump()}")
-            file_path = self.file_storage.save_file(media_file, media_meta.model_dump(), filename)
+            file_path = self.file_storage.commit_staged_file(media_file, media_meta.model_dump())
             logger.debug(f"filepath received: {file_path}")
             logger.debug(self.file_storage.base_dir)
 
-        # Extract metadata values from Pydantic model (or None for collections)
-        if media_meta:
-            file_size = media_meta.file_size
-            height = media_meta.height
-            width = media_meta.width
-            duration = media_meta.duration
-            mime_type = media_meta.mime_type
-            type_str = media_meta.type
-            extension = media_meta.extension
-            md5 = media_meta.md5
-        else:
-            # No file metadata for collections
-            file_size = None
-            height = None
-            width = None
-            duration = None
-            mime_type = None
-            type_str = None
-            extension = None
-            md5 = None
-
-        entity = Entity(
-            is_collection=is_collection,
-            label=label,
-            description=description,
-            parent_id=parent_id,
-            added_date=now,
-            updated_date=now,
-            create_date=now,
-            file_size=file_size,
-            height=height,
-            width=width,
-            duration=duration,
-            mime_type=mime_type,
-            type=type_str,
-            extension=extension,
-            md5=md5,
-            file_path=file_path,
-            is_deleted=False,
-            added_by=user_id,
-            updated_by=user_id,
+        # Thumbnail is queued after the commit (inline only without a queue)
+        preview_status = None
+        thumbnail_path = None
+        if file_path:
+            preview_status = self._initial_preview_status(file_path, media_meta.mime_type if media_meta else None)
+            if preview_status == "ready":
+                thumbnail_path = ThumbnailGenerator.get_thumbnail_path(
+                    str(self.file_storage.get_absolute_path(file_path))
+                )
+
+        def insert(db: Session) -> Entity:
+            entity = self.build_entity(
+                is_collection=is_collection,
+                label=label,
+                description=description,
+                parent_id=parent_id,
+                media_meta=media_meta,
+                file_path=file_path,
+                user_id=user_id,
+                now=now,
+            )
+            if file_path:
+                entity.preview_status = preview_status
+            db.add(entity)
+            db.flush()
+            return entity
+
+        try:
+            entity = self._write(insert)
+        except IntegrityError as _:
+            # Clean up file AND thumbnail if database insert failed
+            if file_path:
+                _ = self.file_storage.delete_file(file_path)
+                # Cleanup thumbnail if generated
+                if thumbnail_path:
+                    # ThumbnailGenerator.delete takes the INPUT path and recalculates the thumbnail path
+                    abs_file_path = self.file_storage.get_absolute_path(file_path)
+                    ThumbnailGenerator.delete(str(abs_file_path))
+
+            raise DuplicateFileError(
+                f"Duplicate MD5 detected: {media_meta.md5 if media_meta else 'unknown'}"
+            )
+        except Exception:
+            # Clean up file AND thumbnail if database error
+            if file_path:
+                _ = self.file_storage.delete_file(file_path)
+                abs_file_path = self.file_storage.get_absolute_path(file_path)
+                ThumbnailGenerator.delete(str(abs_file_path))
+            raise
+
+        item = self._entity_to_item(entity)
+        self._queue_thumbnail(item)
+        return (item, False)  # is_duplicate=False
+
+    async def create_entities_batch(
+        self,
+        media_files: list[StagedFile],
+        parent_id: int | None = None,
+        user_id: str | None = None,
+    ) -> BatchCreateResponse:
+        """
+        Create one entity per file, inserting all new rows in a single transaction.
+
+        Files go through hash -> dedupe -> extract/store -> insert. Hashing and
+        extraction plus storing (ExifTool, file move) run in parallel
+        across the batch on the ingest executor, within its admission limit;
+        duplicate detection uses one query for the whole batch, also catches
+        repeated content within the batch, and happens before any
+        ExifTool/ffprobe work.
+
+        Args:
+            media_files: Files spooled to the staging area. Files that are stored
+                are moved; the rest are left for the caller to discard.
+            parent_id: Parent entity ID shared by all files
+            user_id: Optional user identifier from JWT (None in demo mode)
+
+        Returns:
+            BatchCreateResponse with one result per file, in input order
+
+        Raises:
+            ValueError: If parent_id is invalid
+        """
+        await self._run_blocking(
+            self._validate_parent_id, parent_id=parent_id, _is_collection=False, entity_id=None
         )
 
-        # Retry logic for database locks
-        import time
+        results: list[BatchItemResult | None] = [None] * len(media_files)
+        if not media_files:
+            return BatchCreateResponse(items=[])
 
-        from sqlalchemy.exc import OperationalError
+        def error_result(idx: int, error: Exception) -> BatchItemResult:
+            logger.warning(f"Batch item {media_files[idx].original_filename} failed: {error}")
+            return BatchItemResult(
+                filename=media_files[idx].original_filename, status="error", error=str(error)
+            )
 
-        max_retries = 5
-        retry_delay = 0.1
+        # Stage 1: content hash only (no ExifTool/ffprobe yet)
+        def identify(staged: StagedFile) -> MediaIdentity | Exception:
+            try:
+                return self.metadata_extractor.identify_file(staged)
+            except Exception as e:
+                return e
 
-        # Generate thumbnail if file was saved
-        thumbnail_path = None
-        if file_path:
+        identities = await asyncio.gather(
+            *(self._run_blocking(identify, staged) for staged in media_files)
+        )
+
+        # Stage 2: dedupe against the database and within the batch
+        def dedupe() -> list[tuple[int, MediaIdentity]]:
+            md5s = [ident.md5 for ident in identities if isinstance(ident, MediaIdentity)]
+            existing = self._find_entities_by_md5(md5s)
+            first_index: dict[str, int] = {}
+            pending: list[tuple[int, MediaIdentity]] = []
+            for idx, ident in enumerate(identities):
+                if isinstance(ident, Exception):
+                    results[idx] = error_result(idx, ident)
+                elif ident.md5 in existing and existing[ident.md5].is_deleted:
+                    # md5 is unique across all rows, soft-deleted ones included
+                    results[idx] = error_result(
+                        idx,
+                        DuplicateFileError(
+                            f"Content matches soft-deleted entity {existing[ident.md5].id}"
+                        ),
+                    )
+                elif ident.md5 in existing:
+                    results[idx] = BatchItemResult(
+                        filename=media_files[idx].original_filename,
+                        status="duplicate",
+                        entity=self._entity_to_item(existing[ident.md5]),
+                    )
+                elif ident.md5 not in first_index:
+                    first_index[ident.md5] = idx
+                    pending.append((idx, ident))
+            return pending
+
+        pending = await self._run_blocking(dedupe)
+
+        # Stage 3: extract full metadata, move files into storage
+        def store(
+            item: tuple[int, MediaIdentity],
+        ) -> tuple[MediaMetadata, str, PreviewStatus | None] | Exception:
+            idx, ident = item
             try:
-                # Get absolute path for thumbnail generation
-                abs_file_path = self.file_storage.get_absolute_path(file_path)
-                thumbnail_path = ThumbnailGenerator.generate(str(abs_file_path), mime_type)
+                meta = self.metadata_extractor.extract_metadata_from_file(
+                    media_files[idx], ident
+                )
+                file_path = self.file_storage.commit_staged_file(
+                    media_files[idx], meta.model_dump()
+                )
             except Exception as e:
-                logger.error(f"Thumbnail generation failed (non-critical): {e}")
+                return e
+            return meta, file_path, self._initial_preview_status(file_path, meta.mime_type)
+
+        stored = await asyncio.gather(*(self._run_blocking(store, item) for item in pending))
 
-        for attempt in range(max_retries):
+        # Stage 4: insert all new rows in one transaction
+        now = self._now_timestamp()
+        new_rows: dict[int, tuple[MediaMetadata, str, PreviewStatus | None]] = {}
+        for (idx, _), outcome in zip(pending, stored):
+            if isinstance(outcome, Exception):
+                results[idx] = error_result(idx, outcome)
+                continue
+            new_rows[idx] = outcome
+
+        Row = tuple[MediaMetadata, str, PreviewStatus | None]
+
+        def insert(rows: list[Row]) -> Callable[[Session], list[Entity]]:
+            def apply(db: Session) -> list[Entity]:
+                entities: list[Entity] = []
+                for meta, file_path, preview_status in rows:
+                    entity = self.build_entity(
+                        is_collection=False,
+                        label=None,
+                        description=None,
+                        parent_id=parent_id,
+                        media_meta=meta,
+                        file_path=file_path,
+                        user_id=user_id,
+                        now=now,
+                    )
+                    entity.preview_status = preview_status
+                    entities.append(entity)
+                db.add_all(entities)
+                db.flush()
+                return entities
+
+            return apply
+
+        def commit() -> dict[int, EntitySchema | Exception]:
             try:
-                self.db.add(entity)
-                self.db.commit()
-                self.db.refresh(entity)
-                break  # Success, exit retry loop
-            except IntegrityError as _:
-                self.db.rollback()
-                # Clean up file AND thumbnail if database insert failed
-                if file_path:
-                    _ = self.file_storage.delete_file(file_path)
-                    # Cleanup thumbnail if generated
-                    if thumbnail_path:
-                        # thumbnail function returns partial path? No, docstring says output file path as string.
-                        # Wait, ThumbnailGenerator.generate returns the OUTPUT PATH.
-                        # So we need to delete that path directly.
-                        # But wait, ThumbnailGenerator.delete takes the INPUT path and recalculates the thumbnail path.
-                        # Let's use that for consistency.
-                        abs_file_path = self.file_storage.get_absolute_path(file_path)
-                        ThumbnailGenerator.delete(str(abs_file_path))
+                entities = self._write(insert(list(new_rows.values())))
+                return dict(zip(new_rows, self._entities_to_items(entities)))
+            except IntegrityError:
+                # Lost a race with a concurrent upload of the same content:
+                # insert one by one so only the conflicting files fail
+                logger.warning("Batch insert hit a unique constraint, inserting rows one by one")
+
+            outcomes: dict[int, EntitySchema | Exception] = {}
+            for idx, row in new_rows.items():
+                try:
+                    [entity] = self._write(insert([row]))
+                except Exception as e:
+                    self._discard_stored_files([row[1]])
+                    outcomes[idx] = (
+                        DuplicateFileError(f"Duplicate MD5 detected: {row[0].md5}")
+                        if isinstance(e, IntegrityError)
+                        else e
+                    )
+                else:
+                    outcomes[idx] = self._entity_to_item(entity)
+            return outcomes
 
-                raise DuplicateFileError(
-                    f"Duplicate MD5 detected: {media_meta.md5 if media_meta else 'unknown'}"
-                )
-            except OperationalError as e:
-                self.db.rollback()
-                if "database is locked" in str(e).lower():
-                    if attempt < max_retries - 1:
-                        logger.warning(
-                            f"Database locked during entity creation, "
-                            f"retry {attempt + 1}/{max_retries} after {retry_delay}s"
-                        )
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
-                    else:
-                        logger.error(f"Database locked after {max_retries} retries, giving up")
-                        # Clean up file AND thumbnail if all retries failed
-                        if file_path:
-                            _ = self.file_storage.delete_file(file_path)
-                            abs_file_path = self.file_storage.get_absolute_path(file_path)
-                            ThumbnailGenerator.delete(str(abs_file_path))
-                        raise
+        stored_paths = [file_path for _, file_path, _ in new_rows.values()]
+        created: dict[int, EntitySchema] = {}
+        if new_rows:
+            try:
+                outcomes = await self._run_blocking(commit)
+            except Exception:
+                await self._run_blocking(self._discard_stored_files, stored_paths)
+                raise
+            for idx, outcome in outcomes.items():
+                if isinstance(outcome, Exception):
+                    results[idx] = error_result(idx, outcome)
                 else:
-                    # Re-raise if it's not a lock error
-                    # Clean up file AND thumbnail if database error
-                    if file_path:
-                        _ = self.file_storage.delete_file(file_path)
-                        abs_file_path = self.file_storage.get_absolute_path(file_path)
-                        ThumbnailGenerator.delete(str(abs_file_path))
-                    raise
+                    created[idx] = outcome
+
+        created_items: dict[str, EntitySchema] = {}
+        for idx, item in created.items():
+            self._queue_thumbnail(item)
+            created_items[item.md5 or ""] = item
+            results[idx] = BatchItemResult(
+                filename=media_files[idx].original_filename, status="created", entity=item
+            )
 
-        return (self._entity_to_item(entity), False)  # is_duplicate=False
+        # Files repeating content seen earlier in the same batch
+        for idx, ident in enumerate(identities):
+            if results[idx] is not None or not isinstance(ident, MediaIdentity):
+                continue
+            item = created_items.get(ident.md5)
+            if item is None:
+                results[idx] = error_result(idx, RuntimeError("Matching file in batch failed"))
+            else:
+                results[idx] = BatchItemResult(
+                    filename=media_files[idx].original_filename, status="duplicate", entity=item
+                )
+
+        items = [result for result in results if result is not None]
+        return BatchCreateResponse(
+            items=items,
+            created=sum(1 for r in items if r.status == "created"),
+            duplicates=sum(1 for r in items if r.status == "duplicate"),
+            errors=sum(1 for r in items if r.status == "error"),
+        )
+
+    def _find_entities_by_md5(self, md5s: list[str]) -> dict[str, Entity]:
+        """Return entities keyed by md5 for the given hashes, soft-deleted ones included."""
+        found: dict[str, Entity] = {}
+        unique = list(dict.fromkeys(md5s))
+        # Chunk to stay well below SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            chunk = unique[start : start + 500]
+            rows = (
+                self.db.query(Entity)
+                .filter(Entity.md5.in_(chunk))
+                .all()
+            )
+            for entity in rows:
+                if entity.md5:
+                    _ = found.setdefault(entity.md5, entity)
+        return found
+
+    def _discard_stored_files(self, file_paths: list[str]) -> None:
+        """Delete stored files and their thumbnails after a failed insert."""
+        for file_path in file_paths:
+            _ = self.file_storage.delete_file(file_path)
+            ThumbnailGenerator.delete(str(self.file_storage.get_absolute_path(file_path)))
 
     def update_entity(
         self,
@@ -796,8 +1528,7 @@ class EntityService:
         label: str | None,
         description: str | None,
         parent_id: int | None,
-        media_file: bytes | None,
-        filename: str = "file",
+        media_file: StagedFile | None,
         user_id: str | None = None,
     ) -> tuple[EntitySchema, bool] | None:
         """
@@ -809,8 +1540,7 @@ class EntityService:
             label: Entity label
             description: Entity description
             parent_id: Parent entity ID
-            media_file: Media file bytes (optional - if None, only metadata is updated)
-            filename: Original filename
+            media_file: Staged media file (optional - if None, only metadata is updated)
             user_id: Optional user identifier from JWT (None in demo mode)
 
         Returns:
@@ -818,6 +1548,7 @@ class EntityService:
 
         Raises:
             DuplicateFileError: If file with same MD5 already exists
+            InvalidParentError: If parent_id breaks the hierarchy rules
         """
         entity = self.db.query(Entity).filter(Entity.id == entity_id).first()
         if not entity:
@@ -840,130 +1571,190 @@ class EntityService:
         file_path = None
         media_meta = None
         old_file_path = None
-        if media_file:
-            old_file_path = entity.file_path
-            # Validation: parent_id must follow hierarchy rules
+        fields: dict[str, object] = {}
+        # Validation: parent_id must follow hierarchy rules (also for metadata-only updates)
+        if media_file or parent_id != entity.parent_id:
             self._validate_parent_id(
                 parent_id=parent_id,
                 _is_collection=entity.is_collection,  # Use existing is_collection (immutable)
                 entity_id=entity_id,
             )
 
-            # Extract metadata from new file
-            media_meta = self.metadata_extractor.extract_metadata(media_file, filename)
+        if media_file:
+            old_file_path = entity.file_path
+            # Hash first so a duplicate is rejected before running ExifTool/ffprobe
+            identity = self.metadata_extractor.identify_file(media_file)
 
             # Check for duplicate MD5 (excluding current entity)
-            duplicate = self._check_duplicate_md5(media_meta.md5, exclude_entity_id=entity_id)
+            duplicate = self._check_duplicate_md5(identity.md5, exclude_entity_id=entity_id)
             if duplicate:
                 # Raise error if this content already exists as a DIFFERENT entity
                 raise DuplicateFileError(
                     f"File content matches existing entity {duplicate.id}. "
                     "Update would create a duplicate across entities."
                 )
+
+            # Extract full metadata from new file
+            media_meta = self.metadata_extractor.extract_metadata_from_file(media_file, identity)
             
             # If MD5 is the same as current entity, we can potentially skip re-saving?
             # But the metadata (mime_type, width, etc.) might still be useful to update.
             # Currently we continue with saving for simplicity, but MD5 check above 
             # ensures we don't duplicate *across* entities.
 
-            # Save new file (convert Pydantic model to dict for storage)
-            file_path = self.file_storage.save_file(media_file, media_meta.model_dump(), filename)
+            # Move staged file into storage (convert Pydantic model to dict for storage)
+            file_path = self.file_storage.commit_staged_file(media_file, media_meta.model_dump())
             
-            # Generate thumbnail for NEW file
-            try:
-                abs_file_path = self.file_storage.get_absolute_path(file_path)
-                ThumbnailGenerator.generate(str(abs_file_path), media_meta.mime_type)
-            except Exception as e:
-                logger.error(f"Thumbnail generation failed for updated file (non-critical): {e}")
-
-            # Update file metadata from Pydantic model
-            entity.file_size = media_meta.file_size
-            entity.height = media_meta.height
-            entity.width = media_meta.width
-            entity.duration = media_meta.duration
-            entity.mime_type = media_meta.mime_type
-            entity.type = media_meta.type
-            entity.extension = media_meta.extension
-            entity.md5 = media_meta.md5
-            entity.file_path = file_path
+            # Thumbnail for the NEW file is queued after the commit
+            fields = {
+                "preview_status": self._initial_preview_status(file_path, media_meta.mime_type),
+                # Update file metadata from Pydantic model
+                "file_size": media_meta.file_size,
+                "height": media_meta.height,
+                "width": media_meta.width,
+                "duration": media_meta.duration,
+                "mime_type": media_meta.mime_type,
+                "type": media_meta.type,
+                "extension": media_meta.extension,
+                "md5": media_meta.md5,
+                "file_path": file_path,
+            }
 
         # Update entity with new metadata and client-provided fields
-        now = self._now_timestamp()
+        fields.update(
+            label=label,
+            description=description,
+            parent_id=parent_id,
+            updated_date=self._now_timestamp(),
+            updated_by=user_id,
+        )
 
-        entity.label = label
-        entity.description = description
-        entity.parent_id = parent_id
-        entity.updated_date = now
-        entity.updated_by = user_id
-
-        # Preserve old path for cleanup ON SUCCESS
-        # If media_file was provided, old_file_path is set above 
-        # but I need to make sure I capture it BEFORE updating entity.file_path
-        # Wait, I already updated entity.file_path above.
-        # Check logic:
-        # Line 739: old_file_path = entity.file_path
-        # Line 741: if old_file_path: _ = self.file_storage.delete_file(old_file_path)
-        # ^ This was the OLD logic (delete immediately).
-        # We need to change that.
-
-        # CORRECT LOGIC:
-        # capture old_file_path at the beginning of "if media_file:" block? Yes.
-        # Oh, in the original code, old_file_path was captured at line 739.
-        # But wait, my "TargetContent" block below starts from line 733.
-        # So I need to structure the Replacement properly.
-
-        # Let's be careful. The original code DELETES the old file at line 741.
-        # I must DELETE that line from the original code and move the deletion to AFTER commit.
+        def apply(db: Session) -> Entity | None:
+            target = db.get(Entity, entity_id)
+            if target is None:
+                return None
+            for field_name, value in fields.items():
+                setattr(target, field_name, value)
+            db.flush()
+            return target
 
         try:
-            self.db.commit()
-            self.db.refresh(entity)
-            
-            # SUCCESS: Clean up OLD file and OLD thumbnail if file was replaced
-            if old_file_path:
-                try:
-                    _ = self.file_storage.delete_file(old_file_path)
-                    # Also delete OLD thumbnail
-                    abs_old_path = self.file_storage.get_absolute_path(old_file_path)
-                    ThumbnailGenerator.delete(str(abs_old_path))
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup old file: {e}")
-
+            updated = self._write(apply, key=entity_id)
         except IntegrityError:
-            self.db.rollback()
             # Clean up NEW file and NEW thumbnail if database update failed
             if file_path:
                 _ = self.file_storage.delete_file(file_path)
                 abs_file_path = self.file_storage.get_absolute_path(file_path)
                 ThumbnailGenerator.delete(str(abs_file_path))
-            
+
             raise DuplicateFileError(
                 f"Duplicate MD5 detected: {media_meta.md5 if media_meta else ''}"
             )
 
-        return (self._entity_to_item(entity), False)  # is_duplicate=False
+        if updated is None:
+            # Deleted while the new file was being stored
+            if file_path:
+                self._discard_stored_files([file_path])
+            return None
 
-    def ensure_thumbnail(self, entity: EntitySchema) -> str | None:
+        # SUCCESS: Clean up OLD file and OLD thumbnail if file was replaced
+        if old_file_path:
+            try:
+                _ = self.file_storage.delete_file(old_file_path)
+                # Also delete OLD thumbnail
+                abs_old_path = self.file_storage.get_absolute_path(old_file_path)
+                ThumbnailGenerator.delete(str(abs_old_path))
+            except Exception as e:
+                logger.warning(f"Failed to cleanup old file: {e}")
+
+        item = self._entity_to_item(updated)
+        if file_path:
+            self._queue_thumbnail(item)
+        return (item, False)  # is_duplicate=False
+
+    def get_preview_path(self, media_path: str, size: int | None = None) -> str:
+        """Preview to serve for a media file: the thumbnail, or the rendition nearest to size."""
+        if size is None:
+            return ThumbnailGenerator.get_thumbnail_path(media_path)
+        settings = self.config.preview_settings()
+        return ThumbnailGenerator.get_rendition_path(
+            media_path, settings.nearest_size(size), settings.format
+        )
+
+    def ensure_thumbnail(self, entity: EntitySchema, size: int | None = None) -> str | None:
         """
-        Ensure thumbnail exists for the entity. If not, generate it.
-        Returns the absolute path to the thumbnail if allowed/generated.
+        Ensure the thumbnail (or the rendition nearest to size) exists for the entity.
+        If not, generate it. Returns the absolute path to the preview if allowed/generated.
         """
         if not entity.file_path:
             return None
             
         try:
-            abs_file_path = self.file_storage.get_absolute_path(entity.file_path)
-            thumb_path = ThumbnailGenerator.get_thumbnail_path(str(abs_file_path))
+            abs_file_path = str(self.file_storage.get_absolute_path(entity.file_path))
+            preview_path = self.get_preview_path(abs_file_path, size)
             
-            if os.path.exists(thumb_path):
-                return thumb_path
+            if os.path.exists(preview_path):
+                return preview_path
                 
-            # Generate if missing
-            return ThumbnailGenerator.generate(str(abs_file_path), entity.mime_type)
+            # Generate if missing (thumbnail and all renditions in one pass)
+            generated = self._generate_thumbnail(abs_file_path, entity.mime_type)
+            if not generated or not os.path.exists(preview_path):
+                return None
+            if entity.preview_status != "ready":
+
+                def mark_ready(db: Session) -> None:
+                    _ = (
+                        db.query(Entity)
+                        .filter(Entity.id == entity.id, Entity.file_path == entity.file_path)
+                        .update({Entity.preview_status: "ready"}, synchronize_session=False)
+                    )
+
+                self._write(mark_ready)
+                note_preview_change()
+            return preview_path
         except Exception as e:
             logger.error(f"Failed to ensure thumbnail for entity {entity.id}: {e}")
             return None
 
+    def _initial_preview_status(self, file_path: str, mime_type: str | None) -> PreviewStatus | None:
+        """Preview state for a newly stored file.
+
+        With a thumbnail queue the preview is pending until the queue picks it
+        up after the commit; without one it is generated here, inline.
+        """
+        if not supports_preview(mime_type):
+            return None
+        if self.thumbnail_queue is not None:
+            return "pending"
+        try:
+            abs_file_path = self.file_storage.get_absolute_path(file_path)
+            generated = self._generate_thumbnail(str(abs_file_path), mime_type)
+        except Exception as e:
+            logger.error(f"Thumbnail generation failed (non-critical): {e}")
+            generated = None
+        return "ready" if generated else "failed"
+
+    def _queue_thumbnail(self, item: EntitySchema) -> None:
+        """Hand a committed entity's pending preview to the thumbnail queue."""
+        if (
+            self.thumbnail_queue is None
+            or item.preview_status != "pending"
+            or not item.file_path
+            or not item.mime_type
+        ):
+            return
+        abs_file_path = self.file_storage.get_absolute_path(item.file_path)
+        self.thumbnail_queue.submit(item.id, item.file_path, str(abs_file_path), item.mime_type)
+
+    def _generate_thumbnail(self, file_path: str, mime_type: str | None) -> str | None:
+        """Generate a thumbnail and renditions, on the executor's process pool when available."""
+        settings = self.config.preview_settings()
+        if self.executor is not None:
+            return self.executor.run_cpu(
+                ThumbnailGenerator.generate, file_path, mime_type, settings
+            )
+        return ThumbnailGenerator.generate(file_path, mime_type, settings)
+
     def patch_entity(
         self,
         entity_id: int,
@@ -999,31 +1790,40 @@ class EntityService:
                 entity_id=entity_id,
             )
 
-        # Update provided fields
-        for field_name, value in changes.items():
-            if hasattr(entity, field_name):
-                setattr(entity, field_name, value)
-
-        entity.updated_date = self._now_timestamp()
-        entity.updated_by = user_id
-
-        self.db.commit()
-        self.db.refresh(entity)
+        now = self._now_timestamp()
 
-        return self._entity_to_item(entity)
+        def apply(db: Session) -> Entity | None:
+            target = db.get(Entity, entity_id)
+            if target is None:
+                return None
+            # Update provided fields
+            for field_name, value in changes.items():
+                if hasattr(target, field_name):
+                    setattr(target, field_name, value)
+            target.updated_date = now
+            target.updated_by = user_id
+            db.flush()
+            return target
+
+        updated = self._write(apply, key=entity_id)
+        if updated is None:
+            return None
+        return self._entity_to_item(updated)
 
     def delete_entity(self, entity_id: int) -> bool:
         """Permanently delete an entity (hard delete with full cleanup).
 
         This method implements the deletion orchestration as specified in DEL-01 to DEL-09:
-        1. If entity is a collection, recursively delete all children
-        2. For each child: soft-delete first (if not already), then hard delete
-        3. Verify entity itself is soft-deleted (DEL-09 requirement)
-        4. Delete all associated faces (DB + Vector + Files)
-        5. Delete CLIP/DINO embeddings from vector stores
-        6. Delete entity file from storage
-        7. Clear MQTT retained messages
-        8. Delete entity record from database
+        1. Verify entity itself is soft-deleted (DEL-09 requirement)
+        2. If entity is a collection, delete its whole subtree (from the closure
+           table, deepest first), soft-deleting each descendant first if needed
+        3. For each deleted entity:
+           - Delete all associated faces (DB + Vector + Files)
+           - Delete CLIP/DINO embeddings from vector stores
+           - Delete entity file from storage
+           - Clear MQTT retained messages
+           - Delete entity record from database
+        4. Commit once for the whole subtree
 
         Args:
             entity_id: Entity ID to delete
@@ -1042,29 +1842,7 @@ class EntityService:
                 logger.warning(f"Entity {entity_id} not found for deletion")
                 return False
 
-            logger.info(f"Starting hard delete for entity {entity_id}")
-
-            # Step 1: Handle collection children (DEL-06)
-            if entity.is_collection:
-                children = self.db.query(Entity).filter(Entity.parent_id == entity_id).all()
-                logger.info(f"Entity {entity_id} is a collection with {len(children)} children")
-
-                for child in children:
-                    # If child not soft-deleted, soft-delete it first (for version history)
-                    if not child.is_deleted:
-                        logger.info(
-                            f"Soft-deleting child {child.id} before hard delete "
-                            f"(DEL-06 requirement)"
-                        )
-                        child.is_deleted = True
-                        child.updated_date = self._now_timestamp()
-                        self.db.flush()  # Ensure soft-delete is persisted
-
-                    # Recursively hard-delete the child
-                    logger.info(f"Recursively hard-deleting child {child.id}")
-                    self.delete_entity(child.id)
-
-            # Step 2: Verify entity is soft-deleted (DEL-09)
+            # Step 1: Verify entity is soft-deleted (DEL-09)
             if not entity.is_deleted:
                 raise EntityNotSoftDeletedError(
                     f"Cannot hard delete entity {entity_id}: "
@@ -1072,60 +1850,46 @@ class EntityService:
                     "Use PATCH /entities/{id} with is_deleted=true before hard deletion."
                 )
 
-            # Step 3: Delete all faces for this entity (DB + Vector + Files)
-            if self.face_service:
-                face_count = self.face_service.delete_faces_for_entity(entity_id)
-                logger.debug(f"Deleted {face_count} faces for entity {entity_id}")
-            else:
-                logger.warning("FaceService not available, skipping face deletion")
-
-            # Step 4: Delete CLIP embeddings from vector store
-            if self.clip_store:
-                try:
-                    self.clip_store.delete_vector(entity_id)
-                    logger.debug(f"Deleted CLIP embedding for entity {entity_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete CLIP embedding for entity {entity_id}: {e}")
-
-            # Step 5: Delete DINO embeddings from vector store
-            if self.dino_store:
-                try:
-                    self.dino_store.delete_vector(entity_id)
-                    logger.debug(f"Deleted DINO embedding for entity {entity_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete DINO embedding for entity {entity_id}: {e}")
-
-            # Step 6: Delete entity file from storage
-            if entity.file_path:
-                try:
-                    deleted = self.file_storage.delete_file(entity.file_path)
-                    
-                    # Also delete thumbnail
-                    abs_file_path = self.file_storage.get_absolute_path(entity.file_path)
-                    ThumbnailGenerator.delete(str(abs_file_path))
+            logger.info(f"Starting hard delete for entity {entity_id}")
 
-                    if deleted:
-                        logger.debug(f"Deleted entity file: {entity.file_path}")
-                    else:
-                        logger.warning(f"Entity file not found: {entity.file_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete entity file {entity.file_path}: {e}")
+            # Step 2: Handle collection descendants (DEL-06), deepest first
+            descendants: list[Entity] = []
+            if entity.is_collection:
+                descendants = (
+                    self.db.query(Entity)
+                    .join(EntityClosure, EntityClosure.descendant_id == Entity.id)
+                    .filter(EntityClosure.ancestor_id == entity_id, EntityClosure.depth > 0)
+                    .order_by(EntityClosure.depth.desc(), Entity.id)
+                    .all()
+                )
+                logger.info(
+                    f"Entity {entity_id} is a collection with {len(descendants)} descendants"
+                )
 
-            # Step 7: Clear MQTT retained message
-            if self.broadcaster:
-                try:
-                    self.broadcaster.clear_entity_status(entity_id)
-                    logger.debug(f"Cleared MQTT message for entity {entity_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to clear MQTT message for entity {entity_id}: {e}")
+                # Soft-delete descendants first (for version history)
+                now = self._now_timestamp()
+                for descendant in descendants:
+                    if not descendant.is_deleted:
+                        logger.info(
+                            f"Soft-deleting descendant {descendant.id} before hard delete "
+                            f"(DEL-06 requirement)"
+                        )
+                        descendant.is_deleted = True
+                        descendant.updated_date = now
+                self.db.flush()  # Ensure soft-deletes are persisted
 
-            # Step 8: (Optional) Verify intelligence data cleanup (handled by cascade)
-            # No manual action needed as FK has ON DELETE CASCADE
+            # Step 3: Clean up and delete each entity, children before parents
+            for target in [*descendants, entity]:
+                self._delete_entity_resources(target)
+                # Intelligence and closure rows go with the entity (ON DELETE CASCADE)
+                self.db.delete(target)
+                self.db.flush()  # Keep the parent_id foreign key satisfied
 
-            # Step 9: Delete entity from database
-            self.db.delete(entity)
             self.db.commit()
-            logger.info(f"Successfully hard-deleted entity {entity_id}")
+            logger.info(
+                f"Successfully hard-deleted entity {entity_id}"
+                + (f" and {len(descendants)} descendants" if descendants else "")
+            )
             return True
 
         except EntityNotSoftDeletedError:
@@ -1136,4 +1900,56 @@ class EntityService:
             logger.error(f"Failed to delete entity {entity_id}: {e}")
             raise
 
+    def _delete_entity_resources(self, entity: Entity) -> None:
+        """Delete faces, embeddings, files and retained MQTT messages of one entity."""
+        entity_id = entity.id
+
+        # Delete all faces for this entity (DB + Vector + Files)
+        face_service = self.get_face_service()
+        if face_service:
+            face_count = face_service.delete_faces_for_entity(entity_id)
+            logger.debug(f"Deleted {face_count} faces for entity {entity_id}")
+        else:
+            logger.warning("FaceService not available, skipping face deletion")
+
+        # Delete CLIP embeddings from vector store
+        if self.clip_store:
+            try:
+                self.clip_store.delete_vector(entity_id)
+                logger.debug(f"Deleted CLIP embedding for entity {entity_id}")
+            except Exception as e:
+                logger.warning(f"Failed to delete CLIP embedding for entity {entity_id}: {e}")
+
+        # Delete DINO embeddings from vector store
+        if self.dino_store:
+            try:
+                self.dino_store.delete_vector(entity_id)
+                logger.debug(f"Deleted DINO embedding for entity {entity_id}")
+            except Exception as e:
+                logger.warning(f"Failed to delete DINO embedding for entity {entity_id}: {e}")
+
+        # Delete entity file from storage
+        if entity.file_path:
+            try:
+                deleted = self.file_storage.delete_file(entity.file_path)
+                
+                # Also delete thumbnail
+                abs_file_path = self.file_storage.get_absolute_path(entity.file_path)
+                ThumbnailGenerator.delete(str(abs_file_path))
+
+                if deleted:
+                    logger.debug(f"Deleted entity file: {entity.file_path}")
+                else:
+                    logger.warning(f"Entity file not found: {entity.file_path}")
+            except Exception as e:
+                logger.warning(f"Failed to delete entity file {entity.file_path}: {e}")
+
+        # Clear MQTT retained message
+        if self.broadcaster:
+            try:
+                self.broadcaster.clear_entity_status(entity_id)
+                logger.debug(f"Cleared MQTT message for entity {entity_id}")
+            except Exception as e:
+                logger.warning(f"Failed to clear MQTT message for entity {entity_id}: {e}")
+
 
@@ -1,5 +1,6 @@
 """CoLAN Store Server."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import cast
 
@@ -9,16 +10,35 @@ from fastapi.responses import JSONResponse
 from loguru import logger
 from sqlalchemy.orm import configure_mappers
 
+from store.db_service.write_queue import shutdown_write_queue
 from store.m_insight.routes import router as intelligence_router
 
+from ..broadcast_service.broadcaster import MInsightBroadcaster
+from .compute_session import ComputeSession
 from .config import StoreConfig
+from .exiftool_pool import ExifToolPool
+from .ingest import IngestExecutor
+from .media_metadata import MediaMetadataExtractor
+from .thumbnail_queue import ThumbnailQueue
+from .upload_sessions import UploadSessionManager
 from store.broadcast_service.monitor import MInsightMonitor
 from .routes import router
+from ..common.storage import StorageService
 
 # Configure mappers after all models are imported (required for versioning)
 configure_mappers()
 
 
+async def _collect_upload_garbage(manager: UploadSessionManager, interval: float) -> None:
+    """Periodically remove abandoned resumable upload sessions."""
+    while True:
+        try:
+            _ = await asyncio.to_thread(manager.collect_garbage)
+        except Exception as e:
+            logger.warning(f"Upload session cleanup failed: {e}")
+        await asyncio.sleep(interval)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -39,6 +59,49 @@ async def lifespan(app: FastAPI):
     else:
         raise Exception("MQTT Broadcaster not initialized")
 
+    # Persistent ExifTool processes shared by all uploads
+    app.state.exiftool_pool = ExifToolPool(
+        size=config.exiftool_workers, timeout=config.exiftool_timeout
+    )
+
+    # Worker pools that keep blocking ingest work off the event loop
+    app.state.ingest_executor = IngestExecutor(
+        cpu_workers=config.ingest_cpu_workers,
+        io_workers=config.ingest_io_workers,
+        queue_size=config.ingest_queue_size,
+    )
+
+    # Thumbnails are generated after the upload commits, off the request path
+    app.state.thumbnail_queue = ThumbnailQueue(
+        workers=config.thumbnail_workers,
+        executor=app.state.ingest_executor,
+        settings=config.preview_settings(),
+    )
+
+    # Stateless collaborators shared by every request; only the DB session
+    # is bound per request
+    app.state.storage_service = StorageService(base_dir=str(config.media_storage_dir))
+    app.state.metadata_extractor = MediaMetadataExtractor(
+        exiftool_pool=app.state.exiftool_pool, executor=app.state.ingest_executor
+    )
+
+    # Resumable upload sessions, swept for abandoned uploads in the background
+    upload_sessions = UploadSessionManager(
+        app.state.storage_service,
+        ttl_seconds=config.upload_session_ttl,
+    )
+    app.state.upload_sessions = upload_sessions
+    upload_gc_task = asyncio.create_task(
+        _collect_upload_garbage(upload_sessions, config.upload_gc_interval)
+    )
+
+    # One compute login for the process, established when HLS first needs it
+    app.state.compute_session = ComputeSession(
+        config,
+        broadcaster=cast(MInsightBroadcaster | None, app.state.broadcaster),
+        refresh_interval=config.compute_session_refresh,
+    )
+
     # Initialize MInsight Monitor
     monitor = MInsightMonitor(config)
     monitor.start()
@@ -55,6 +118,28 @@ async def lifespan(app: FastAPI):
         if monitor:
             monitor.stop()
 
+        _ = upload_gc_task.cancel()
+
+        compute_session = cast(ComputeSession | None, getattr(app.state, "compute_session", None))
+        if compute_session:
+            await compute_session.close()
+
+        # Drain thumbnails before the process pool they run on goes away
+        thumbnail_queue = cast(ThumbnailQueue | None, getattr(app.state, "thumbnail_queue", None))
+        if thumbnail_queue:
+            thumbnail_queue.shutdown()
+
+        ingest_executor = cast(IngestExecutor | None, getattr(app.state, "ingest_executor", None))
+        if ingest_executor:
+            ingest_executor.shutdown()
+
+        # After the thumbnail queue, whose last status updates go through it
+        shutdown_write_queue()
+
+        exiftool_pool = cast(ExifToolPool | None, getattr(app.state, "exiftool_pool", None))
+        if exiftool_pool:
+            exiftool_pool.close()
+
         broadcaster = cast(BroadcasterBase, getattr(app.state, "broadcaster", None))
         if broadcaster and hasattr(broadcaster, "disconnect"):
             broadcaster.disconnect()
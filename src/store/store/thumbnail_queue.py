@@ -0,0 +1,177 @@
+"""Background thumbnail generation.
+
+Uploads only hash, extract metadata and commit; the preview is generated
+afterwards by a small pool of worker threads. Each entity carries a
+``preview_status`` ("pending", "ready" or "failed") that the workers update
+once the thumbnail is written, and readers can wait briefly for a pending
+preview instead of polling.
+
+preview_status updates create no entity version, so this module also counts
+them; the count feeds the ETags of entity listings.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Literal
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from store.db_service.db_internals import Entity
+from store.db_service.write_queue import get_write_queue
+
+from .media_thumbnail import PreviewSettings, ThumbnailGenerator
+
+if TYPE_CHECKING:
+    from .ingest import IngestExecutor
+
+PreviewStatus = Literal["pending", "ready", "failed"]
+
+# Unique per process, so counts from before a restart are never reused
+_preview_epoch = time.time_ns()
+_preview_changes = 0
+_preview_lock = threading.Lock()
+
+
+def note_preview_change() -> None:
+    """Record a committed preview_status update."""
+    global _preview_changes
+    with _preview_lock:
+        _preview_changes += 1
+
+
+def preview_generation() -> str:
+    """Token that changes whenever a preview_status update is committed."""
+    return f"{_preview_epoch:x}.{_preview_changes}"
+
+
+def supports_preview(mime_type: str | None) -> bool:
+    """Return True if a thumbnail can be generated for the MIME type."""
+    return bool(mime_type) and (
+        mime_type.startswith("image/") or mime_type.startswith("video/")
+    )
+
+
+class ThumbnailJob(BaseModel):
+    """A queued thumbnail request."""
+
+    entity_id: int
+    file_path: str  # relative storage path, guards against a replaced file
+    abs_file_path: str
+    mime_type: str
+
+
+class ThumbnailQueue:
+    """Work queue that generates thumbnails off the upload path."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        executor: IngestExecutor | None = None,
+        settings: PreviewSettings | None = None,
+    ):
+        """Start the worker threads.
+
+        Args:
+            workers: Number of concurrent thumbnail jobs
+            executor: Ingest executor whose process pool decodes the media;
+                without one, generation runs in the worker thread
+            settings: Preview renditions generated with each thumbnail
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.executor: IngestExecutor | None = executor
+        self.settings: PreviewSettings | None = settings
+        self._jobs: queue.Queue[ThumbnailJob | None] = queue.Queue()
+        self._pending: set[str] = set()
+        self._done: threading.Condition = threading.Condition()
+        self._threads: list[threading.Thread] = [
+            threading.Thread(target=self._worker, name=f"thumbnail-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Thumbnail queue started (workers={workers})")
+
+    def submit(self, entity_id: int, file_path: str, abs_file_path: str, mime_type: str) -> None:
+        """Queue a thumbnail; a file already queued is not queued twice."""
+        with self._done:
+            if abs_file_path in self._pending:
+                return
+            self._pending.add(abs_file_path)
+        self._jobs.put(
+            ThumbnailJob(
+                entity_id=entity_id,
+                file_path=file_path,
+                abs_file_path=abs_file_path,
+                mime_type=mime_type,
+            )
+        )
+
+    def is_pending(self, abs_file_path: str) -> bool:
+        """Return True while a thumbnail for the file is queued or running."""
+        with self._done:
+            return abs_file_path in self._pending
+
+    def wait(self, abs_file_path: str, timeout: float) -> bool:
+        """Block until the file's thumbnail job has finished.
+
+        Returns:
+            True if no job is pending for the file (any more), False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._done:
+            while abs_file_path in self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                _ = self._done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the workers after the jobs already queued."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _worker(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                self._process(job)
+            except Exception as e:
+                logger.error(f"Thumbnail job for entity {job.entity_id} failed: {e}")
+            finally:
+                with self._done:
+                    self._pending.discard(job.abs_file_path)
+                    self._done.notify_all()
+
+    def _process(self, job: ThumbnailJob) -> None:
+        if self.executor is not None:
+            result = self.executor.run_cpu(
+                ThumbnailGenerator.generate, job.abs_file_path, job.mime_type, self.settings
+            )
+        else:
+            result = ThumbnailGenerator.generate(job.abs_file_path, job.mime_type, self.settings)
+        self._set_status(job, "ready" if result else "failed")
+
+    @staticmethod
+    def _set_status(job: ThumbnailJob, preview_status: PreviewStatus) -> None:
+        # Bulk UPDATE: preview_status is not versioned, so this creates no entity version
+        def apply(session: Session) -> None:
+            _ = session.execute(
+                update(Entity)
+                .where(Entity.id == job.entity_id, Entity.file_path == job.file_path)
+                .values(preview_status=preview_status)
+            )
+
+        get_write_queue().run(apply)
+        note_preview_change()
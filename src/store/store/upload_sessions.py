@@ -0,0 +1,252 @@
+"""Resumable chunked upload sessions.
+
+A session is a directory in the storage staging area holding the session
+description (``session.json``) and the bytes received so far (``data``).
+Clients append chunks at the current offset, can query the offset after a
+dropped connection, and finalize the session to feed the assembled file into
+the normal entity-creation pipeline. Sessions not touched within the TTL are
+garbage-collected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import time
+import uuid
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from ..common.storage import StagedFile, StorageService
+
+SESSION_FILE = "session.json"
+DATA_FILE = "data"
+
+
+class UploadSessionNotFoundError(Exception):
+    """Raised when an upload session does not exist (or belongs to another user)."""
+
+
+class UploadOffsetMismatchError(Exception):
+    """Raised when a chunk does not start at the session's current offset."""
+
+    def __init__(self, expected: int, received: int):
+        super().__init__(f"Chunk offset {received} does not match upload offset {expected}")
+        self.expected: int = expected
+        self.received: int = received
+
+
+class UploadIncompleteError(Exception):
+    """Raised when finalizing a session that has not received all declared bytes."""
+
+
+class UploadSession(BaseModel):
+    """Persisted description of an upload session."""
+
+    upload_id: str
+    filename: str
+    size: int | None = Field(None, description="Declared total size in bytes, if known")
+    label: str | None = None
+    description: str | None = None
+    parent_id: int | None = None
+    user_id: str | None = None
+    created_at: int = Field(..., description="Creation timestamp (milliseconds)")
+
+
+class UploadSessionStatus(BaseModel):
+    """Response schema describing an upload session's progress."""
+
+    upload_id: str = Field(..., description="Upload session ID")
+    filename: str = Field(..., description="Original filename")
+    offset: int = Field(..., description="Number of bytes received so far")
+    size: int | None = Field(None, description="Declared total size in bytes, if known")
+    expires_at: int = Field(..., description="Expiry if no further chunks arrive (milliseconds)")
+
+
+class UploadSessionManager:
+    """Creates, appends to, finalizes and garbage-collects upload sessions."""
+
+    def __init__(self, storage: StorageService, ttl_seconds: float = 24 * 3600):
+        """Initialize the manager.
+
+        Args:
+            storage: Storage service (sessions live under its staging area)
+            ttl_seconds: Idle time after which a session is garbage-collected
+        """
+        self.storage: StorageService = storage
+        self.ttl_seconds: float = ttl_seconds
+        self.sessions_dir: Path = storage.staging_dir / "sessions"
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        # One writer per session at a time
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def create(
+        self,
+        filename: str,
+        size: int | None = None,
+        label: str | None = None,
+        description: str | None = None,
+        parent_id: int | None = None,
+        user_id: str | None = None,
+    ) -> UploadSessionStatus:
+        """Create a new, empty upload session.
+
+        Args:
+            filename: Original filename
+            size: Declared total size in bytes (optional)
+            label: Label for the entity created on finalize
+            description: Description for the entity created on finalize
+            parent_id: Parent for the entity created on finalize
+            user_id: Owner of the session
+
+        Returns:
+            Status of the new session
+        """
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            filename=Path(filename).name or "file",
+            size=size,
+            label=label,
+            description=description,
+            parent_id=parent_id,
+            user_id=user_id,
+            created_at=int(time.time() * 1000),
+        )
+        session_dir = self.sessions_dir / session.upload_id
+        session_dir.mkdir()
+        (session_dir / DATA_FILE).touch()
+        _ = (session_dir / SESSION_FILE).write_text(session.model_dump_json())
+        logger.info(f"Created upload session {session.upload_id} for {session.filename}")
+        return self._status(session)
+
+    def get(self, upload_id: str, user_id: str | None = None) -> UploadSession:
+        """Load a session, checking ownership.
+
+        Raises:
+            UploadSessionNotFoundError: If missing or owned by another user
+        """
+        session_file = self._session_dir(upload_id) / SESSION_FILE
+        try:
+            session = UploadSession.model_validate_json(session_file.read_text())
+        except (FileNotFoundError, ValueError) as e:
+            raise UploadSessionNotFoundError(f"Upload session {upload_id} not found") from e
+        if session.user_id != user_id:
+            raise UploadSessionNotFoundError(f"Upload session {upload_id} not found")
+        return session
+
+    def status(self, upload_id: str, user_id: str | None = None) -> UploadSessionStatus:
+        """Return the current offset and expiry of a session."""
+        return self._status(self.get(upload_id, user_id))
+
+    async def append(
+        self,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        user_id: str | None = None,
+    ) -> UploadSessionStatus:
+        """Append a chunk stream at the given offset.
+
+        Bytes are written as they arrive, so a dropped connection keeps
+        everything received so far and the client resumes from the new offset.
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadOffsetMismatchError: If offset is not the current end of data
+        """
+        async with self.lock(upload_id, user_id):
+            # Re-read under the lock: a concurrent finalize may have consumed it
+            session = self.get(upload_id, user_id)
+            data_path = self._session_dir(upload_id) / DATA_FILE
+            current = data_path.stat().st_size
+            if offset != current:
+                raise UploadOffsetMismatchError(expected=current, received=offset)
+            with open(data_path, "ab") as f:
+                async for chunk in chunks:
+                    if session.size is not None and f.tell() + len(chunk) > session.size:
+                        raise ValueError(f"Upload exceeds declared size of {session.size} bytes")
+                    _ = f.write(chunk)
+        return self._status(session)
+
+    def lock(self, upload_id: str, user_id: str | None = None) -> asyncio.Lock:
+        """Return the lock serializing writers and finalize for a session.
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+        """
+        _ = self.get(upload_id, user_id)
+        return self._locks.setdefault(upload_id, asyncio.Lock())
+
+    def has_data(self, upload_id: str) -> bool:
+        """Whether the session still holds its data file (not yet moved into storage)."""
+        return (self._session_dir(upload_id) / DATA_FILE).exists()
+
+    def stage(self, upload_id: str, user_id: str | None = None) -> tuple[UploadSession, StagedFile]:
+        """Describe the assembled file for the entity-creation pipeline.
+
+        Callers hold ``lock(upload_id)`` so no chunk is appended while the
+        file is hashed and ingested.
+
+        Raises:
+            UploadSessionNotFoundError: If the session does not exist
+            UploadIncompleteError: If fewer bytes than the declared size arrived
+        """
+        session = self.get(upload_id, user_id)
+        data_path = self._session_dir(upload_id) / DATA_FILE
+        received = data_path.stat().st_size
+        if session.size is not None and received != session.size:
+            raise UploadIncompleteError(
+                f"Upload incomplete: received {received} of {session.size} bytes"
+            )
+        staged = StagedFile.from_path(data_path).model_copy(
+            update={"original_filename": session.filename}
+        )
+        return session, staged
+
+    def discard(self, upload_id: str) -> None:
+        """Remove a session and any data it still holds."""
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+        _ = self._locks.pop(upload_id, None)
+
+    def collect_garbage(self) -> int:
+        """Remove sessions idle for longer than the TTL.
+
+        Returns:
+            Number of sessions removed
+        """
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for session_dir in self.sessions_dir.iterdir():
+            lock = self._locks.get(session_dir.name)
+            if lock is not None and lock.locked():
+                continue
+            try:
+                last_activity = max(p.stat().st_mtime for p in session_dir.iterdir())
+            except (ValueError, OSError):
+                last_activity = 0.0
+            if last_activity < cutoff:
+                self.discard(session_dir.name)
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} abandoned upload session(s)")
+        return removed
+
+    def _session_dir(self, upload_id: str) -> Path:
+        # upload_id comes from the URL; only accept IDs we could have generated
+        if not upload_id.isalnum():
+            raise UploadSessionNotFoundError(f"Upload session {upload_id} not found")
+        return self.sessions_dir / upload_id
+
+    def _status(self, session: UploadSession) -> UploadSessionStatus:
+        data_path = self._session_dir(session.upload_id) / DATA_FILE
+        stat = data_path.stat()
+        return UploadSessionStatus(
+            upload_id=session.upload_id,
+            filename=session.filename,
+            offset=stat.st_size,
+            size=session.size,
+            expires_at=int((max(stat.st_mtime, session.created_at / 1000) + self.ttl_seconds) * 1000),
+        )
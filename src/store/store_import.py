@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""CLI entry point for offline bulk import into the store.
+
+Imports media straight into storage and the database, bypassing HTTP:
+- Walks a directory tree or reads a manifest (one path per line)
+- Extracts metadata in a process pool (one persistent ExifTool per worker)
+- Dedupes against all existing md5s, preloaded once into a set
+- Copies, hard-links or moves files into storage
+- Inserts entities in large batched transactions
+- Records completed files in a checkpoint so an interrupted run can resume
+
+The store server may keep running; SQLite WAL mode allows the importer to
+write alongside it.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TextIO, cast
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import configure_mappers
+
+from .common import utils
+from .common.storage import ImportMode, StagedFile, StorageService
+from .db_service.db_internals import (
+    Entity,
+    database,
+    versioning,  # CRITICAL: Import versioning before database or models  # pyright: ignore[reportUnusedImport]  # noqa: F401
+)
+from .store.exiftool_pool import ExifToolPool
+from .store.media_metadata import MediaIdentity, MediaMetadata, MediaMetadataExtractor
+from .store.media_thumbnail import ThumbnailGenerator
+from .store.service import EntityService
+
+# A file placed into storage, waiting for its entity insert
+Placed = tuple[Path, str, MediaMetadata]
+
+# Per-process state, created by _init_worker
+_extractor: MediaMetadataExtractor | None = None
+_known_md5s: frozenset[str] = frozenset()
+
+
+def _init_worker(exiftool_timeout: float, known_md5s: frozenset[str]) -> None:
+    """Process pool initializer: one persistent ExifTool process per worker."""
+    global _extractor, _known_md5s
+    _extractor = MediaMetadataExtractor(exiftool_pool=ExifToolPool(size=1, timeout=exiftool_timeout))
+    _known_md5s = known_md5s
+
+
+def _extract(path: str) -> MediaMetadata | MediaIdentity | str:
+    """Extract metadata for one file (runs in a worker process).
+
+    Returns:
+        MediaMetadata; only the MediaIdentity if the hash matches a file already
+        in the store (ExifTool is skipped); or an error message
+    """
+    if _extractor is None:
+        return "worker not initialized"
+    try:
+        staged = StagedFile.from_path(Path(path))
+        identity = _extractor.identify_file(staged)
+        if identity.md5 in _known_md5s:
+            return identity
+        return _extractor.extract_metadata_from_file(staged, identity)
+    except Exception as e:
+        return str(e)
+
+
+def iter_sources(source: Path | None, manifest: Path | None) -> Iterator[Path]:
+    """Yield files to import from a directory tree or a manifest, in stable order."""
+    if manifest is not None:
+        with open(manifest) as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield Path(line).absolute()
+    if source is not None:
+        for path in sorted(source.rglob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                yield path.absolute()
+
+
+class Checkpoint:
+    """Append-only record of source paths already imported (or skipped)."""
+
+    def __init__(self, path: Path, resume: bool) -> None:
+        self.path: Path = path
+        self.done: set[str] = set()
+        if resume and path.exists():
+            self.done = {line.rstrip("\n") for line in path.read_text().splitlines() if line}
+        elif path.exists():
+            path.unlink()
+        self._file: TextIO = open(path, "a")
+
+    def record(self, paths: list[str]) -> None:
+        """Durably record a committed batch."""
+        if not paths:
+            return
+        _ = self._file.write("".join(f"{p}\n" for p in paths))
+        self._file.flush()
+        self.done.update(paths)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Progress:
+    """Single-line files/sec progress report on stderr."""
+
+    def __init__(self, total: int) -> None:
+        self.total: int = total
+        self.processed: int = 0
+        self.created: int = 0
+        self.duplicates: int = 0
+        self.errors: int = 0
+        self._start: float = time.monotonic()
+        self._last: float = 0.0
+
+    def show(self, final: bool = False) -> None:
+        now = time.monotonic()
+        if not final and now - self._last < 0.5:
+            return
+        self._last = now
+        rate = self.processed / max(now - self._start, 1e-9)
+        line = (
+            f"\r{self.processed}/{self.total} files  {rate:.1f} files/sec  "
+            + f"created={self.created} duplicates={self.duplicates} errors={self.errors}"
+        )
+        print(line, end="\n" if final else "", file=sys.stderr, flush=True)
+
+
+class Importer:
+    """Places files into storage and inserts entities batch by batch."""
+
+    def __init__(
+        self,
+        storage: StorageService,
+        mode: ImportMode,
+        parent_id: int | None,
+        user_id: str | None,
+        progress: Progress,
+    ) -> None:
+        self.storage: StorageService = storage
+        self.mode: ImportMode = mode
+        self.parent_id: int | None = parent_id
+        self.user_id: str | None = user_id
+        self.progress: Progress = progress
+        self.known_md5s: set[str] = set()
+
+    def preload_md5s(self) -> None:
+        """Load every existing md5 once so dedupe never queries per file.
+
+        Soft-deleted entities are included: md5 is unique across all rows.
+        """
+        with database.SessionLocal() as session:
+            rows = session.execute(select(Entity.md5).where(Entity.md5.isnot(None))).scalars()
+            self.known_md5s = {md5 for md5 in rows if md5}
+        logger.info(f"Preloaded {len(self.known_md5s)} existing md5s")
+
+    def import_batch(
+        self,
+        paths: list[str],
+        results: list[MediaMetadata | MediaIdentity | str],
+        pool: ProcessPoolExecutor,
+    ) -> None:
+        """Store and insert one batch; returns once the batch is committed."""
+        now = int(time.time() * 1000)
+        placed: list[Placed] = []
+        batch_md5s: list[str] = []
+
+        for path, meta in zip(paths, results):
+            self.progress.processed += 1
+            if isinstance(meta, str):
+                self.progress.errors += 1
+                logger.warning(f"Skipping {path}: {meta}")
+                continue
+            if isinstance(meta, MediaIdentity) or meta.md5 in self.known_md5s:
+                self.progress.duplicates += 1
+                continue
+            source = Path(path)
+            try:
+                file_path = self.storage.import_file(source, meta.model_dump(), self.mode)
+            except OSError as e:
+                self.progress.errors += 1
+                logger.warning(f"Failed to store {path}: {e}")
+                continue
+            self.known_md5s.add(meta.md5)
+            batch_md5s.append(meta.md5)
+            placed.append((source, file_path, meta))
+            # Thumbnails are best-effort; the pool drains them before exit
+            _ = pool.submit(
+                ThumbnailGenerator.generate,
+                str(self.storage.get_absolute_path(file_path)),
+                meta.mime_type,
+            )
+
+        try:
+            self.progress.created += self._commit(placed, now)
+        except Exception:
+            self.known_md5s.difference_update(batch_md5s)
+            raise
+
+    def _commit(self, placed: list[Placed], now: int) -> int:
+        """Insert a batch in one transaction, or file by file after a unique conflict.
+
+        Files that cannot be inserted are removed from storage again; a
+        conflicting file is counted as an error, anything else is raised.
+
+        Returns:
+            Number of entities inserted
+        """
+        if not placed:
+            return 0
+        try:
+            self._insert(placed, now)
+            return len(placed)
+        except IntegrityError:
+            logger.warning("Batch hit a unique constraint, inserting its files one by one")
+        except Exception:
+            self._rollback_placed(placed)
+            raise
+
+        inserted = 0
+        for index, item in enumerate(placed):
+            try:
+                self._insert([item], now)
+            except IntegrityError as e:
+                self.progress.errors += 1
+                logger.warning(f"Skipping {item[0]}: {e.orig}")
+                self._rollback_placed([item])
+            except Exception:
+                self._rollback_placed(placed[index:])
+                raise
+            else:
+                inserted += 1
+        return inserted
+
+    def _insert(self, placed: list[Placed], now: int) -> None:
+        """Insert entities in one transaction, retrying while the database is locked."""
+        delay = 0.5
+        for attempt in range(5):
+            with database.SessionLocal() as session:
+                try:
+                    session.add_all(
+                        EntityService.build_entity(
+                            is_collection=False,
+                            label=None,
+                            description=None,
+                            parent_id=self.parent_id,
+                            media_meta=meta,
+                            file_path=file_path,
+                            user_id=self.user_id,
+                            now=now,
+                        )
+                        for _, file_path, meta in placed
+                    )
+                    session.commit()
+                    return
+                except OperationalError as e:
+                    session.rollback()
+                    if "database is locked" not in str(e).lower() or attempt == 4:
+                        raise
+                    logger.warning(f"Database locked, retrying batch in {delay}s")
+            time.sleep(delay)
+            delay *= 2
+
+    def _rollback_placed(self, placed: list[Placed]) -> None:
+        """Undo file placement for files whose insert failed."""
+        for source, file_path, _ in placed:
+            abs_path = self.storage.get_absolute_path(file_path)
+            _ = ThumbnailGenerator.delete(str(abs_path))
+            if self.mode == "move":
+                _ = abs_path.replace(source)
+            else:
+                _ = self.storage.delete_file(file_path)
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="store-import", description="Bulk import media into the store")
+    _ = parser.add_argument("source", nargs="?", type=Path, help="Directory tree to import")
+    _ = parser.add_argument(
+        "--manifest", "-m", type=Path, default=None, help="File listing paths to import, one per line"
+    )
+    _ = parser.add_argument(
+        "--mode",
+        choices=["copy", "hardlink", "move"],
+        default="copy",
+        help="How files are placed into storage (default: copy)",
+    )
+    _ = parser.add_argument(
+        "--parent-id", type=int, default=None, help="Collection to import into"
+    )
+    _ = parser.add_argument(
+        "--user-id", default=None, help="Recorded as added_by/updated_by on imported entities"
+    )
+    _ = parser.add_argument(
+        "--workers", "-w", type=int, default=4, help="Extraction processes (default: 4)"
+    )
+    _ = parser.add_argument(
+        "--batch-size", "-b", type=int, default=500, help="Entities per transaction (default: 500)"
+    )
+    _ = parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file (default: $CL_SERVER_DIR/store-import.checkpoint)",
+    )
+    _ = parser.add_argument(
+        "--no-resume", action="store_true", help="Ignore and reset an existing checkpoint"
+    )
+    _ = parser.add_argument(
+        "--exiftool-timeout",
+        type=float,
+        default=30.0,
+        help="Per-file ExifTool timeout in seconds (default: 30)",
+    )
+    args = parser.parse_args()
+
+    source = cast(Path | None, args.source)
+    manifest = cast(Path | None, args.manifest)
+    if source is None and manifest is None:
+        parser.error("either a source directory or --manifest is required")
+    if source is not None and not source.is_dir():
+        parser.error(f"not a directory: {source}")
+
+    batch_size = cast(int, args.batch_size)
+    workers = cast(int, args.workers)
+    mode = cast(ImportMode, args.mode)
+
+    cl_dir = utils.ensure_cl_server_dir(create_if_missing=True)
+    checkpoint_path = cast(Path | None, args.checkpoint) or cl_dir / "store-import.checkpoint"
+
+    database.init_db()
+    configure_mappers()
+
+    parent_id = cast(int | None, args.parent_id)
+    with database.SessionLocal() as session:
+        try:
+            EntityService.validate_parent(session, parent_id)
+        except ValueError as e:
+            parser.error(str(e))
+
+    checkpoint = Checkpoint(checkpoint_path, resume=not cast(bool, args.no_resume))
+    todo = [str(p) for p in iter_sources(source, manifest) if str(p) not in checkpoint.done]
+    if checkpoint.done:
+        print(f"Resuming: {len(checkpoint.done)} files already imported", file=sys.stderr)
+
+    progress = Progress(total=len(todo))
+    importer = Importer(
+        StorageService(base_dir=str(cl_dir / "media")),
+        mode=mode,
+        parent_id=parent_id,
+        user_id=cast(str | None, args.user_id),
+        progress=progress,
+    )
+    importer.preload_md5s()
+
+    batches = [todo[i : i + batch_size] for i in range(0, len(todo), batch_size)]
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(cast(float, args.exiftool_timeout), frozenset(importer.known_md5s)),
+        ) as pool:
+            # Keep the next batch extracting while the current one is stored and inserted
+            pending = [pool.submit(_extract, p) for p in batches[0]] if batches else []
+            for index, batch in enumerate(batches):
+                current = pending
+                if index + 1 < len(batches):
+                    pending = [pool.submit(_extract, p) for p in batches[index + 1]]
+                results: list[MediaMetadata | MediaIdentity | str] = []
+                for future in current:
+                    results.append(future.result())
+                    progress.show()
+                importer.import_batch(batch, results, pool)
+                checkpoint.record(batch)
+                progress.show()
+    except KeyboardInterrupt:
+        progress.show(final=True)
+        print("Interrupted; rerun the same command to resume", file=sys.stderr)
+        return 130
+    except Exception as e:
+        progress.show(final=True)
+        logger.error(f"Import failed: {e}")
+        return 1
+    finally:
+        checkpoint.close()
+
+    progress.show(final=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
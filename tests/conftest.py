@@ -2,7 +2,7 @@ import hashlib
 import random
 import shutil
 import sys
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -106,6 +106,10 @@ def cleanup_auth_cache():
             auth_module._public_key_cache = None
         if hasattr(auth_module, "_public_key_load_attempts"):
             auth_module._public_key_load_attempts = 0
+        if hasattr(auth_module, "_public_key_stamp"):
+            auth_module._public_key_stamp = None
+        if hasattr(auth_module, "_token_cache"):
+            auth_module._token_cache.clear()
     yield
     # Cleanup after test
     if "store.common.auth" in sys.modules:
@@ -114,6 +118,10 @@ def cleanup_auth_cache():
             auth_module._public_key_cache = None
         if hasattr(auth_module, "_public_key_load_attempts"):
             auth_module._public_key_load_attempts = 0
+        if hasattr(auth_module, "_public_key_stamp"):
+            auth_module._public_key_stamp = None
+        if hasattr(auth_module, "_token_cache"):
+            auth_module._token_cache.clear()
 
 
 # ============================================================================
@@ -206,10 +214,10 @@ def auth_service(integration_config: IntegrationConfig) -> str:
 def test_engine() -> Generator[Engine, None, None]:
     """Create a test database engine with versioning support.
 
-    Note: We manually create the engine here instead of using create_db_engine() because:
-    1. In-memory SQLite databases require StaticPool to share the same database across connections
-    2. create_db_engine() doesn't use StaticPool
-    3. Without StaticPool, each connection would get its own isolated in-memory database
+    Note: In-memory SQLite databases require StaticPool to share the same database across
+    connections (and threads, such as the write queue's writer); without it, each connection
+    would get its own isolated in-memory database. create_db_engine() does the same for
+    in-memory URLs; the engine is built by hand here to keep the test setup explicit.
 
     We still use the same enable_wal_mode event listener which detects in-memory databases
     and skips WAL mode while enabling foreign keys.
@@ -437,6 +445,23 @@ def client(
         pass
 
 
+@pytest.fixture
+def create_collection(client: TestClient) -> Callable[..., int]:
+    """Create a collection through the API and return its id."""
+
+    def create(label: str, parent_id: int | None = None, description: str | None = None) -> int:
+        data = {"is_collection": "true", "label": label}
+        if parent_id is not None:
+            data["parent_id"] = str(parent_id)
+        if description is not None:
+            data["description"] = description
+        response = client.post("/entities/", data=data)
+        assert response.status_code == 201
+        return response.json()["id"]
+
+    return create
+
+
 @pytest.fixture(scope="function")
 def auth_client(
     test_engine: Engine,
@@ -0,0 +1,128 @@
+"""Tests for the single-writer queue with group commit."""
+
+import threading
+from collections.abc import Callable, Generator
+
+import pytest
+from sqlalchemy import Engine, func, select
+from sqlalchemy.orm import Session
+
+from store.db_service.db_internals import Entity
+from store.db_service.write_queue import WriteQueue
+
+
+@pytest.fixture
+def write_queue() -> Generator[WriteQueue, None, None]:
+    queue = WriteQueue()
+    yield queue
+    queue.shutdown()
+
+
+def _insert(label: str, sessions: list[Session] | None = None) -> Callable[[Session], int]:
+    def insert(db: Session) -> int:
+        if sessions is not None:
+            sessions.append(db)
+        entity = Entity(is_collection=True, label=label, is_deleted=False)
+        db.add(entity)
+        db.flush()
+        return entity.id
+
+    return insert
+
+
+def _hold_writer(write_queue: WriteQueue, engine: Engine) -> threading.Event:
+    """Keep the writer busy until the returned event is set, so later writes queue up."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def block(db: Session) -> None:
+        started.set()
+        _ = release.wait(5)
+
+    _ = write_queue.submit(block, bind=engine)
+    assert started.wait(5)
+    return release
+
+
+def _labels(engine: Engine) -> list[str | None]:
+    with Session(engine) as db:
+        return list(db.scalars(select(Entity.label).order_by(Entity.id)))
+
+
+def test_queued_writes_commit_together(test_engine: Engine, write_queue: WriteQueue) -> None:
+    release = _hold_writer(write_queue, test_engine)
+    sessions: list[Session] = []
+    futures = [
+        write_queue.submit(_insert(f"e{i}", sessions), bind=test_engine) for i in range(5)
+    ]
+    release.set()
+
+    ids = [future.result(5) for future in futures]
+
+    assert len(set(ids)) == 5
+    assert len({id(session) for session in sessions}) == 1
+    assert _labels(test_engine) == [f"e{i}" for i in range(5)]
+
+
+def test_failed_write_does_not_fail_its_group(
+    test_engine: Engine, write_queue: WriteQueue
+) -> None:
+    def fail(db: Session) -> None:
+        _ = _insert("failed")(db)
+        raise ValueError("boom")
+
+    release = _hold_writer(write_queue, test_engine)
+    first = write_queue.submit(_insert("first"), bind=test_engine)
+    failed = write_queue.submit(fail, bind=test_engine)
+    last = write_queue.submit(_insert("last"), bind=test_engine)
+    release.set()
+
+    assert first.result(5) > 0
+    assert last.result(5) > 0
+    with pytest.raises(ValueError, match="boom"):
+        _ = failed.result(5)
+    assert _labels(test_engine) == ["first", "last"]
+
+
+def test_same_key_writes_commit_separately(
+    test_engine: Engine, write_queue: WriteQueue
+) -> None:
+    release = _hold_writer(write_queue, test_engine)
+    sessions: list[Session] = []
+    futures = [
+        write_queue.submit(_insert(f"e{i}", sessions), bind=test_engine, key=1) for i in range(3)
+    ]
+    release.set()
+
+    for future in futures:
+        _ = future.result(5)
+    assert len({id(session) for session in sessions}) == 3
+
+
+def test_concurrent_writers(test_engine: Engine, write_queue: WriteQueue) -> None:
+    errors: list[Exception] = []
+
+    def worker(n: int) -> None:
+        try:
+            for i in range(10):
+                _ = write_queue.run(_insert(f"w{n}-{i}"), bind=test_engine)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with Session(test_engine) as db:
+        assert db.scalar(select(func.count()).select_from(Entity)) == 80
+
+
+def test_submit_after_shutdown(test_engine: Engine) -> None:
+    queue = WriteQueue()
+    queue.shutdown()
+
+    with pytest.raises(RuntimeError):
+        _ = queue.submit(_insert("late"), bind=test_engine)
@@ -9,6 +9,7 @@ tests with a running authentication service are recommended.
 from __future__ import annotations
 
 import asyncio
+import os
 from unittest.mock import MagicMock
 
 import pytest
@@ -273,3 +274,85 @@ class TestJWTValidation:
             assert (
                 response.status_code == 401
             ), f"Token '{invalid_token[:20]}...' should be rejected but got {response.status_code}"
+
+
+class TestVerifiedTokenCache:
+    """Test that verified tokens are cached until exp or a key change."""
+
+    @pytest.fixture
+    def auth_setup(self, key_pair, jwt_token_generator, monkeypatch):
+        from pathlib import Path
+
+        from store.common import auth
+
+        config = MagicMock()
+        config.no_auth = False
+        config.public_key_path = Path(key_pair[1])
+
+        decodes: list[str] = []
+        real_decode = auth.jwt.decode
+
+        def counting_decode(token, *args, **kwargs):
+            decodes.append(token)
+            return real_decode(token, *args, **kwargs)
+
+        monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+        return auth, config, decodes, jwt_token_generator
+
+    def test_repeated_token_verified_once(self, auth_setup):
+        auth, config, decodes, tokens = auth_setup
+        token = tokens.generate_token(permissions=["media_store_read"])
+
+        first = asyncio.run(auth.get_current_user(token=token, config=config))
+        second = asyncio.run(auth.get_current_user(token=token, config=config))
+
+        assert first is not None and first.id == "testuser"
+        assert second == first
+        assert decodes == [token]
+
+    def test_expired_entry_is_verified_again(self, auth_setup):
+        auth, config, decodes, tokens = auth_setup
+        token = tokens.generate_token()
+        user = asyncio.run(auth.get_current_user(token=token, config=config))
+
+        # Pretend the token's exp has passed
+        auth._cache_user(token, user, expires_at=0)
+        _ = asyncio.run(auth.get_current_user(token=token, config=config))
+
+        assert decodes == [token, token]
+
+    def test_bounded_lru(self, auth_setup, monkeypatch):
+        auth, config, decodes, tokens = auth_setup
+        monkeypatch.setattr(auth, "_token_cache_size", 2)
+        a, b, c = (tokens.generate_token(sub=name) for name in ("a", "b", "c"))
+
+        for token in (a, b, a, c):
+            _ = asyncio.run(auth.get_current_user(token=token, config=config))
+        assert len(auth._token_cache) == 2
+
+        # b was least recently used and evicted; a is still cached
+        _ = asyncio.run(auth.get_current_user(token=a, config=config))
+        _ = asyncio.run(auth.get_current_user(token=b, config=config))
+        assert decodes == [a, b, c, b]
+
+    def test_key_rotation_invalidates_cache(self, auth_setup, monkeypatch):
+        auth, config, decodes, tokens = auth_setup
+        token = tokens.generate_token()
+        _ = asyncio.run(auth.get_current_user(token=token, config=config))
+
+        new_key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+        _ = config.public_key_path.write_bytes(
+            new_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        )
+        # Coarse filesystem timestamps could hide a rewrite this quick
+        later = config.public_key_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(config.public_key_path, ns=(later, later))
+        monkeypatch.setattr(auth, "_key_check_interval", 0.0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            _ = asyncio.run(auth.get_current_user(token=token, config=config))
+        assert exc_info.value.status_code == 401
+        assert decodes == [token, token]
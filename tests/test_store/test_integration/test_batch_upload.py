@@ -0,0 +1,129 @@
+"""
+Tests for the batch upload endpoint (POST /entities/batch).
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from store.db_service.schemas import BatchCreateResponse
+from store.store.media_metadata import MediaMetadataExtractor
+
+pytestmark = pytest.mark.integration
+
+
+def _post_batch(client: TestClient, paths: list[Path], parent_id: int | None = None):
+    handles = [open(p, "rb") for p in paths]
+    try:
+        files = [("files", (p.name, h, "image/jpeg")) for p, h in zip(paths, handles)]
+        data = {"parent_id": str(parent_id)} if parent_id is not None else {}
+        return client.post("/entities/batch", files=files, data=data)
+    finally:
+        for h in handles:
+            h.close()
+
+
+class TestBatchUpload:
+    """Test batch ingest results, dedupe and parent handling."""
+
+    def test_batch_creates_entities_in_order(
+        self, client: TestClient, sample_images: list[Path]
+    ) -> None:
+        images = sample_images[:3]
+        response = _post_batch(client, images)
+
+        assert response.status_code == 200
+        result = BatchCreateResponse.model_validate(response.json())
+        assert [item.filename for item in result.items] == [p.name for p in images]
+        assert result.created == len(images)
+        assert all(item.status == "created" and item.entity for item in result.items)
+
+        # Entities are retrievable individually
+        for item in result.items:
+            assert item.entity is not None
+            get_response = client.get(f"/entities/{item.entity.id}")
+            assert get_response.status_code == 200
+            assert get_response.json()["md5"] == item.entity.md5
+
+    def test_batch_reports_duplicates(
+        self, client: TestClient, sample_images: list[Path]
+    ) -> None:
+        first, second = sample_images[0], sample_images[1]
+        with open(first, "rb") as f:
+            existing = client.post(
+                "/entities/",
+                files={"image": (first.name, f, "image/jpeg")},
+                data={"is_collection": "false"},
+            ).json()
+
+        # Existing content, new content, and the new content repeated in the batch
+        response = _post_batch(client, [first, second, second])
+
+        assert response.status_code == 200
+        result = BatchCreateResponse.model_validate(response.json())
+        statuses = [item.status for item in result.items]
+        assert statuses == ["duplicate", "created", "duplicate"]
+        assert result.items[0].entity is not None
+        assert result.items[0].entity.id == existing["id"]
+        assert result.items[1].entity == result.items[2].entity
+        assert (result.created, result.duplicates, result.errors) == (1, 2, 0)
+
+    def test_batch_reports_soft_deleted_match_per_file(
+        self, client: TestClient, sample_images: list[Path]
+    ) -> None:
+        deleted, fresh = sample_images[0], sample_images[1]
+        with open(deleted, "rb") as f:
+            existing = client.post(
+                "/entities/",
+                files={"image": (deleted.name, f, "image/jpeg")},
+                data={"is_collection": "false"},
+            ).json()
+        patched = client.patch(f"/entities/{existing['id']}", data={"is_deleted": "true"})
+        assert patched.status_code == 200
+
+        response = _post_batch(client, [deleted, fresh])
+
+        assert response.status_code == 200
+        result = BatchCreateResponse.model_validate(response.json())
+        assert [item.status for item in result.items] == ["error", "created"]
+        assert result.items[0].error and "soft-deleted" in result.items[0].error
+        assert (result.created, result.duplicates, result.errors) == (1, 0, 1)
+
+    def test_batch_reports_failed_files(
+        self, client: TestClient, sample_images: list[Path]
+    ) -> None:
+        bad, good = sample_images[0], sample_images[1]
+        original = MediaMetadataExtractor.extract_metadata_from_file
+
+        def fail_for_bad(self, staged):
+            if staged.original_filename == bad.name:
+                raise ValueError("Failed to determine MIME type: corrupt")
+            return original(self, staged)
+
+        with patch.object(MediaMetadataExtractor, "extract_metadata_from_file", fail_for_bad):
+            response = _post_batch(client, [bad, good])
+
+        assert response.status_code == 200
+        result = BatchCreateResponse.model_validate(response.json())
+        assert result.items[0].status == "error"
+        assert result.items[0].error and "MIME" in result.items[0].error
+        assert result.items[1].status == "created"
+
+    def test_batch_with_parent(self, client: TestClient, sample_images: list[Path]) -> None:
+        collection = client.post(
+            "/entities/", data={"is_collection": "true", "label": "Batch Album"}
+        ).json()
+
+        response = _post_batch(client, sample_images[:2], parent_id=collection["id"])
+
+        assert response.status_code == 200
+        result = BatchCreateResponse.model_validate(response.json())
+        assert all(
+            item.entity and item.entity.parent_id == collection["id"] for item in result.items
+        )
+
+    def test_batch_with_missing_parent(self, client: TestClient, sample_image: Path) -> None:
+        response = _post_batch(client, [sample_image], parent_id=999999)
+        assert response.status_code == 422
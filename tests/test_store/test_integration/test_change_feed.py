@@ -0,0 +1,88 @@
+"""
+Tests for the GET /entities/changes NDJSON change feed.
+"""
+
+import json
+import time
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.integration
+
+
+def _feed(client: TestClient, **params: object) -> tuple[list[dict[str, object]], dict[str, object]]:
+    response = client.get("/entities/changes", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return lines[:-1], lines[-1]
+
+
+class TestChangeFeed:
+    """Test coalescing, resuming and long-polling."""
+
+    def test_empty_feed(self, client: TestClient) -> None:
+        changes, mark = _feed(client)
+        assert changes == []
+        assert mark == {"high_water_mark": 0, "has_more": False}
+
+    def test_coalesces_changes_per_entity(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        first = create_collection("First")
+        second = create_collection("Second")
+        _ = client.patch(f"/entities/{first}", data={"label": "First renamed"})
+
+        changes, mark = _feed(client)
+
+        # One line per entity, in the order of their latest change
+        assert [c["id"] for c in changes] == [second, first]
+        assert changes[1]["label"] == "First renamed"
+        assert mark["high_water_mark"] == changes[1]["transaction_id"]
+        assert mark["has_more"] is False
+
+    def test_resume_from_high_water_mark(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        entity_id = create_collection("Album")
+        _, mark = _feed(client)
+
+        _, nothing_new = _feed(client, since=mark["high_water_mark"])
+        assert nothing_new["high_water_mark"] == mark["high_water_mark"]
+
+        assert client.patch(f"/entities/{entity_id}", data={"is_deleted": "true"}).status_code == 200
+        assert client.delete(f"/entities/{entity_id}").status_code == 204
+
+        changes, _ = _feed(client, since=mark["high_water_mark"])
+        assert [(c["id"], c["operation_type"]) for c in changes] == [(entity_id, 2)]
+
+    def test_limit_pages_whole_transactions(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        ids = [create_collection(f"Album {i}") for i in range(3)]
+
+        seen: list[object] = []
+        since = 0
+        while True:
+            changes, mark = _feed(client, since=since, limit=2)
+            seen.extend(c["id"] for c in changes)
+            since = mark["high_water_mark"]
+            if not mark["has_more"]:
+                break
+
+        assert seen == ids
+
+    def test_long_poll_times_out(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        _ = create_collection("Album")
+        _, mark = _feed(client)
+
+        start = time.monotonic()
+        changes, after_wait = _feed(client, since=mark["high_water_mark"], wait=0.3)
+
+        assert time.monotonic() - start >= 0.3
+        assert changes == []
+        assert after_wait == mark
@@ -0,0 +1,144 @@
+"""Tests for the process-wide compute service session."""
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from store.store import compute_session as compute_session_module
+from store.store.compute_session import ComputeSession
+
+pytestmark = pytest.mark.integration
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeSessionManager:
+    logins: list["FakeSessionManager"] = []
+    fail_login = False
+
+    def __init__(self, server_pref: Any) -> None:
+        self.server_pref = server_pref
+        self.client = FakeClient()
+        self.closed = False
+
+    async def login(self, username: str, password: str) -> None:
+        if FakeSessionManager.fail_login:
+            raise ConnectionError("auth service unavailable")
+        FakeSessionManager.logins.append(self)
+
+    def create_compute_client(self) -> FakeClient:
+        return self.client
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_cl_client(monkeypatch: pytest.MonkeyPatch) -> type[FakeSessionManager]:
+    FakeSessionManager.logins = []
+    FakeSessionManager.fail_login = False
+    module = types.ModuleType("cl_client")
+    module.ServerPref = lambda **kwargs: kwargs  # type: ignore[attr-defined]
+    module.SessionManager = FakeSessionManager  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "cl_client", module)
+    monkeypatch.setattr(compute_session_module, "DBService", lambda: None)
+    return FakeSessionManager
+
+
+def _config(tmp_path: Path, configured: bool = True) -> Any:
+    return types.SimpleNamespace(
+        compute_url="http://compute" if configured else None,
+        compute_username="user",
+        compute_password="secret",
+        auth_url="http://auth",
+        mqtt_url="mqtt://localhost:1883",
+        media_storage_dir=tmp_path,
+    )
+
+
+@pytest.mark.asyncio
+async def test_logs_in_once(tmp_path: Path, fake_cl_client: type[FakeSessionManager]) -> None:
+    session = ComputeSession(_config(tmp_path))
+
+    first = await session.get_job_service()
+    second = await session.get_job_service()
+
+    assert first is not None
+    assert first is second
+    assert len(fake_cl_client.logins) == 1
+    await session.close()
+    assert fake_cl_client.logins[0].closed
+    assert fake_cl_client.logins[0].client.closed
+
+
+@pytest.mark.asyncio
+async def test_not_configured(tmp_path: Path, fake_cl_client: type[FakeSessionManager]) -> None:
+    session = ComputeSession(_config(tmp_path, configured=False))
+
+    assert await session.get_job_service() is None
+    assert fake_cl_client.logins == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_renews_login(
+    tmp_path: Path, fake_cl_client: type[FakeSessionManager]
+) -> None:
+    session = ComputeSession(_config(tmp_path), refresh_interval=0)
+
+    first = await session.get_job_service()
+    second = await session.get_job_service()
+
+    assert first is not second
+    assert len(fake_cl_client.logins) == 2
+    assert fake_cl_client.logins[0].closed
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_failure(
+    tmp_path: Path, fake_cl_client: type[FakeSessionManager]
+) -> None:
+    session = ComputeSession(_config(tmp_path))
+
+    fake_cl_client.fail_login = True
+    assert await session.get_job_service() is None
+
+    fake_cl_client.fail_login = False
+    first = await session.get_job_service()
+    assert first is not None
+
+    await session.reset()
+    assert fake_cl_client.logins[0].closed
+    assert await session.get_job_service() is not first
+    assert len(fake_cl_client.logins) == 2
+    await session.close()
+
+
+@pytest.mark.asyncio
+async def test_submission_lock_per_entity(tmp_path: Path) -> None:
+    session = ComputeSession(_config(tmp_path))
+    order: list[str] = []
+
+    async def submit(entity_id: int, name: str) -> None:
+        async with session.submission_lock(entity_id):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+    await asyncio.gather(submit(1, "a"), submit(1, "b"), submit(2, "c"))
+
+    # Same entity serialized, other entities not held up
+    assert order.index("a end") < order.index("b start")
+    assert order.index("c start") < order.index("a end")
+    # No lock outlives its submissions
+    assert session._submission_locks == {}
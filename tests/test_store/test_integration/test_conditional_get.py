@@ -0,0 +1,155 @@
+"""
+Tests for ETags and conditional GET (If-None-Match) on entity reads.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.integration
+
+
+def _upload(client: TestClient, sample_image: Path) -> dict[str, object]:
+    with open(sample_image, "rb") as f:
+        response = client.post(
+            "/entities/",
+            files={"image": (sample_image.name, f, "image/jpeg")},
+            data={"is_collection": "false"},
+        )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _revalidate(client: TestClient, url: str, etag: str, **params: object) -> int:
+    response = client.get(url, params=params, headers={"If-None-Match": etag})
+    if response.status_code == 304:
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    return response.status_code
+
+
+class TestEntityETag:
+    """Test conditional GET /entities/{id}."""
+
+    def test_not_modified_until_changed(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        entity_id = create_collection("Album")
+        response = client.get(f"/entities/{entity_id}")
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        assert response.headers["cache-control"] == "no-cache"
+
+        assert _revalidate(client, f"/entities/{entity_id}", etag) == 304
+
+        _ = client.patch(f"/entities/{entity_id}", data={"label": "Renamed"})
+        assert _revalidate(client, f"/entities/{entity_id}", etag) == 200
+
+    def test_child_changes_invalidate_parent(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        parent = create_collection("Parent")
+        other = create_collection("Other")
+        etag = client.get(f"/entities/{parent}").headers["etag"]
+
+        child = create_collection("Child", parent)
+        assert _revalidate(client, f"/entities/{parent}", etag) == 200  # children_count
+
+        etag = client.get(f"/entities/{parent}").headers["etag"]
+        _ = client.patch(f"/entities/{child}", data={"parent_id": str(other)})
+        assert _revalidate(client, f"/entities/{parent}", etag) == 200
+
+    def test_ancestor_delete_invalidates_descendant(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        root = create_collection("Root")
+        leaf = create_collection("Leaf", create_collection("Middle", root))
+        etag = client.get(f"/entities/{leaf}").headers["etag"]
+
+        _ = client.patch(f"/entities/{root}", data={"is_deleted": "true"})
+        response = client.get(f"/entities/{leaf}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["is_indirectly_deleted"] is True
+
+    def test_unrelated_change_keeps_etag(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        entity_id = create_collection("Album")
+        etag = client.get(f"/entities/{entity_id}").headers["etag"]
+
+        _ = create_collection("Unrelated")
+        assert _revalidate(client, f"/entities/{entity_id}", etag) == 304
+
+    def test_missing_entity(self, client: TestClient) -> None:
+        assert _revalidate(client, "/entities/999999", "*") == 404
+
+
+class TestListingETag:
+    """Test conditional GET /entities."""
+
+    def test_listing_not_modified_until_any_change(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        _ = create_collection("Album")
+        response = client.get("/entities/", params={"page_size": 5})
+        etag = response.headers["etag"]
+
+        assert _revalidate(client, "/entities/", etag, page_size=5) == 304
+        assert _revalidate(client, "/entities/", f'"other", {etag}', page_size=5) == 304
+
+        _ = create_collection("Another")
+        assert _revalidate(client, "/entities/", etag, page_size=5) == 200
+
+
+class TestFileETags:
+    """Test strong ETags and caching headers for media and previews."""
+
+    def test_media_etag_tracks_file_version(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        entity = _upload(client, sample_image)
+        url = f"/entities/{entity['id']}/media"
+
+        response = client.get(url)
+        etag = response.headers["etag"]
+        version = etag.strip('"')
+        assert not etag.startswith("W/")
+        assert response.headers["cache-control"] == "no-cache"
+        assert _revalidate(client, url, etag) == 304
+
+        pinned = client.get(url, params={"v": version})
+        assert pinned.headers["cache-control"] == "max-age=31536000, immutable"
+        # The md5 hashes pixels for images, so it no longer pins the bytes
+        unpinned = client.get(url, params={"v": entity["md5"]})
+        assert unpinned.headers["cache-control"] == "no-cache"
+
+    def test_media_etag_changes_on_update(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        entity = _upload(client, sample_image)
+        url = f"/entities/{entity['id']}/media"
+        etag = client.get(url).headers["etag"]
+
+        response = client.patch(f"/entities/{entity['id']}", data={"label": "Renamed"})
+        assert response.status_code == 200
+
+        assert _revalidate(client, url, etag) == 200
+        stale = client.get(url, params={"v": etag.strip('"')})
+        assert stale.headers["cache-control"] == "no-cache"
+
+    def test_preview_etag(self, client: TestClient, sample_image: Path) -> None:
+        entity = _upload(client, sample_image)
+        version = client.get(f"/entities/{entity['id']}/media").headers["etag"].strip('"')
+        url = f"/entities/{entity['id']}/preview"
+
+        response = client.get(url, params={"v": version})
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag == f'"{version}.tb.png"'
+        assert response.headers["cache-control"] == "max-age=31536000, immutable"
+
+        assert _revalidate(client, url, etag, v=version) == 304
+        # A different rendition has its own ETag
+        assert _revalidate(client, url, etag, size=128) == 200
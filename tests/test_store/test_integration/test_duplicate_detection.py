@@ -148,3 +148,31 @@ class TestDuplicateDetection:
         item2 = Item.model_validate(response2.json())
         assert item2.md5 == original_md5
         assert item2.label == "Updated"
+
+    def test_duplicate_skips_tool_extraction(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        """Test that a duplicate upload is detected from the hash alone (no ExifTool/ffprobe)."""
+        from unittest.mock import patch
+
+        from store.store.media_metadata import MediaMetadataExtractor
+
+        with open(sample_image, "rb") as f:
+            response1 = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false", "label": "First upload"},
+            )
+        assert response1.status_code == 201
+
+        with patch.object(MediaMetadataExtractor, "_extract_tool_metadata") as mock_tools:
+            with open(sample_image, "rb") as f:
+                response2 = client.post(
+                    "/entities/",
+                    files={"image": (sample_image.name, f, "image/jpeg")},
+                    data={"is_collection": "false", "label": "Duplicate upload"},
+                )
+
+        assert response2.status_code == 200
+        assert response2.json()["id"] == response1.json()["id"]
+        mock_tools.assert_not_called()
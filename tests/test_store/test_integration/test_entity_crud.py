@@ -2,9 +2,12 @@
 Tests for CRUD operations on entities.
 """
 
+from collections.abc import Callable
 from pathlib import Path
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
 from store.db_service.db_internals import Entity
@@ -329,6 +332,48 @@ class TestEntityCRUD:
         c_get = client.get(f"/entities/{c_id}")
         assert c_get.json()["is_indirectly_deleted"] is False
 
+    def test_listing_ancestor_check_is_constant_queries(
+        self, client: TestClient, test_engine: Engine
+    ) -> None:
+        """Listing a deep tree checks all ancestor chains without per-level queries."""
+        parent_id: int | None = None
+        chain: list[int] = []
+        for depth in range(5):
+            data = {"is_collection": "true", "label": f"Level {depth}"}
+            if parent_id is not None:
+                data["parent_id"] = str(parent_id)
+            parent_id = client.post("/entities/", data=data).json()["id"]
+            chain.append(parent_id)
+        for i in range(6):
+            _ = client.post(
+                "/entities/",
+                data={"is_collection": "true", "label": f"Leaf {i}", "parent_id": str(parent_id)},
+            )
+        _ = client.patch(f"/entities/{chain[0]}", data={"is_deleted": "true"})
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany) -> None:  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", record)
+        try:
+            small = client.get("/entities/", params={"page_size": 2, "parent_id": parent_id})
+            small_count = len(statements)
+            statements.clear()
+            full = client.get("/entities/", params={"page_size": 100})
+            full_count = len(statements)
+        finally:
+            event.remove(test_engine, "before_cursor_execute", record)
+
+        assert small.status_code == 200
+        assert full.status_code == 200
+        assert small_count == full_count
+        flags = {item["id"]: item["is_indirectly_deleted"] for item in full.json()["items"]}
+        assert flags[chain[0]] is False  # Directly deleted, not indirectly
+        assert all(flags[entity_id] for entity_id in chain[1:])
+        assert sum(flags.values()) == len(chain) - 1 + 6
+
     def test_delete_entity_hard_delete(
         self, client: TestClient, sample_image: Path
     ) -> None:
@@ -697,3 +742,60 @@ class TestEntityCRUD:
         # The unit tests or manual verification is better for this specific edge case.
         # I will rely on the implementation plan's "cleanup logic" being correct.
         pass
+
+
+class TestBatchLookup:
+    """Test POST /entities/lookup (fetch by IDs)."""
+
+    def test_returns_request_order_and_missing(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        _ = create_collection("Grandchild", child)
+
+        response = client.post("/entities/lookup", json={"ids": [child, 999999, root, child]})
+        assert response.status_code == 200
+        body = response.json()
+        assert [item["id"] for item in body["items"]] == [child, root]
+        assert body["missing"] == [999999]
+        assert body["items"][0]["children_count"] == 1
+        assert body["items"][1]["children_count"] == 1
+
+    def test_matches_single_entity_reads(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        leaf = create_collection("Leaf", child)
+        _ = client.patch(f"/entities/{root}", data={"is_deleted": "true"})
+
+        body = client.post("/entities/lookup", json={"ids": [root, child, leaf]}).json()
+        for item in body["items"]:
+            assert item == client.get(f"/entities/{item['id']}").json()
+        flags = [item["is_indirectly_deleted"] for item in body["items"]]
+        assert flags == [False, True, True]
+
+    def test_single_query(
+        self, client: TestClient, create_collection: Callable[..., int], test_engine: Engine
+    ) -> None:
+        ids = [create_collection(f"Album {i}") for i in range(5)]
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany) -> None:  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+            statements.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", record)
+        try:
+            response = client.post("/entities/lookup", json={"ids": ids})
+        finally:
+            event.remove(test_engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 5
+        assert len([s for s in statements if "FROM entities" in s]) == 1
+
+    def test_validation(self, client: TestClient) -> None:
+        assert client.post("/entities/lookup", json={"ids": []}).status_code == 422
+        too_many = list(range(1, 1002))
+        assert client.post("/entities/lookup", json={"ids": too_many}).status_code == 422
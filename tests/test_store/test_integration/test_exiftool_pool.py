@@ -0,0 +1,125 @@
+"""Tests for the persistent ExifTool process pool."""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from store.store.exiftool_pool import ExifToolError, ExifToolPool
+from store.store.media_metadata import IMAGE_DATE_TAGS, digest_image_file
+
+pytestmark = pytest.mark.integration
+
+# Minimal stand-in for `exiftool -stay_open True -@ -` speaking the argfile protocol.
+# Files named "hang*" never answer, files named "crash*" kill the process.
+FAKE_EXIFTOOL = """\
+import json, sys, time
+args = []
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if line.startswith("-execute"):
+        target = args[-1]
+        if "hang" in target:
+            time.sleep(60)
+        if "crash" in target:
+            sys.exit(1)
+        sys.stdout.write(json.dumps([{"SourceFile": target, "File:ImageWidth": 42}]))
+        sys.stdout.write("\\n{ready%s}\\n" % line[len("-execute"):])
+        sys.stdout.flush()
+        args = []
+    elif line == "False":
+        sys.exit(0)
+    else:
+        args.append(line)
+"""
+
+
+@pytest.fixture
+def fake_exiftool(tmp_path: Path) -> str:
+    """Write an executable fake ExifTool script and return its path."""
+    script = tmp_path / "exiftool"
+    script.write_text(f"#!{sys.executable}\n{FAKE_EXIFTOOL}")
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestExifToolPool:
+    """Test request multiplexing, timeouts and respawn."""
+
+    def test_reuses_process_across_requests(self, fake_exiftool):
+        pool = ExifToolPool(size=1, timeout=5, executable=fake_exiftool)
+        try:
+            first = pool.extract_metadata("a.jpg")
+            second = pool.extract_metadata("b.jpg")
+            assert first["SourceFile"] == "a.jpg"
+            assert second["File:ImageWidth"] == 42
+            assert len(pool._processes) == 1
+        finally:
+            pool.close()
+
+    def test_timeout_respawns_process(self, fake_exiftool):
+        pool = ExifToolPool(size=1, timeout=0.5, executable=fake_exiftool)
+        try:
+            with pytest.raises(ExifToolError, match="did not respond"):
+                _ = pool.extract_metadata("hang.jpg")
+            assert pool.extract_metadata("ok.jpg")["SourceFile"] == "ok.jpg"
+        finally:
+            pool.close()
+
+    def test_crash_respawns_process(self, fake_exiftool):
+        pool = ExifToolPool(size=1, timeout=5, executable=fake_exiftool)
+        try:
+            with pytest.raises(ExifToolError, match="exited unexpectedly"):
+                _ = pool.extract_metadata("crash.jpg")
+            assert pool.extract_metadata("ok.jpg")["SourceFile"] == "ok.jpg"
+        finally:
+            pool.close()
+
+    def test_missing_executable(self, tmp_path):
+        pool = ExifToolPool(executable=str(tmp_path / "missing"))
+        with pytest.raises(ExifToolError, match="Failed to start ExifTool"):
+            _ = pool.extract_metadata("a.jpg")
+
+    def test_closed_pool_rejects_requests(self, fake_exiftool):
+        pool = ExifToolPool(executable=fake_exiftool)
+        pool.close()
+        with pytest.raises(ExifToolError, match="closed"):
+            _ = pool.extract_metadata("a.jpg")
+
+    @pytest.mark.skipif(shutil.which("exiftool") is None, reason="ExifTool not installed")
+    def test_real_exiftool(self, sample_image):
+        pool = ExifToolPool(size=1)
+        try:
+            metadata = pool.extract_metadata(str(sample_image))
+            assert metadata.get("File:ImageWidth")
+        finally:
+            pool.close()
+
+    def test_tags_precede_file(self, fake_exiftool):
+        pool = ExifToolPool(size=1, timeout=5, executable=fake_exiftool)
+        try:
+            metadata = pool.extract_metadata("a.jpg", tags=IMAGE_DATE_TAGS)
+            assert metadata["SourceFile"] == "a.jpg"
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(shutil.which("exiftool") is None, reason="ExifTool not installed")
+    def test_real_exiftool_date_tags_only(self, sample_image):
+        pool = ExifToolPool(size=1)
+        try:
+            metadata = pool.extract_metadata(str(sample_image), tags=IMAGE_DATE_TAGS)
+            assert "File:ImageWidth" not in metadata
+        finally:
+            pool.close()
+
+
+class TestImageDigest:
+    """Test that hashing also yields the image dimensions."""
+
+    def test_digest_reads_dimensions(self, sample_image):
+        digest = digest_image_file(str(sample_image))
+        with Image.open(sample_image) as image:
+            assert (digest.width, digest.height) == image.size
+        assert len(digest.hash) >= 32
@@ -188,3 +188,67 @@ class TestFileStorage:
         metadata = {"md5": "withdot", "extension": ".jpg"}
         path = file_storage_service.get_storage_path(metadata, "ignored.png")
         assert path.name == "withdot.jpg"
+
+    def test_staging_writer_hashes_and_commits(self, file_storage_service):
+        """Test that streamed chunks are hashed incrementally and moved into place."""
+        import hashlib
+
+        chunks = [b"a" * 1000, b"b" * 2000, b"c" * 3]
+        writer = file_storage_service.create_staging_writer("upload.jpg")
+        for chunk in chunks:
+            writer.write(chunk)
+        staged = writer.finish()
+
+        content = b"".join(chunks)
+        assert staged.file_size == len(content)
+        assert staged.md5 == hashlib.md5(content).hexdigest()
+        assert staged.head == content
+        assert staged.path.parent == file_storage_service.staging_dir
+
+        metadata = {"md5": staged.md5, "extension": "jpg"}
+        relative_path = file_storage_service.commit_staged_file(staged, metadata)
+
+        assert not staged.path.exists()
+        final_path = file_storage_service.get_absolute_path(relative_path)
+        assert final_path.read_bytes() == content
+
+    def test_staging_writer_abort_removes_file(self, file_storage_service):
+        """Test that an aborted upload leaves nothing in the staging area."""
+        writer = file_storage_service.create_staging_writer("upload.bin")
+        writer.write(b"partial")
+        writer.abort()
+
+        assert list(file_storage_service.staging_dir.iterdir()) == []
+
+    @pytest.mark.parametrize("mode", ["copy", "hardlink", "move"])
+    def test_import_file_modes(self, file_storage_service, tmp_path, mode):
+        """Test placing an existing file into storage by copy, hard link or move."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(b"imported content")
+        metadata = {"md5": f"import{mode}", "extension": "jpg"}
+
+        relative_path = file_storage_service.import_file(source, metadata, mode)
+
+        stored = file_storage_service.get_absolute_path(relative_path)
+        assert stored.read_bytes() == b"imported content"
+        assert stored.name == f"import{mode}.jpg"
+        assert source.exists() == (mode != "move")
+        if mode == "hardlink":
+            assert stored.stat().st_ino == source.stat().st_ino
+
+    def test_staged_file_from_path(self, tmp_path):
+        """Test describing an existing file in place."""
+        import hashlib
+
+        from store.common.storage import STAGING_HEAD_SIZE, StagedFile
+
+        content = b"x" * (STAGING_HEAD_SIZE + 10)
+        source = tmp_path / "big.bin"
+        source.write_bytes(content)
+
+        staged = StagedFile.from_path(source, chunk_size=1000)
+
+        assert staged.file_size == len(content)
+        assert staged.md5 == hashlib.md5(content).hexdigest()
+        assert staged.head == content[:STAGING_HEAD_SIZE]
+        assert staged.original_filename == "big.bin"
@@ -0,0 +1,152 @@
+"""
+Tests for the closure-table backed collection hierarchy.
+"""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from store.db_service.db_internals import EntityClosure
+
+pytestmark = pytest.mark.integration
+
+
+def _ancestors(session: Session, entity_id: int) -> dict[int, int]:
+    session.expire_all()
+    rows = session.query(EntityClosure).filter(EntityClosure.descendant_id == entity_id).all()
+    return {row.ancestor_id: row.depth for row in rows}
+
+
+class TestClosureMaintenance:
+    """Test that closure rows follow inserts, moves and deletes."""
+
+    def test_insert_adds_ancestor_rows(
+        self, client: TestClient, create_collection: Callable[..., int], test_db_session: Session
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        grandchild = create_collection("Grandchild", child)
+
+        assert _ancestors(test_db_session, grandchild) == {grandchild: 0, child: 1, root: 2}
+
+    def test_move_subtree(
+        self, client: TestClient, create_collection: Callable[..., int], test_db_session: Session
+    ) -> None:
+        old_root = create_collection("Old root")
+        new_root = create_collection("New root")
+        moved = create_collection("Moved", old_root)
+        leaf = create_collection("Leaf", moved)
+
+        response = client.patch(f"/entities/{moved}", data={"parent_id": str(new_root)})
+        assert response.status_code == 200
+
+        assert _ancestors(test_db_session, leaf) == {leaf: 0, moved: 1, new_root: 2}
+
+        response = client.patch(f"/entities/{moved}", data={"parent_id": ""})
+        assert response.status_code == 200
+        assert _ancestors(test_db_session, leaf) == {leaf: 0, moved: 1}
+
+    def test_cycle_through_grandchild_rejected(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        grandchild = create_collection("Grandchild", child)
+
+        response = client.patch(f"/entities/{root}", data={"parent_id": str(grandchild)})
+        assert response.status_code == 422
+        assert "Circular hierarchy detected" in response.text
+
+    def test_put_cycle_through_grandchild_rejected(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        grandchild = create_collection("Grandchild", child)
+
+        response = client.put(
+            f"/entities/{root}",
+            data={"is_collection": "true", "label": "Root", "parent_id": str(grandchild)},
+        )
+        assert response.status_code == 422
+        assert "Circular hierarchy detected" in response.text
+
+    def test_hard_delete_removes_subtree_rows(
+        self,
+        client: TestClient,
+        create_collection: Callable[..., int],
+        test_db_session: Session,
+        sample_image: Path,
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        with open(sample_image, "rb") as f:
+            media = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false", "parent_id": str(child)},
+            ).json()["id"]
+
+        assert client.patch(f"/entities/{root}", data={"is_deleted": "true"}).status_code == 200
+        assert client.delete(f"/entities/{root}").status_code == 204
+
+        for entity_id in (root, child, media):
+            assert client.get(f"/entities/{entity_id}").status_code == 404
+            assert _ancestors(test_db_session, entity_id) == {}
+
+
+class TestSubtreeQueries:
+    """Test recursive listing and subtree statistics."""
+
+    def test_list_by_ancestor(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        grandchild = create_collection("Grandchild", child)
+        _ = create_collection("Elsewhere")
+
+        response = client.get("/entities/", params={"ancestor_id": root})
+        assert response.status_code == 200
+        ids = {item["id"] for item in response.json()["items"]}
+        assert ids == {child, grandchild}
+        assert response.json()["pagination"]["total_items"] == 2
+
+        # Combines with the other filters
+        response = client.get("/entities/", params={"ancestor_id": root, "parent_id": child})
+        assert [item["id"] for item in response.json()["items"]] == [grandchild]
+
+    def test_subtree_stats(
+        self, client: TestClient, create_collection: Callable[..., int], sample_image: Path
+    ) -> None:
+        root = create_collection("Root")
+        child = create_collection("Child", root)
+        with open(sample_image, "rb") as f:
+            media = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false", "parent_id": str(child)},
+            ).json()
+
+        stats = client.get(f"/entities/{root}/subtree").json()
+        assert stats == {
+            "entity_id": root,
+            "descendant_count": 2,
+            "collection_count": 1,
+            "media_count": 1,
+            "total_file_size": media["file_size"],
+            "max_depth": 2,
+        }
+
+        assert client.patch(f"/entities/{child}", data={"is_deleted": "true"}).status_code == 200
+        stats = client.get(
+            f"/entities/{root}/subtree", params={"exclude_deleted": "true"}
+        ).json()
+        assert stats["descendant_count"] == 1
+        assert stats["collection_count"] == 0
+
+    def test_subtree_stats_not_found(self, client: TestClient) -> None:
+        assert client.get("/entities/999999/subtree").status_code == 404
@@ -0,0 +1,89 @@
+"""Tests for the ingest executor that keeps blocking work off the event loop."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from store.store.ingest import IngestExecutor
+
+pytestmark = pytest.mark.integration
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+class TestIngestExecutor:
+    """Test dispatching and admission control."""
+
+    def test_run_uses_worker_thread(self):
+        executor = IngestExecutor(cpu_workers=0, io_workers=1, queue_size=1)
+        try:
+            thread_name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+            assert thread_name.startswith("ingest")
+        finally:
+            executor.shutdown()
+
+    def test_run_cpu_inline_without_process_pool(self):
+        executor = IngestExecutor(cpu_workers=0, io_workers=1, queue_size=1)
+        try:
+            assert executor.run_cpu(_pid) == os.getpid()
+        finally:
+            executor.shutdown()
+
+    def test_run_cpu_uses_process_pool(self):
+        executor = IngestExecutor(cpu_workers=1, io_workers=1, queue_size=1)
+        try:
+            assert executor.run_cpu(_pid) != os.getpid()
+        finally:
+            executor.shutdown()
+
+    def test_event_loop_stays_responsive(self):
+        """A blocking ingest job must not delay other coroutines."""
+        executor = IngestExecutor(cpu_workers=0, io_workers=1, queue_size=2)
+
+        async def scenario() -> float:
+            job = asyncio.create_task(executor.run(time.sleep, 0.5))
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            latency = time.perf_counter() - start
+            await job
+            return latency
+
+        try:
+            assert asyncio.run(scenario()) < 0.2
+        finally:
+            executor.shutdown()
+
+    def test_admission_is_bounded(self):
+        executor = IngestExecutor(cpu_workers=0, io_workers=2, queue_size=2)
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def job() -> None:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        async def scenario() -> None:
+            _ = await asyncio.gather(*(executor.run(job) for _ in range(6)))
+
+        try:
+            asyncio.run(scenario())
+            assert peak <= 2
+        finally:
+            executor.shutdown()
+
+    def test_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            _ = IngestExecutor(io_workers=0)
+        with pytest.raises(ValueError):
+            _ = IngestExecutor(io_workers=4, queue_size=2)
@@ -223,3 +223,34 @@ class TestMultipleSequentialRequests:
         # Verify deletion
         final_read = client.get(f"/entities/{entity_id}")
         assert final_read.status_code == 404
+
+
+class TestSharedCollaborators:
+    """Tests that entity routes bind only the session per request."""
+
+    def test_collaborators_built_once(self, client, monkeypatch):
+        from store.store import dependencies
+        from store.store.service import EntityService
+        from store.store.store import app
+
+        services: list[EntityService] = []
+
+        class RecordingEntityService(EntityService):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                services.append(self)
+
+        monkeypatch.setattr(dependencies, "EntityService", RecordingEntityService)
+
+        for label in ("First", "Second"):
+            response = client.post("/entities/", data={"is_collection": "true", "label": label})
+            assert response.status_code == 201
+
+        first, second = services
+        assert first.db is not second.db
+        assert first.file_storage is second.file_storage is app.state.storage_service
+        assert first.metadata_extractor is second.metadata_extractor
+        assert first.metadata_extractor is app.state.metadata_extractor
+        assert app.state.upload_sessions.storage is app.state.storage_service
+        # The face service is only built when a route deletes faces
+        assert first.face_service is None
@@ -380,3 +380,80 @@ class TestPaginationEdgeCases:
             response = client.get(f"/entities/?page=1&page_size={page_size}")
             paginated = PaginatedResponse.model_validate(response.json())
             assert paginated.pagination.total_items == 17
+
+
+class TestCursorPagination:
+    """Test keyset (cursor) pagination."""
+
+    @staticmethod
+    def _create_collections(client: TestClient, count: int) -> list[int]:
+        ids: list[int] = []
+        for i in range(count):
+            response = client.post(
+                "/entities/", data={"is_collection": "true", "label": f"Album {i}"}
+            )
+            assert response.status_code == 201
+            ids.append(response.json()["id"])
+        return ids
+
+    def test_cursor_walks_all_items_in_order(self, client: TestClient) -> None:
+        """Following next_cursor visits every item once, in the same order as pages."""
+        _ = self._create_collections(client, 12)
+
+        by_page: list[int] = []
+        for page in (1, 2, 3):
+            response = client.get(f"/entities/?page={page}&page_size=5")
+            by_page.extend(item["id"] for item in response.json()["items"])
+
+        by_cursor: list[int] = []
+        params: dict[str, str | int] = {"page_size": 5}
+        while True:
+            paginated = PaginatedResponse.model_validate(
+                client.get("/entities/", params=params).json()
+            )
+            by_cursor.extend(item.id for item in paginated.items if item.id is not None)
+            if paginated.pagination.next_cursor is None:
+                assert paginated.pagination.has_next is False
+                break
+            assert paginated.pagination.has_next is True
+            params["cursor"] = paginated.pagination.next_cursor
+
+        assert by_cursor == by_page
+        assert len(set(by_cursor)) == 12
+
+    def test_cursor_keeps_filters(self, client: TestClient) -> None:
+        """Filters apply to every cursor page."""
+        album_ids = self._create_collections(client, 3)
+        for album_id in album_ids:
+            response = client.post(
+                "/entities/",
+                data={"is_collection": "true", "label": "Child", "parent_id": str(album_ids[0])},
+            )
+            assert response.status_code == 201
+
+        first = client.get("/entities/", params={"page_size": 2, "parent_id": 0}).json()
+        second = client.get(
+            "/entities/",
+            params={"page_size": 2, "parent_id": 0, "cursor": first["pagination"]["next_cursor"]},
+        ).json()
+
+        ids = [item["id"] for item in first["items"] + second["items"]]
+        assert sorted(ids) == sorted(album_ids)
+        assert second["pagination"]["next_cursor"] is None
+
+    def test_total_is_optional(self, client: TestClient) -> None:
+        """include_total=false skips the count."""
+        _ = self._create_collections(client, 3)
+
+        response = client.get("/entities/", params={"page_size": 2, "include_total": "false"})
+        assert response.status_code == 200
+        pagination = response.json()["pagination"]
+        assert pagination["total_items"] is None
+        assert pagination["total_pages"] is None
+        assert pagination["has_next"] is True
+        assert pagination["next_cursor"]
+
+    def test_invalid_cursor_rejected(self, client: TestClient) -> None:
+        """A malformed cursor is a client error."""
+        response = client.get("/entities/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
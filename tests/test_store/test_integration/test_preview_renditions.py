@@ -0,0 +1,103 @@
+"""Tests for multi-size preview renditions."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from store.store.config import StoreConfig
+from store.store.media_thumbnail import PreviewSettings, ThumbnailGenerator
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def media_copy(sample_image: Path, tmp_path: Path) -> str:
+    target = tmp_path / f"media{sample_image.suffix.lower()}"
+    _ = shutil.copy(sample_image, target)
+    return str(target)
+
+
+class TestRenditions:
+    """Test rendition generation, lookup and cleanup."""
+
+    def test_generate_writes_all_sizes(self, media_copy: str) -> None:
+        settings = PreviewSettings(sizes=[128, 512], format="webp", quality=70)
+
+        result = ThumbnailGenerator.generate(media_copy, "image/jpeg", settings)
+
+        assert result == ThumbnailGenerator.get_thumbnail_path(media_copy)
+        for size in settings.sizes:
+            path = ThumbnailGenerator.get_rendition_path(media_copy, size, "webp")
+            with Image.open(path) as rendition:
+                assert rendition.format == "WEBP"
+                assert max(rendition.size) <= size
+
+    def test_jpeg_format(self, media_copy: str) -> None:
+        settings = PreviewSettings(sizes=[256], format="jpeg")
+        _ = ThumbnailGenerator.generate(media_copy, "image/jpeg", settings)
+
+        path = ThumbnailGenerator.get_rendition_path(media_copy, 256, "jpeg")
+        assert path.endswith(".tb256.jpg")
+        with Image.open(path) as rendition:
+            assert rendition.format == "JPEG"
+
+    def test_delete_removes_thumbnail_and_renditions(self, media_copy: str) -> None:
+        settings = PreviewSettings(sizes=[128, 256])
+        _ = ThumbnailGenerator.generate(media_copy, "image/jpeg", settings)
+
+        assert ThumbnailGenerator.delete(media_copy)
+        assert list(Path(media_copy).parent.glob("*.tb*")) == []
+        assert Path(media_copy).exists()
+
+    def test_nearest_size(self) -> None:
+        settings = PreviewSettings(sizes=[1024, 128, 512, 256])
+        assert settings.nearest_size(100) == 128
+        assert settings.nearest_size(256) == 256
+        assert settings.nearest_size(300) == 512
+        assert settings.nearest_size(4000) == 1024
+
+    def test_source_path(self) -> None:
+        assert ThumbnailGenerator.get_source_path("a/b.jpg.tb.png") == "a/b.jpg"
+        assert ThumbnailGenerator.get_source_path("a/b.jpg.tb512.webp") == "a/b.jpg"
+        assert ThumbnailGenerator.get_source_path("a/b.jpg") is None
+
+
+class TestPreviewSizeEndpoint:
+    """Test GET /entities/{id}/preview?size=."""
+
+    def test_serves_nearest_rendition(self, client: TestClient, sample_image: Path) -> None:
+        with open(sample_image, "rb") as f:
+            entity = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false"},
+            ).json()
+
+        response = client.get(f"/entities/{entity['id']}/preview", params={"size": 300})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        assert ".tb512.webp" in response.headers["content-disposition"]
+
+    def test_generates_missing_rendition_on_demand(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        with open(sample_image, "rb") as f:
+            entity = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false"},
+            ).json()
+        assert client.get(f"/entities/{entity['id']}/preview").status_code == 200
+
+        # Simulate media stored before renditions existed
+        media_path = StoreConfig.get_config().media_storage_dir / entity["file_path"]
+        for rendition in media_path.parent.glob(f"{media_path.name}.tb[0-9]*"):
+            rendition.unlink()
+
+        response = client.get(f"/entities/{entity['id']}/preview", params={"size": 128})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
@@ -0,0 +1,139 @@
+"""
+Tests that GET /entities listings are served by the composite indexes.
+
+Each listing query is captured as it is executed and re-run under
+EXPLAIN QUERY PLAN, so the plans checked are those of the real statements.
+"""
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def listing_plans(test_engine: Engine) -> Iterator[list[str]]:
+    """Collect the query plan of every paginated entity listing query."""
+    plans: list[str] = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany) -> None:  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
+        if "FROM entities" in statement and "ORDER BY entities.added_date DESC" in statement:
+            rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append("\n".join(str(row[-1]) for row in rows))
+
+    event.listen(test_engine, "before_cursor_execute", explain)
+    yield plans
+    event.remove(test_engine, "before_cursor_execute", explain)
+
+
+@pytest.mark.parametrize(
+    ("params", "index"),
+    [
+        ({}, "ix_entities_deleted_added_date"),
+        ({"parent_id": 1}, "ix_entities_deleted_parent_added_date"),
+        ({"parent_id": 0}, "ix_entities_deleted_parent_added_date"),
+        ({"type": "image"}, "ix_entities_deleted_type_added_date"),
+        ({"mime_type": "image/jpeg"}, "ix_entities_deleted_mime_added_date"),
+        ({"is_collection": "true"}, "ix_entities_deleted_collection_added_date"),
+        ({"parent_id": 1, "file_size_min": 10}, "ix_entities_deleted_parent_added_date"),
+    ],
+)
+def test_filtered_listing_uses_index(
+    client: TestClient,
+    listing_plans: list[str],
+    params: dict[str, object],
+    index: str,
+) -> None:
+    """Filtered, non-deleted listings are an index range scan with no sort."""
+    _ = client.post("/entities/", data={"is_collection": "true", "label": "Album"})
+    listing_plans.clear()
+
+    response = client.get("/entities/", params={"exclude_deleted": "true", **params})
+    assert response.status_code == 200
+
+    assert listing_plans, "listing query was not captured"
+    plan = listing_plans[-1]
+    assert f"INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_cursor_page_seeks_on_index(client: TestClient, listing_plans: list[str]) -> None:
+    """A cursor page narrows the index range instead of skipping rows."""
+    for i in range(3):
+        _ = client.post("/entities/", data={"is_collection": "true", "label": f"Album {i}"})
+    first = client.get("/entities/", params={"page_size": 1, "exclude_deleted": "true"}).json()
+    listing_plans.clear()
+
+    response = client.get(
+        "/entities/",
+        params={
+            "page_size": 1,
+            "exclude_deleted": "true",
+            "cursor": first["pagination"]["next_cursor"],
+        },
+    )
+    assert response.status_code == 200
+
+    plan = listing_plans[-1]
+    assert "INDEX ix_entities_deleted_added_date" in plan
+    assert "added_date<?" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.parametrize(
+    ("params", "index"),
+    [
+        ({}, "ix_entities_added_date_id"),
+        ({"parent_id": 1}, "ix_entities_parent_added_date"),
+        ({"parent_id": 0}, "ix_entities_parent_added_date"),
+        ({"type": "image"}, "ix_entities_type_added_date"),
+        ({"mime_type": "image/jpeg"}, "ix_entities_mime_added_date"),
+        ({"is_collection": "true"}, "ix_entities_collection_added_date"),
+    ],
+)
+def test_default_listing_uses_index(
+    client: TestClient,
+    listing_plans: list[str],
+    params: dict[str, object],
+    index: str,
+) -> None:
+    """The default request (deleted entities included) is also served without a sort."""
+    _ = client.post("/entities/", data={"is_collection": "true", "label": "Album"})
+    listing_plans.clear()
+
+    response = client.get("/entities/", params=params)
+    assert response.status_code == 200
+
+    assert listing_plans, "listing query was not captured"
+    plan = listing_plans[-1]
+    assert f"INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_default_cursor_page_seeks_on_index(
+    client: TestClient, listing_plans: list[str]
+) -> None:
+    """A cursor page of a filtered default listing seeks within the filter's index."""
+    parent = client.post("/entities/", data={"is_collection": "true", "label": "Parent"}).json()
+    for i in range(3):
+        _ = client.post(
+            "/entities/",
+            data={"is_collection": "true", "label": f"Album {i}", "parent_id": parent["id"]},
+        )
+    params = {"page_size": 1, "parent_id": parent["id"]}
+    first = client.get("/entities/", params=params).json()
+    listing_plans.clear()
+
+    response = client.get(
+        "/entities/", params={**params, "cursor": first["pagination"]["next_cursor"]}
+    )
+    assert response.status_code == 200
+
+    plan = listing_plans[-1]
+    assert "INDEX ix_entities_parent_added_date" in plan
+    assert "added_date<?" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,50 @@
+"""
+Tests that blocking database reads do not stall the event loop.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from store.store.service import EntityService
+
+pytestmark = pytest.mark.integration
+
+SLOW_QUERY_SECONDS = 1.0
+
+
+def test_slow_read_does_not_block_other_requests(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    response = client.post("/entities/", data={"is_collection": "true", "label": "Album"})
+    entity_id = response.json()["id"]
+    started = threading.Event()
+    original = EntityService.get_subtree_stats
+
+    def slow_subtree_stats(self, *args, **kwargs):
+        started.set()
+        time.sleep(SLOW_QUERY_SECONDS)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(EntityService, "get_subtree_stats", slow_subtree_stats)
+
+    slow_status: list[int] = []
+
+    def read_subtree() -> None:
+        slow_status.append(client.get(f"/entities/{entity_id}/subtree").status_code)
+
+    slow = threading.Thread(target=read_subtree)
+    slow.start()
+    assert started.wait(5)
+
+    start = time.monotonic()
+    response = client.get(f"/entities/{entity_id}")
+    elapsed = time.monotonic() - start
+    slow.join()
+
+    assert response.status_code == 200
+    assert slow_status == [200]
+    # Served while the slow read was still running on its worker thread
+    assert elapsed < SLOW_QUERY_SECONDS / 2
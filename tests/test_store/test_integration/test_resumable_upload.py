@@ -0,0 +1,152 @@
+"""
+Tests for resumable chunked uploads (/entities/uploads).
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from store.store.upload_sessions import UploadSessionManager
+
+pytestmark = pytest.mark.integration
+
+
+def _create_session(client: TestClient, path: Path, **fields: str) -> dict:
+    data = {"filename": path.name, "size": str(path.stat().st_size), **fields}
+    response = client.post("/entities/uploads", data=data)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _upload_in_chunks(client: TestClient, upload_id: str, content: bytes, chunk_size: int) -> None:
+    for offset in range(0, len(content), chunk_size):
+        response = client.put(
+            f"/entities/uploads/{upload_id}",
+            params={"offset": offset},
+            content=content[offset : offset + chunk_size],
+        )
+        assert response.status_code == 200
+        assert response.json()["offset"] == min(offset + chunk_size, len(content))
+
+
+class TestResumableUpload:
+    """Test session lifecycle, offset handling and finalize."""
+
+    def test_chunked_upload_creates_entity(self, client: TestClient, sample_image: Path) -> None:
+        content = sample_image.read_bytes()
+        session = _create_session(client, sample_image, label="Chunked")
+        assert session["offset"] == 0
+
+        _upload_in_chunks(client, session["upload_id"], content, chunk_size=64 * 1024)
+
+        response = client.post(f"/entities/uploads/{session['upload_id']}/finalize")
+        assert response.status_code == 201
+        entity = response.json()
+        assert entity["label"] == "Chunked"
+        assert entity["file_size"] == len(content)
+
+        # Identical to a single-request upload of the same file
+        with open(sample_image, "rb") as f:
+            direct = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false"},
+            )
+        assert direct.status_code == 200
+        assert direct.json()["id"] == entity["id"]
+
+        # The session is gone after finalize
+        assert client.get(f"/entities/uploads/{session['upload_id']}").status_code == 404
+
+    def test_resume_from_reported_offset(self, client: TestClient, sample_image: Path) -> None:
+        content = sample_image.read_bytes()
+        session = _create_session(client, sample_image)
+        upload_id = session["upload_id"]
+
+        half = len(content) // 2
+        assert client.put(
+            f"/entities/uploads/{upload_id}", params={"offset": 0}, content=content[:half]
+        ).status_code == 200
+
+        # Client lost track of progress: ask the server
+        offset = client.get(f"/entities/uploads/{upload_id}").json()["offset"]
+        assert offset == half
+
+        assert client.put(
+            f"/entities/uploads/{upload_id}", params={"offset": offset}, content=content[offset:]
+        ).status_code == 200
+        assert client.post(f"/entities/uploads/{upload_id}/finalize").status_code == 201
+
+    def test_wrong_offset_rejected(self, client: TestClient, sample_image: Path) -> None:
+        session = _create_session(client, sample_image)
+        response = client.put(
+            f"/entities/uploads/{session['upload_id']}", params={"offset": 10}, content=b"x"
+        )
+        assert response.status_code == 409
+        assert client.get(f"/entities/uploads/{session['upload_id']}").json()["offset"] == 0
+
+    def test_chunk_beyond_declared_size_rejected(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        session = _create_session(client, sample_image)
+        too_much = b"x" * (sample_image.stat().st_size + 1)
+        response = client.put(
+            f"/entities/uploads/{session['upload_id']}", params={"offset": 0}, content=too_much
+        )
+        assert response.status_code == 413
+
+    def test_finalize_incomplete_rejected(self, client: TestClient, sample_image: Path) -> None:
+        session = _create_session(client, sample_image)
+        _ = client.put(
+            f"/entities/uploads/{session['upload_id']}", params={"offset": 0}, content=b"abc"
+        )
+        response = client.post(f"/entities/uploads/{session['upload_id']}/finalize")
+        assert response.status_code == 409
+
+    def test_failed_finalize_keeps_session(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        content = sample_image.read_bytes()
+        session = _create_session(client, sample_image, parent_id="999999")
+        _upload_in_chunks(client, session["upload_id"], content, chunk_size=64 * 1024)
+
+        response = client.post(f"/entities/uploads/{session['upload_id']}/finalize")
+        assert response.status_code == 422
+
+        # The received bytes survive for a retry
+        status = client.get(f"/entities/uploads/{session['upload_id']}")
+        assert status.status_code == 200
+        assert status.json()["offset"] == len(content)
+
+    def test_cancel_upload(self, client: TestClient, sample_image: Path) -> None:
+        session = _create_session(client, sample_image)
+        response = client.delete(f"/entities/uploads/{session['upload_id']}")
+        assert response.status_code == 204
+        assert client.get(f"/entities/uploads/{session['upload_id']}").status_code == 404
+
+    def test_unknown_session(self, client: TestClient) -> None:
+        assert client.get("/entities/uploads/doesnotexist").status_code == 404
+        assert client.put(
+            "/entities/uploads/doesnotexist", params={"offset": 0}, content=b"x"
+        ).status_code == 404
+
+
+class TestUploadSessionGarbageCollection:
+    """Test removal of abandoned sessions."""
+
+    def test_collects_only_idle_sessions(self, file_storage_service) -> None:
+        manager = UploadSessionManager(file_storage_service, ttl_seconds=60)
+        stale = manager.create(filename="stale.mp4")
+        fresh = manager.create(filename="fresh.mp4")
+
+        stale_dir = manager.sessions_dir / stale.upload_id
+        old = time.time() - 120
+        for path in stale_dir.iterdir():
+            os.utime(path, (old, old))
+
+        assert manager.collect_garbage() == 1
+        assert not stale_dir.exists()
+        assert (manager.sessions_dir / fresh.upload_id).exists()
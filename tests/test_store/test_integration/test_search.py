@@ -0,0 +1,101 @@
+"""
+Tests for full-text search (search_query) on GET /entities.
+"""
+
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+pytestmark = pytest.mark.integration
+
+
+def _search(client: TestClient, query: str, **params: object) -> list[int]:
+    response = client.get("/entities/", params={"search_query": query, **params})
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()["items"]]
+
+
+class TestFullTextSearch:
+    """Test matching, ranking and index maintenance."""
+
+    def test_matches_label_and_description(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        beach = create_collection("Beach Sunset", description="Evening at the shore")
+        trip = create_collection("Mountains", description="Stopped at the beach on the way")
+        _ = create_collection("Birthday")
+
+        assert set(_search(client, "beach")) == {beach, trip}
+        assert _search(client, "shore") == [beach]
+
+    def test_prefix_and_all_words(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        beach = create_collection("Beach Sunset")
+        party = create_collection("Beach Party")
+
+        assert set(_search(client, "bea")) == {beach, party}
+        assert _search(client, "bea sun") == [beach]
+
+    def test_label_match_ranks_first(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        in_description = create_collection("Trip", description="A day at the lake")
+        in_label = create_collection("Lake", description="Summer holiday photos")
+
+        assert _search(client, "lake") == [in_label, in_description]
+
+    def test_case_diacritics_and_operators(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        cafe = create_collection("Café Visit")
+
+        assert _search(client, "CAFE") == [cafe]
+        # FTS5 syntax in user input is taken literally
+        assert _search(client, 'cafe OR "') == []
+        assert _search(client, "visit*") == [cafe]
+
+    def test_index_follows_updates_and_deletes(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        entity_id = create_collection("Old name")
+
+        response = client.patch(f"/entities/{entity_id}", data={"label": "New name"})
+        assert response.status_code == 200
+        assert _search(client, "old") == []
+        assert _search(client, "new") == [entity_id]
+
+        assert client.patch(f"/entities/{entity_id}", data={"is_deleted": "true"}).status_code == 200
+        assert client.delete(f"/entities/{entity_id}").status_code == 204
+        assert _search(client, "new") == []
+
+    def test_combines_with_filters_and_pagination(
+        self, client: TestClient, create_collection: Callable[..., int]
+    ) -> None:
+        album = create_collection("Holiday album")
+        ids = [
+            client.post(
+                "/entities/",
+                data={"is_collection": "true", "label": f"Holiday {i}", "parent_id": str(album)},
+            ).json()["id"]
+            for i in range(3)
+        ]
+
+        assert set(_search(client, "holiday", parent_id=album)) == set(ids)
+
+        first = client.get(
+            "/entities/", params={"search_query": "holiday", "page_size": 2}
+        ).json()
+        assert first["pagination"]["total_items"] == 4
+        second = client.get(
+            "/entities/",
+            params={
+                "search_query": "holiday",
+                "page_size": 2,
+                "cursor": first["pagination"]["next_cursor"],
+            },
+        ).json()
+        seen = [item["id"] for item in first["items"] + second["items"]]
+        assert sorted(seen) == sorted([album, *ids])
+        assert second["pagination"]["next_cursor"] is None
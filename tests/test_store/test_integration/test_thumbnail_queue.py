@@ -0,0 +1,146 @@
+"""Tests for background thumbnail generation and the entity preview state."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from store.db_service.db_internals import Entity, database
+from store.store.media_thumbnail import ThumbnailGenerator
+from store.store.thumbnail_queue import ThumbnailQueue
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def session_factory(test_engine: Engine, monkeypatch: pytest.MonkeyPatch) -> sessionmaker[Session]:
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    return factory
+
+
+def _add_entity(factory: sessionmaker[Session], file_path: str) -> int:
+    with factory() as session:
+        entity = Entity(
+            is_collection=False,
+            file_path=file_path,
+            mime_type="image/jpeg",
+            preview_status="pending",
+        )
+        session.add(entity)
+        session.commit()
+        return entity.id
+
+
+def _preview_status(factory: sessionmaker[Session], entity_id: int) -> str | None:
+    with factory() as session:
+        entity = session.get(Entity, entity_id)
+        assert entity is not None
+        return entity.preview_status
+
+
+class TestThumbnailQueue:
+    """Test queueing, waiting and status updates (generation stubbed)."""
+
+    def test_job_marks_preview_ready(
+        self, session_factory: sessionmaker[Session], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(ThumbnailGenerator, "generate", lambda path, mime, settings=None: f"{path}.tb.png")
+        entity_id = _add_entity(session_factory, "store/a.jpg")
+
+        thumbnails = ThumbnailQueue(workers=1)
+        try:
+            thumbnails.submit(entity_id, "store/a.jpg", "/media/store/a.jpg", "image/jpeg")
+            assert thumbnails.wait("/media/store/a.jpg", timeout=5)
+        finally:
+            thumbnails.shutdown()
+
+        assert _preview_status(session_factory, entity_id) == "ready"
+
+    def test_failed_generation_marks_preview_failed(
+        self, session_factory: sessionmaker[Session], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(ThumbnailGenerator, "generate", lambda path, mime, settings=None: None)
+        entity_id = _add_entity(session_factory, "store/b.jpg")
+
+        thumbnails = ThumbnailQueue(workers=1)
+        try:
+            thumbnails.submit(entity_id, "store/b.jpg", "/media/store/b.jpg", "image/jpeg")
+            assert thumbnails.wait("/media/store/b.jpg", timeout=5)
+        finally:
+            thumbnails.shutdown()
+
+        assert _preview_status(session_factory, entity_id) == "failed"
+
+    def test_wait_times_out_while_pending(
+        self, session_factory: sessionmaker[Session], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        release = threading.Event()
+
+        def slow_generate(path: str, mime: str, settings: object = None) -> str:
+            _ = release.wait(5)
+            return f"{path}.tb.png"
+
+        monkeypatch.setattr(ThumbnailGenerator, "generate", slow_generate)
+        entity_id = _add_entity(session_factory, "store/c.jpg")
+
+        thumbnails = ThumbnailQueue(workers=1)
+        try:
+            thumbnails.submit(entity_id, "store/c.jpg", "/media/store/c.jpg", "image/jpeg")
+            start = time.monotonic()
+            assert not thumbnails.wait("/media/store/c.jpg", timeout=0.1)
+            assert time.monotonic() - start < 1
+            assert thumbnails.is_pending("/media/store/c.jpg")
+            release.set()
+            assert thumbnails.wait("/media/store/c.jpg", timeout=5)
+        finally:
+            release.set()
+            thumbnails.shutdown()
+
+    def test_stale_job_does_not_overwrite_replaced_file(
+        self, session_factory: sessionmaker[Session], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(ThumbnailGenerator, "generate", lambda path, mime, settings=None: None)
+        entity_id = _add_entity(session_factory, "store/new.jpg")
+
+        thumbnails = ThumbnailQueue(workers=1)
+        try:
+            # Job for the file the entity pointed to before an update
+            thumbnails.submit(entity_id, "store/old.jpg", "/media/store/old.jpg", "image/jpeg")
+            assert thumbnails.wait("/media/store/old.jpg", timeout=5)
+        finally:
+            thumbnails.shutdown()
+
+        assert _preview_status(session_factory, entity_id) == "pending"
+
+
+class TestPreviewState:
+    """Test the preview state exposed through the API."""
+
+    def test_upload_returns_before_thumbnail(
+        self, client: TestClient, sample_image: Path
+    ) -> None:
+        with open(sample_image, "rb") as f:
+            response = client.post(
+                "/entities/",
+                files={"image": (sample_image.name, f, "image/jpeg")},
+                data={"is_collection": "false"},
+            )
+        assert response.status_code == 201
+        entity = response.json()
+        assert entity["preview_status"] in ("pending", "ready")
+
+        # The preview request waits for the queued thumbnail
+        preview = client.get(f"/entities/{entity['id']}/preview")
+        assert preview.status_code == 200
+        assert preview.headers["content-type"] == "image/png"
+        assert client.get(f"/entities/{entity['id']}").json()["preview_status"] == "ready"
+
+    def test_collection_has_no_preview_state(self, client: TestClient) -> None:
+        response = client.post("/entities/", data={"is_collection": "true", "label": "Album"})
+        assert response.status_code == 201
+        assert response.json()["preview_status"] is None
@@ -292,3 +292,131 @@ class TestEntityVersioning:
         assert v2_response.status_code == 200
         v2_item = Item.model_validate(v2_response.json())
         assert v2_item.label == "Collection V2"
+
+
+class TestPointInTimeListing:
+    """Test GET /entities?as_of_transaction= served from the version table."""
+
+    @staticmethod
+    def _latest_transaction(client: TestClient, entity_id: int) -> int:
+        versions = client.get(f"/entities/{entity_id}/versions").json()
+        return versions[-1]["transaction_id"]
+
+    @staticmethod
+    def _listing(client: TestClient, **params: object) -> dict[int, str | None]:
+        response = client.get("/entities/", params=params)
+        assert response.status_code == 200
+        return {item["id"]: item["label"] for item in response.json()["items"]}
+
+    def test_lists_state_at_transaction(self, client: TestClient) -> None:
+        first = client.post("/entities/", data={"is_collection": "true", "label": "Before"}).json()
+        t_created = self._latest_transaction(client, first["id"])
+
+        _ = client.patch(f"/entities/{first['id']}", data={"label": "After"})
+        t_renamed = self._latest_transaction(client, first["id"])
+
+        second = client.post("/entities/", data={"is_collection": "true", "label": "Later"}).json()
+
+        assert self._listing(client, as_of_transaction=t_created) == {first["id"]: "Before"}
+        assert self._listing(client, as_of_transaction=t_renamed) == {first["id"]: "After"}
+        assert self._listing(client) == {first["id"]: "After", second["id"]: "Later"}
+
+    def test_hard_deleted_entity_still_listed_in_the_past(self, client: TestClient) -> None:
+        entity = client.post("/entities/", data={"is_collection": "true", "label": "Gone"}).json()
+        _ = client.patch(f"/entities/{entity['id']}", data={"is_deleted": "true"})
+        t_soft_deleted = self._latest_transaction(client, entity["id"])
+        assert client.delete(f"/entities/{entity['id']}").status_code == 204
+
+        assert self._listing(client, as_of_transaction=t_soft_deleted) == {entity["id"]: "Gone"}
+        assert self._listing(
+            client, as_of_transaction=t_soft_deleted, exclude_deleted="true"
+        ) == {}
+
+    def test_filters_and_cursor_apply_to_history(self, client: TestClient) -> None:
+        album = client.post("/entities/", data={"is_collection": "true", "label": "Album"}).json()
+        children = [
+            client.post(
+                "/entities/",
+                data={"is_collection": "true", "label": f"Child {i}", "parent_id": str(album["id"])},
+            ).json()
+            for i in range(3)
+        ]
+        t_all = self._latest_transaction(client, children[-1]["id"])
+        # Moving a child out afterwards must not change the historical listing
+        _ = client.patch(f"/entities/{children[0]['id']}", data={"parent_id": ""})
+
+        params = {"as_of_transaction": t_all, "parent_id": album["id"], "page_size": 2}
+        first = client.get("/entities/", params=params).json()
+        second = client.get(
+            "/entities/", params={**params, "cursor": first["pagination"]["next_cursor"]}
+        ).json()
+
+        assert first["pagination"]["total_items"] == 3
+        ids = [item["id"] for item in first["items"] + second["items"]]
+        assert sorted(ids) == sorted(child["id"] for child in children)
+
+        listing = client.get("/entities/", params={"as_of_transaction": t_all}).json()
+        counts = {item["id"]: item["children_count"] for item in listing["items"]}
+        assert counts[album["id"]] == 3
+
+    def test_unsupported_combinations_rejected(self, client: TestClient) -> None:
+        params = {"as_of_transaction": 1, "ancestor_id": 1}
+        assert client.get("/entities/", params=params).status_code == 400
+        params = {"as_of_transaction": 1, "version": 1}
+        assert client.get("/entities/", params=params).status_code == 400
+
+
+class TestVersionLookup:
+    """Test direct version lookup and the paginated versions list."""
+
+    @staticmethod
+    def _collection_with_versions(client: TestClient, count: int) -> int:
+        entity_id = client.post(
+            "/entities/", data={"is_collection": "true", "label": "V1"}
+        ).json()["id"]
+        for i in range(2, count + 1):
+            response = client.patch(f"/entities/{entity_id}", data={"label": f"V{i}"})
+            assert response.status_code == 200
+        return entity_id
+
+    def test_paginated_versions(self, client: TestClient) -> None:
+        entity_id = self._collection_with_versions(client, 5)
+
+        all_versions = client.get(f"/entities/{entity_id}/versions").json()
+        assert [v["version"] for v in all_versions] == [1, 2, 3, 4, 5]
+
+        page_2 = client.get(
+            f"/entities/{entity_id}/versions", params={"page": 2, "page_size": 2}
+        ).json()
+        assert page_2 == all_versions[2:4]
+        assert set(page_2[0]) == {"version", "transaction_id", "updated_date"}
+
+        past_end = client.get(
+            f"/entities/{entity_id}/versions", params={"page": 4, "page_size": 2}
+        )
+        assert past_end.status_code == 200
+        assert past_end.json() == []
+
+    def test_versions_of_missing_entity(self, client: TestClient) -> None:
+        response = client.get("/entities/999999/versions", params={"page": 2, "page_size": 2})
+        assert response.status_code == 404
+
+    def test_version_lookup_by_number(self, client: TestClient) -> None:
+        entity_id = self._collection_with_versions(client, 3)
+
+        assert client.get(f"/entities/{entity_id}?version=2").json()["label"] == "V2"
+        assert client.get(f"/entities/{entity_id}?version=0").status_code == 404
+        assert client.get(f"/entities/{entity_id}?version=4").status_code == 404
+
+    def test_listing_at_version_keeps_page_order(self, client: TestClient) -> None:
+        older = self._collection_with_versions(client, 2)
+        newer = self._collection_with_versions(client, 1)
+
+        response = client.get("/entities/", params={"version": 2})
+        assert response.status_code == 200
+        # Only entities that have a second version are listed
+        assert [item["id"] for item in response.json()["items"]] == [older]
+
+        response = client.get("/entities/", params={"version": 1})
+        labels = {item["id"]: item["label"] for item in response.json()["items"]}
+        assert labels == {newer: "V1", older: "V1"}